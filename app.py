@@ -1,14 +1,25 @@
 import streamlit as st
-import json, os, tempfile, time
+import json, os, tempfile, time, uuid
 import ast
 import threading
 import copy
-import hashlib
 
 from pdf_processor import prepare_cv_text
+from preflight import check_pdf, PreflightRejected
+from ocr import ocr_available
 from chatgpt_client import ask_chatgpt
 from postprocess import postprocess_filled_cv
-from cv_pdf_generator import create_pretty_first_section
+from skill_mapper import scan_tech_inventory
+from field_extractor import extract_local_fields, apply_local_fields
+from company_gazetteer import find_companies, update_gazetteer
+from render_pool import render_cv_pdf_pooled
+from utils import (
+    norm_list as _norm_list,
+    project_has_content as _project_has_content,
+    extract_domains_from_projects as _extract_domains_from_projects,
+    extract_companies_from_projects as _extract_companies_from_projects,
+    filter_projects_by_domains as _filter_projects_by_domains,
+)
 
 # -------------------------
 # Page
@@ -16,25 +27,14 @@ from cv_pdf_generator import create_pretty_first_section
 st.set_page_config(page_title="CV-Konverter", page_icon="📄")
 st.title("📄 CV-Konverter")
 
-uploaded_file = st.file_uploader("Wähle eine PDF-Datei aus", type=["pdf"])
+uploaded_file = st.file_uploader(
+    "Wähle eine PDF-Datei aus (gescannte PDFs und Fotos per OCR)", type=["pdf", "jpg", "jpeg", "png"]
+)
 
 
 # -------------------------
 # Helpers
 # -------------------------
-def _norm_list(x):
-    """Normalize values that should be list[str]."""
-    if x is None:
-        return []
-    if isinstance(x, list):
-        return [str(v).strip() for v in x if str(v).strip()]
-    if isinstance(x, str):
-        parts = [p.strip() for p in x.split(",")]
-        return [p for p in parts if p]
-    s = str(x).strip()
-    return [s] if s else []
-
-
 def _responsibilities_to_text(value) -> str:
     """Normalize responsibilities value for UI display/editing (multiline string)."""
     if value is None:
@@ -122,74 +122,6 @@ def _save_domains_config(domains: list) -> bool:
         return False
 
 
-def _stable_dumps(obj) -> str:
-    return json.dumps(obj, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
-
-
-def _fingerprint(obj) -> str:
-    return hashlib.sha256(_stable_dumps(obj).encode("utf-8")).hexdigest()
-
-
-def _project_has_content(p: dict) -> bool:
-    if not isinstance(p, dict):
-        return False
-    keys = [
-        "project_title",
-        "company",
-        "role",
-        "overview",
-        "duration",
-        "tech_stack",
-        "responsibilities",
-        "domains",
-    ]
-    for k in keys:
-        v = p.get(k)
-        if isinstance(v, list):
-            if any(str(x).strip() for x in v if x is not None):
-                return True
-        elif v is not None and str(v).strip():
-            return True
-    return False
-
-
-def _extract_domains_from_projects(rows: list[dict]) -> list[str]:
-    out = set()
-    for p in rows if isinstance(rows, list) else []:
-        if not isinstance(p, dict):
-            continue
-        for d in _norm_list(p.get("domains")):
-            dd = str(d).strip()
-            if dd:
-                out.add(dd.title())
-    return sorted(out)
-
-
-def _extract_companies_from_projects(rows: list[dict]) -> list[str]:
-    out = set()
-    for p in rows if isinstance(rows, list) else []:
-        if not isinstance(p, dict):
-            continue
-        c = str(p.get("company", "") or "").strip()
-        if c:
-            out.add(c)
-    return sorted(out)
-
-
-def _filter_projects_by_domains(rows: list[dict], selected_domains: list[str]) -> list[dict]:
-    sel = {str(d).strip().casefold() for d in (selected_domains or []) if str(d).strip()}
-    if not sel:
-        return list(rows) if isinstance(rows, list) else []
-    out = []
-    for p in rows if isinstance(rows, list) else []:
-        if not isinstance(p, dict):
-            continue
-        p_domains = {str(d).strip().casefold() for d in _norm_list(p.get("domains")) if str(d).strip()}
-        if p_domains & sel:
-            out.append(p)
-    return out
-
-
 def is_new_candidate(uploaded_file) -> bool:
     if not uploaded_file:
         return False
@@ -302,6 +234,35 @@ def _apply_data_editor_deltas(widget_key: str, rows: list[dict]) -> list[dict]:
     return out
 
 
+# -------------------------
+# Dirty tracking (per-section version counters)
+# -------------------------
+def _bump_section_version(section: str):
+    """on_change callback: an editor reported a delta for `section`."""
+    versions = st.session_state.setdefault("section_versions", {})
+    versions[section] = versions.get(section, 0) + 1
+
+
+def _mark_pdf_in_sync():
+    """Remember which section versions the current PDF was built from."""
+    st.session_state["pdf_section_versions"] = dict(st.session_state.get("section_versions", {}))
+    st.session_state["pdf_needs_refresh"] = False
+
+
+def _pdf_is_stale() -> bool:
+    """Compare version counters instead of copying/hashing the whole CV on every rerun."""
+    built = st.session_state.get("pdf_section_versions")
+    if built is None:
+        _mark_pdf_in_sync()
+        return False
+    return st.session_state.get("section_versions", {}) != built
+
+
+def _render_session() -> str:
+    """Per-browser-session id: all PDF renders of a session reuse one worker's section cache."""
+    return st.session_state.setdefault("render_session", uuid.uuid4().hex)
+
+
 # -------------------------
 # Clear candidate data
 # -------------------------
@@ -316,6 +277,8 @@ def clear_candidate_data():
         "raw_text",
         "pdf_path",
         "pdf_needs_refresh",
+        "section_versions",
+        "pdf_section_versions",
         # project filters
         "filtered_projects_for_pdf",
         "selected_domains_for_pdf",
@@ -361,7 +324,8 @@ if uploaded_file:
         st.session_state["last_uploaded_file_name"] = uploaded_file.name
         st.session_state["pdf_needs_refresh"] = False
 
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
+    suffix = os.path.splitext(uploaded_file.name)[1].lower() or ".pdf"
+    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
         tmp.write(uploaded_file.read())
         pdf_path = tmp.name
 
@@ -386,8 +350,17 @@ if uploaded_file:
         start_time = time.time()
 
         try:
-            status_text.text("📖 Text wird extrahiert…")
-            prepared_text, raw_text = prepare_cv_text(pdf_path)
+            status_text.text("🛫 PDF wird geprüft…")
+            preflight = check_pdf(pdf_path, allow_ocr=ocr_available())
+            for warning in preflight["warnings"]:
+                st.warning(f"⚠️ {warning}")
+            use_ocr = preflight["verdict"] == "scanned"
+
+            status_text.text("🔍 Text wird per OCR erkannt…" if use_ocr else "📖 Text wird extrahiert…")
+            prepared_text, raw_text, page_texts = prepare_cv_text(pdf_path, ocr=use_ocr)
+            tech_inventory = scan_tech_inventory(prepared_text)
+            # Page texts of the same extraction/OCR pass (the PDF is read only once)
+            local_fields = extract_local_fields("\n".join(page_texts))
             st.session_state["raw_text"] = raw_text
             st.session_state["pdf_path"] = pdf_path
 
@@ -403,7 +376,14 @@ if uploaded_file:
 
             def _run_gpt():
                 try:
-                    holder["value"] = ask_chatgpt(prepared_text, mode="details", model=selected_model)
+                    holder["value"] = ask_chatgpt(
+                        prepared_text,
+                        mode="details",
+                        model=selected_model,
+                        known_tech=tech_inventory,
+                        skip_fields=local_fields["confident"],
+                        known_employers=find_companies(prepared_text),
+                    )
                 except Exception as e:
                     holder["error"] = e
 
@@ -426,7 +406,8 @@ if uploaded_file:
             if "raw_response" in result and result["raw_response"]:
                 status_text.text("🧩 Daten werden verarbeitet…")
                 filled_json = json.loads(result["raw_response"])
-                filled_json = postprocess_filled_cv(filled_json, raw_text)
+                filled_json = apply_local_fields(filled_json, local_fields)
+                filled_json = postprocess_filled_cv(filled_json, raw_text, tech_inventory=tech_inventory)
 
                 if not filled_json.get("title"):
                     filled_json["title"] = filled_json.get("position") or filled_json.get("role") or ""
@@ -442,8 +423,6 @@ if uploaded_file:
                     time_info.text(f"⏱ {round(time.time() - start_time, 1)} Sekunden vergangen")
 
                 status_text.text("📝 PDF wird erstellt…")
-                output_dir = "data_output"
-                os.makedirs(output_dir, exist_ok=True)
 
                 full_name = str(filled_json.get("full_name", "")).strip()
                 position = str(filled_json.get("title") or filled_json.get("position") or filled_json.get("role") or "").strip()
@@ -458,16 +437,16 @@ if uploaded_file:
                     progress_value = i
                     time_info.text(f"⏱ {round(time.time() - start_time, 1)} Sekunden vergangen")
 
-                pdf_path_out = create_pretty_first_section(filled_json, output_dir=output_dir, prefix=pdf_name)
-                with open(pdf_path_out, "rb") as f:
-                    st.session_state["pdf_bytes"] = f.read()
+                # Rendered in memory by the render worker pool (keeps this script thread free)
+                st.session_state["pdf_bytes"] = render_cv_pdf_pooled(filled_json, prefix=pdf_name, session=_render_session())["pdf_bytes"]
 
                 st.session_state["pdf_name"] = pdf_name
-                st.session_state["last_pdf_fingerprint"] = _fingerprint(_remove_empty_fields(filled_json))
-                st.session_state["pdf_needs_refresh"] = False
+                _mark_pdf_in_sync()
                 progress.progress(100)
             else:
                 st.error("⚠️ Das Modell hat keine Daten zurückgegeben.")
+        except PreflightRejected as e:
+            st.error(f"⛔ {e} – Konvertierung abgebrochen (keine GPT-Anfrage gesendet).")
         except Exception as e:
             st.error(f"❌ Fehler bei der Verarbeitung: {e}")
 
@@ -492,12 +471,18 @@ if "filled_json" in st.session_state and isinstance(st.session_state["filled_jso
     # Basic fields
     col_a, col_b = st.columns(2)
     with col_a:
-        st.text_input("Vollständiger Name", key="w_full_name")
-        st.text_input("Vorname", key="w_first_name")
+        st.text_input("Vollständiger Name", key="w_full_name", on_change=_bump_section_version, args=("basics",))
+        st.text_input("Vorname", key="w_first_name", on_change=_bump_section_version, args=("basics",))
     with col_b:
-        st.text_input("Position (title)", key="w_title")
-
-    st.text_area("Kurzbeschreibung (profile_summary)", height=140, key="w_profile_summary")
+        st.text_input("Position (title)", key="w_title", on_change=_bump_section_version, args=("basics",))
+
+    st.text_area(
+        "Kurzbeschreibung (profile_summary)",
+        height=140,
+        key="w_profile_summary",
+        on_change=_bump_section_version,
+        args=("basics",),
+    )
 
     edited["full_name"] = st.session_state["w_full_name"]
     edited["first_name"] = st.session_state["w_first_name"]
@@ -511,7 +496,7 @@ if "filled_json" in st.session_state and isinstance(st.session_state["filled_jso
             for k, v in contacts.items():
                 wkey = f"w_contacts_{k}"
                 st.session_state.setdefault(wkey, str(v))
-                st.text_input(str(k), key=wkey)
+                st.text_input(str(k), key=wkey, on_change=_bump_section_version, args=("contacts",))
                 contacts[k] = st.session_state[wkey]
             edited["contacts"] = contacts
 
@@ -570,6 +555,8 @@ if "filled_json" in st.session_state and isinstance(st.session_state["filled_jso
             width="stretch",
             hide_index=True,
             key=W_PROJECTS,
+            on_change=_bump_section_version,
+            args=("projects",),
             column_config={
                 "project_title": st.column_config.TextColumn("Projekt"),
                 "company": st.column_config.TextColumn("Firma"),
@@ -617,11 +604,25 @@ if "filled_json" in st.session_state and isinstance(st.session_state["filled_jso
             config_domains = set(_load_domains_config())
             _save_domains_config(sorted(config_domains | new_domains))
 
+        def _add_companies_to_gazetteer():
+            # Only companies not yet in company_industries.json; known industries are never changed
+            rows = st.session_state.get(DATA_PROJECTS, [])
+            added = update_gazetteer([{"projects_experience": rows}], override=False)
+            st.session_state["gazetteer_added"] = added
+
         st.button(
             "Domänen aus Projekten in domains.json übernehmen",
             key="btn_autofill_project_domains_main",
             on_click=_autofill_domains_from_projects,
         )
+        st.button(
+            "Neue Firmen mit ihrer Domäne in company_industries.json aufnehmen",
+            key="btn_add_companies_gazetteer",
+            on_click=_add_companies_to_gazetteer,
+            help="Nur Firmen, die dort noch fehlen und in den Projekten genau eine Domäne haben; bestehende Einträge bleiben unverändert.",
+        )
+        if "gazetteer_added" in st.session_state:
+            st.caption(f"{st.session_state.pop('gazetteer_added')} neue Firmen in company_industries.json aufgenommen.")
 
     # PDF Domains filter: show only domains that exist in current projects (not from domains.json)
     projects_for_filter = st.session_state.get("DATA_projects_rows", [])
@@ -633,6 +634,8 @@ if "filled_json" in st.session_state and isinstance(st.session_state["filled_jso
         options=domains_options,
         default=safe_default,
         key="selected_domains_for_pdf",
+        on_change=_bump_section_version,
+        args=("pdf_filter",),
     )
 
     with st.container():
@@ -677,18 +680,9 @@ if "filled_json" in st.session_state and isinstance(st.session_state["filled_jso
                 disabled=True,
             )
 
-        # true/false unsaved state based on actual PDF preview content
-        pdf_preview = copy.deepcopy(edited)
-        pdf_preview["projects_experience"] = filtered_projects
-        pdf_preview["domains"] = st.session_state.get("pdf_domains_list", [])
-        pdf_preview["companies"] = st.session_state.get("pdf_companies_list", [])
-        current_fp = _fingerprint(_remove_empty_fields(pdf_preview))
-        last_fp = st.session_state.get("last_pdf_fingerprint")
-        if last_fp is None:
-            st.session_state["last_pdf_fingerprint"] = current_fp
-            st.session_state["pdf_needs_refresh"] = False
-        else:
-            st.session_state["pdf_needs_refresh"] = (current_fp != last_fp)
+        # true/false unsaved state: editors bump their section version via on_change,
+        # so no copy/serialization of the whole CV is needed on each rerun.
+        st.session_state["pdf_needs_refresh"] = _pdf_is_stale()
 
         # -------------------------
         # Hard Skills
@@ -734,6 +728,8 @@ if "filled_json" in st.session_state and isinstance(st.session_state["filled_jso
                 width="stretch",
                 hide_index=True,
                 key=W_HS,
+                on_change=_bump_section_version,
+                args=("hard_skills",),
                 column_config={
                     "Kategorie": st.column_config.TextColumn("Kategorie"),
                     "Werkzeuge": st.column_config.ListColumn("Werkzeuge/Technologien"),
@@ -809,6 +805,8 @@ if "filled_json" in st.session_state and isinstance(st.session_state["filled_jso
                 width="stretch",
                 hide_index=True,
                 key=W_SK,
+                on_change=_bump_section_version,
+                args=("skills_overview",),
                 column_config={
                     "Kategorie": st.column_config.TextColumn("Kategorie"),
                     "Werkzeuge": st.column_config.ListColumn("Werkzeuge/Technologien"),
@@ -858,6 +856,8 @@ if "filled_json" in st.session_state and isinstance(st.session_state["filled_jso
                 width="stretch",
                 hide_index=True,
                 key="ed_languages_main",
+                on_change=_bump_section_version,
+                args=("languages",),
                 column_config={
                     "Sprache": st.column_config.TextColumn("Sprache"),
                     "Niveau": st.column_config.TextColumn("Niveau"),
@@ -900,6 +900,8 @@ if "filled_json" in st.session_state and isinstance(st.session_state["filled_jso
                 width="stretch",
                 hide_index=True,
                 key="ed_education_main",
+                on_change=_bump_section_version,
+                args=("education",),
                 column_config={
                     "Institution": st.column_config.TextColumn("Institution/Universität"),
                     "Abschluss": st.column_config.TextColumn("Abschluss/Fachrichtung"),
@@ -1021,16 +1023,10 @@ if "filled_json" in st.session_state and isinstance(st.session_state["filled_jso
             if not pdf_json.get("title"):
                 pdf_json["title"] = pdf_json.get("position") or pdf_json.get("role") or ""
 
-            output_dir = "data_output"
-            os.makedirs(output_dir, exist_ok=True)
             pdf_name = st.session_state.get("pdf_name", "CV_Streamlit")
+            st.session_state["pdf_bytes"] = render_cv_pdf_pooled(pdf_json, prefix=pdf_name, session=_render_session())["pdf_bytes"]
 
-            pdf_path_out = create_pretty_first_section(pdf_json, output_dir=output_dir, prefix=pdf_name)
-            with open(pdf_path_out, "rb") as f:
-                st.session_state["pdf_bytes"] = f.read()
-
-            st.session_state["last_pdf_fingerprint"] = _fingerprint(pdf_json)
-            st.session_state["pdf_needs_refresh"] = False
+            _mark_pdf_in_sync()
             st.success("Alle Änderungen wurden gespeichert und das PDF wurde aktualisiert.")
 
     # Downloads
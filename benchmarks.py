@@ -0,0 +1,446 @@
+"""
+Local benchmarks for the hot paths of the CV pipeline (no GPT calls).
+
+Usage:
+    python benchmarks.py render [--counts 10 20 40 80 160] [--repeat 3]
+    python benchmarks.py variants [--projects 40] [--repeat 3]
+    python benchmarks.py incremental [--projects 80] [--repeat 3]
+    python benchmarks.py classify [--cvs 5000] [--tools 30]
+    python benchmarks.py extract path/to/cv.pdf [--workers 4] [--copies 1]
+    python benchmarks.py normalize path/to/cv.pdf [--copies 1 20 100]
+"""
+import argparse
+import time
+
+
+# ============================================================
+# Synthetic test data
+# ============================================================
+SAMPLE_TECH = [
+    "Python", "SQL", "Azure Data Factory", "Databricks", "Terraform", "Docker",
+    "Kubernetes", "Power BI", "Airflow", "Kafka", "React", "PostgreSQL",
+]
+SAMPLE_COMPANIES = ["Siemens AG", "Erste Bank", "Magna", "A1 Telekom", "Spar"]
+SAMPLE_DOMAINS = ["Manufacturing", "Banking", "Automotive", "Telecommunications", "Retail"]
+
+
+def make_synthetic_cv(n_projects: int) -> dict:
+    """Builds a realistic CV JSON with n_projects long project entries."""
+    projects = []
+    for i in range(n_projects):
+        projects.append({
+            "project_title": f"Data Platform Migration {i + 1}",
+            "company": SAMPLE_COMPANIES[i % len(SAMPLE_COMPANIES)],
+            "overview": (
+                "Migrated legacy on-premise data warehouse workloads to a cloud lakehouse architecture, "
+                "covering ingestion, transformation and reporting for several business units. "
+            ) * 2,
+            "role": "Senior Data Engineer",
+            "duration": f"Jan {2010 + i % 12} – Dec {2011 + i % 12}",
+            "responsibilities": [
+                "Designed ingestion pipelines with Azure Data Factory and Databricks notebooks using "
+                "parameterised linked services, incremental watermark columns and metadata-driven orchestration.",
+                "Implemented Terraform modules for storage accounts, key vaults and private endpoints with "
+                "remote state in Azure Storage and pull-request gated plans in Azure DevOps.",
+                "Built Power BI semantic models with row-level security, incremental refresh policies and "
+                "calculation groups based on curated Delta tables in the gold layer.",
+            ],
+            "tech_stack": SAMPLE_TECH[i % 6: i % 6 + 6],
+            "domains": [SAMPLE_DOMAINS[i % len(SAMPLE_DOMAINS)]],
+        })
+
+    return {
+        "full_name": "Max Mustermann",
+        "title": "Senior Data Engineer",
+        "location": "Graz, Austria",
+        "email": "max@example.com",
+        "phone": "+43 660 1234567",
+        "education": [{"degree": "MSc Computer Science", "institution": "TU Graz", "year": "2014"}],
+        "languages": [{"language": "German", "level": "C2"}, {"language": "English", "level": "C1"}],
+        "profile_summary": "Senior data engineer building cloud data platforms on Azure and Databricks. " * 3,
+        "hard_skills": {
+            "programming_languages": ["Python", "SQL"],
+            "data_engineering": ["Databricks", "Airflow", "Kafka"],
+            "cloud_platforms": ["Microsoft Azure"],
+            "devops_iac": ["Terraform"],
+            "bi_tools": ["Power BI"],
+        },
+        "projects_experience": projects,
+        "skills_overview": [
+            {"category": "programming_languages", "tools": ["Python", "SQL"], "years_of_experience": "8"},
+            {"category": "data_engineering", "tools": ["Databricks", "Airflow"], "years_of_experience": "5"},
+        ],
+        "domains": sorted(set(SAMPLE_DOMAINS)),
+        "companies": sorted(set(SAMPLE_COMPANIES)),
+    }
+
+
+def _best_of(func, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+# ============================================================
+# 1️⃣ PDF rendering: time per project card
+# ============================================================
+def bench_render(counts, repeat=3):
+    """Render time should grow linearly with the number of project cards."""
+    from cv_pdf_generator import render_cv_pdf
+
+    render_cv_pdf(make_synthetic_cv(2))  # warm up fonts/styles/logo
+
+    print(f"{'projects':>8} {'pages':>6} {'total ms':>10} {'ms/project':>11}")
+    for n in counts:
+        cv = make_synthetic_cv(n)
+        pages = render_cv_pdf(cv)["page_count"]
+        elapsed = _best_of(lambda: render_cv_pdf(cv), repeat)
+        print(f"{n:>8} {pages:>6} {elapsed * 1000:>10.1f} {elapsed * 1000 / n:>11.2f}")
+
+
+# ============================================================
+# 2️⃣ Domain variants: one call vs. separate renders
+# ============================================================
+def bench_variants(n_projects=40, repeat=3):
+    """All domain variants in one call should cost little more than one full render."""
+    from cv_pdf_generator import render_cv_pdf, render_cv_pdf_variants
+    from utils import make_domain_variant
+
+    cv = make_synthetic_cv(n_projects)
+    filters = [[]] + [[d] for d in SAMPLE_DOMAINS[:4]]
+    render_cv_pdf(cv)  # warm up
+
+    single = _best_of(lambda: render_cv_pdf(cv), repeat)
+    separate = _best_of(lambda: [render_cv_pdf(make_domain_variant(cv, f)) for f in filters], repeat)
+    combined = _best_of(lambda: render_cv_pdf_variants(cv, filters), repeat)
+
+    print(f"one full render:           {single * 1000:8.1f} ms")
+    print(f"{len(filters)} variants, separately:  {separate * 1000:8.1f} ms")
+    print(f"{len(filters)} variants, one call:    {combined * 1000:8.1f} ms")
+
+
+# ============================================================
+# 3️⃣ Incremental save: one edited project vs. full rebuild
+# ============================================================
+def bench_incremental(n_projects=80, repeat=3):
+    """Re-rendering after a one-project edit should only rebuild that project's card."""
+    import copy
+    from cv_pdf_generator import render_cv_pdf, SectionCache
+
+    cv = make_synthetic_cv(n_projects)
+    cache = SectionCache()
+    render_cv_pdf(cv, cache=cache)  # warm up + fill the cache
+
+    edits = []
+    for i in range(repeat):
+        edited = copy.deepcopy(cv)
+        edited["projects_experience"][n_projects // 2]["overview"] += f" Typo fix {i}."
+        edits.append(edited)
+
+    cold = _best_of(lambda: render_cv_pdf(edits[0]), repeat)
+    edits_iter = iter(edits)
+    incremental = _best_of(lambda: render_cv_pdf(next(edits_iter), cache=cache), repeat)
+
+    print(f"full rebuild:      {cold * 1000:8.1f} ms")
+    print(f"incremental save:  {incremental * 1000:8.1f} ms")
+
+
+# ============================================================
+# 4️⃣ Tool classification (TECH_MAPPING)
+# ============================================================
+SAMPLE_TOOL_NAMES = [
+    "Python", "SQL", "Azure Data Factory", "Azure DevOps", "Azure Key Vault", "Azure Functions",
+    "Power BI", "DAX", "Databricks", "PySpark", "Apache Kafka", "Airflow", "Terraform", "Bicep",
+    "Docker Compose", "Kubernetes", "AKS", "Helm", "GitHub Actions", "GitLab CI/CD", "Jenkins",
+    "PostgreSQL", "SQL Server", "Snowflake", "React", "Next.js", "TypeScript", "Django REST Framework",
+    "FastAPI", "Grafana", "Prometheus", "Application Insights", "LangChain", "OpenAI", "PyTorch",
+    "Linux", "Windows Server", "Git", "nginx", "Jira", "Confluence", "MS Excel", "SAP BW", "Scrum",
+]
+
+
+def bench_classify(n_cvs=5000, tools_per_cv=30):
+    """Classifies every tool of a synthetic corpus: sequential regex loop vs. compiled classifier."""
+    import random
+    import re
+    from tech_mapping import TECH_MAPPING
+    from skill_mapper import classify_tech
+
+    def classify_sequential(name):
+        for pattern, category in TECH_MAPPING.items():
+            if re.search(pattern, name):
+                return category
+        return None
+
+    rnd = random.Random(0)
+    corpus = [f"{name} {rnd.randint(1, 400)}" if rnd.random() < 0.1 else name
+              for _ in range(n_cvs) for name in rnd.sample(SAMPLE_TOOL_NAMES, min(tools_per_cv, len(SAMPLE_TOOL_NAMES)))]
+    unique = sorted(set(corpus))
+
+    mismatches = [n for n in unique if classify_sequential(n) != classify_tech(n)]
+    print(f"{len(corpus)} tool names ({len(unique)} unique), mismatches: {len(mismatches)}")
+
+    start = time.perf_counter()
+    for name in unique:
+        classify_sequential(name)
+    seq = (time.perf_counter() - start) / len(unique) * len(corpus)
+
+    classify_tech.cache_clear()
+    start = time.perf_counter()
+    for name in corpus:
+        classify_tech(name)
+    compiled = time.perf_counter() - start
+
+    print(f"sequential loop (extrapolated): {seq * 1000:10.1f} ms")
+    print(f"compiled + memoized:            {compiled * 1000:10.1f} ms")
+
+
+# ============================================================
+# 5️⃣ PDF text extraction: serial vs. page ranges in worker processes
+# ============================================================
+def bench_extract(pdf_path, workers=4, copies=1):
+    """Extracts all pages serially and with the process pool (warm), optionally on a PDF repeated `copies` times."""
+    import os
+    import tempfile
+    import fitz
+    from pdf_processor import extract_text_by_page, PARALLEL_MIN_PAGES
+
+    path = pdf_path
+    if copies > 1:
+        merged = fitz.open()
+        for _ in range(copies):
+            with fitz.open(pdf_path) as src:
+                merged.insert_pdf(src)
+        path = os.path.join(tempfile.mkdtemp(), "merged.pdf")
+        merged.save(path)
+        merged.close()
+
+    serial_pages = extract_text_by_page(path, workers=1)
+    print(f"{len(serial_pages)} pages (parallel from {PARALLEL_MIN_PAGES} pages)")
+    extract_text_by_page(path, workers=workers)  # start + warm the pool
+
+    serial = _best_of(lambda: extract_text_by_page(path, workers=1), 3)
+    parallel = _best_of(lambda: extract_text_by_page(path, workers=workers), 3)
+    print(f"serial:              {serial * 1000:8.1f} ms")
+    print(f"{workers} workers:           {parallel * 1000:8.1f} ms")
+
+
+# ============================================================
+# 6️⃣ Character normalization: re.sub chain vs. normalize_chars
+# ============================================================
+def _normalize_chain(text):
+    """The former sequence of passes in prepare_cv_text (reference)."""
+    import re
+
+    text = re.sub(r"\[DATE\]|\[/DATE\]", "", text)
+    text = re.sub(r"[^\w\s\.\-/–—:,]", " ", text)
+    text = re.sub(r"\s{3,}", "\n", text)
+    text = re.sub(r"[ \t]+", " ", text)
+    text = re.sub(r"\n{2,}", "\n", text)
+    return text
+
+
+def bench_normalize(pdf_path, copies=(1, 20, 100), repeat=10):
+    """Normalizes the page text of a PDF repeated `copies` times (long multi-page CVs)."""
+    from pdf_processor import extract_text_by_page, normalize_chars
+
+    pages = extract_text_by_page(pdf_path)
+    print(f"{'copies':>6} {'chars':>9} {'chain ms':>9} {'fused ms':>9} {'same':>5}")
+    for n in copies:
+        text = "\n\n".join(pages * n)
+        same = _normalize_chain(text) == normalize_chars(text, strip_date_tags=True)
+        chain = _best_of(lambda: _normalize_chain(text), repeat)
+        fused = _best_of(lambda: normalize_chars(text, strip_date_tags=True), repeat)
+        print(f"{n:>6} {len(text):>9} {chain * 1000:>9.2f} {fused * 1000:>9.2f} {str(same):>5}")
+
+
+# ============================================================
+# 7️⃣ Project domains: keyword loop over json.dumps vs. keyword trie
+# ============================================================
+def _normalize_domains_loop(domains, data):
+    import json
+    from postprocess import INDUSTRY_KEYWORDS
+
+    text = json.dumps(data, ensure_ascii=False).lower()
+    result = set()
+    for d in domains if isinstance(domains, list) else []:
+        for industry in INDUSTRY_KEYWORDS.values():
+            if industry in d.lower():
+                result.add(industry)
+    for key, industry in INDUSTRY_KEYWORDS.items():
+        if key in text:
+            result.add(industry)
+    return [d.title() for d in sorted(result)]
+
+
+def bench_domains(counts, repeat=5):
+    """Domain normalization of every project of a synthetic CV."""
+    from postprocess import normalize_domains
+
+    print(f"{'projects':>8} {'loop ms':>9} {'trie ms':>9}")
+    for n in counts:
+        projects = make_synthetic_cv(n)["projects_experience"]
+        loop = _best_of(lambda: [_normalize_domains_loop(p.get("domains"), p) for p in projects], repeat)
+        trie = _best_of(lambda: [normalize_domains(p.get("domains"), p) for p in projects], repeat)
+        print(f"{n:>8} {loop * 1000:>9.2f} {trie * 1000:>9.2f}")
+
+
+# ============================================================
+# 8️⃣ Tool canonicalization: cost per lookup vs. skill list size
+# ============================================================
+def bench_tools(counts, repeat=3):
+    """ToolIndex over n distinct tool names plus a spelling variant of each (bounded cost per lookup)."""
+    import random
+    from skill_mapper import ToolIndex
+
+    rng = random.Random(0)
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    print(f"{'tools':>7} {'names':>7} {'total ms':>9} {'µs/lookup':>10} {'canonical':>10}")
+    for n in counts:
+        base = ["".join(rng.choice(letters) for _ in range(rng.randint(6, 14))).title() for _ in range(n)]
+        variants = [name.lower() if i % 2 else name[:-1] for i, name in enumerate(base)]
+        names = base + variants
+
+        def run():
+            index = ToolIndex()
+            return {index.canonical(name) for name in names}
+
+        seconds = _best_of(run, repeat)
+        canonical = len(run())
+        print(f"{n:>7} {len(names):>7} {seconds * 1000:>9.2f} {seconds / len(names) * 1e6:>10.1f} {canonical:>10}")
+
+
+# ============================================================
+# 9️⃣ Post-processing: separate passes + copying cleanup vs. one in-place traversal
+# ============================================================
+def _clean_text_fields_copy(data):
+    """Previous clean_text_fields: rebuilds every dict/list, four re.sub calls per string."""
+    import re
+
+    if isinstance(data, dict):
+        return {k: _clean_text_fields_copy(v) for k, v in data.items()}
+    if isinstance(data, list):
+        return [_clean_text_fields_copy(v) for v in data]
+    if isinstance(data, str):
+        text = re.sub(r"[ \t]+", " ", data)
+        text = re.sub(r"[\u2022\u2023\u25E6\u2043\u2219\u00B7]", "-", text)
+        text = re.sub(r"\s*\n\s*", "\n", text)
+        return text.replace("\xa0", " ").strip()
+    return data
+
+
+def _postprocess_passes(data):
+    """Previous project handling of postprocess_filled_cv: one pass per step, then the copying cleanup."""
+    from postprocess import (
+        unify_durations, fix_open_date_ranges, normalize_project_domains, format_responsibilities,
+    )
+
+    data["projects_experience"] = unify_durations(data.get("projects_experience", []))
+    data["projects_experience"] = fix_open_date_ranges(data["projects_experience"])
+    for project in data["projects_experience"]:
+        project["domains"] = normalize_project_domains(project)
+    data["domains"] = sorted({d for p in data["projects_experience"] for d in p["domains"]})
+    for project in data["projects_experience"]:
+        project["responsibilities"] = format_responsibilities(project.get("responsibilities", []))
+    return _clean_text_fields_copy(data)
+
+
+def _postprocess_traversal(data):
+    from postprocess import postprocess_project, clean_text_fields
+
+    for project in data["projects_experience"]:
+        postprocess_project(project)
+    for key, value in data.items():
+        if key != "projects_experience":
+            data[key] = clean_text_fields(value)
+    data["domains"] = sorted({d for p in data["projects_experience"] for d in p["domains"]})
+    return data
+
+
+def bench_postprocess(counts, repeat=5):
+    """Time and peak allocations (tracemalloc) of the project post-processing on synthetic CVs."""
+    import copy
+    import tracemalloc
+
+    def peak_kib(func, cv):
+        tracemalloc.start()
+        func(cv)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        return peak / 1024
+
+    print(f"{'projects':>8} {'passes ms':>10} {'one pass ms':>12} {'passes KiB':>11} {'one pass KiB':>13}")
+    for n in counts:
+        cv = make_synthetic_cv(n)
+        # Warm the parser caches so both variants are compared on the traversal itself
+        _postprocess_traversal(copy.deepcopy(cv))
+        copies = [copy.deepcopy(cv) for _ in range(2 * repeat)]
+        passes = _best_of(lambda: _postprocess_passes(copies.pop()), repeat)
+        single = _best_of(lambda: _postprocess_traversal(copies.pop()), repeat)
+        passes_kib = peak_kib(_postprocess_passes, copy.deepcopy(cv))
+        single_kib = peak_kib(_postprocess_traversal, copy.deepcopy(cv))
+        print(f"{n:>8} {passes * 1000:>10.2f} {single * 1000:>12.2f} {passes_kib:>11.0f} {single_kib:>13.0f}")
+
+
+# ============================================================
+# 🧪 CLI
+# ============================================================
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="CV-Converter benchmarks")
+    sub = parser.add_subparsers(dest="bench", required=True)
+
+    p_render = sub.add_parser("render", help="PDF render time vs. project count")
+    p_render.add_argument("--counts", type=int, nargs="+", default=[10, 20, 40, 80, 160])
+    p_render.add_argument("--repeat", type=int, default=3)
+
+    p_variants = sub.add_parser("variants", help="domain variants: one call vs. separate renders")
+    p_variants.add_argument("--projects", type=int, default=40)
+    p_variants.add_argument("--repeat", type=int, default=3)
+
+    p_incr = sub.add_parser("incremental", help="re-render after a one-project edit (section cache)")
+    p_incr.add_argument("--projects", type=int, default=80)
+    p_incr.add_argument("--repeat", type=int, default=3)
+
+    p_classify = sub.add_parser("classify", help="TECH_MAPPING tool classification")
+    p_classify.add_argument("--cvs", type=int, default=5000)
+    p_classify.add_argument("--tools", type=int, default=30)
+
+    p_extract = sub.add_parser("extract", help="PDF text extraction: serial vs. worker processes")
+    p_extract.add_argument("pdf")
+    p_extract.add_argument("--workers", type=int, default=4)
+    p_extract.add_argument("--copies", type=int, default=1, help="repeat the PDF to simulate long documents")
+
+    p_norm = sub.add_parser("normalize", help="character normalization: re.sub chain vs. one pass")
+    p_norm.add_argument("pdf")
+    p_norm.add_argument("--copies", type=int, nargs="+", default=[1, 20, 100])
+
+    p_domains = sub.add_parser("domains", help="project domain normalization: keyword loop vs. keyword trie")
+    p_domains.add_argument("--counts", type=int, nargs="+", default=[10, 40, 160])
+
+    p_tools = sub.add_parser("tools", help="tool canonicalization cost vs. skill list size")
+    p_tools.add_argument("--counts", type=int, nargs="+", default=[50, 500, 5000])
+
+    p_post = sub.add_parser("postprocess", help="project post-processing: separate passes vs. one in-place traversal")
+    p_post.add_argument("--counts", type=int, nargs="+", default=[100, 200, 400])
+
+    args = parser.parse_args()
+    if args.bench == "render":
+        bench_render(args.counts, repeat=args.repeat)
+    elif args.bench == "variants":
+        bench_variants(args.projects, repeat=args.repeat)
+    elif args.bench == "incremental":
+        bench_incremental(args.projects, repeat=args.repeat)
+    elif args.bench == "classify":
+        bench_classify(args.cvs, tools_per_cv=args.tools)
+    elif args.bench == "extract":
+        bench_extract(args.pdf, workers=args.workers, copies=args.copies)
+    elif args.bench == "normalize":
+        bench_normalize(args.pdf, copies=args.copies)
+    elif args.bench == "domains":
+        bench_domains(args.counts)
+    elif args.bench == "tools":
+        bench_tools(args.counts)
+    elif args.bench == "postprocess":
+        bench_postprocess(args.counts)
@@ -0,0 +1,219 @@
+"""
+Bulk PDF rendering of stored CV JSON (no GPT calls).
+
+Re-renders existing CV JSON files, e.g. after a branding change, in parallel
+across all cores. Input is a directory of *.json files or a JSONL file (one CV
+per line); output is a directory or a ZIP archive.
+
+Usage:
+    python bulk_render.py data_output/cvs out_pdfs/
+    python bulk_render.py cvs.jsonl rendered.zip --workers 8 --report failures.json
+"""
+import os
+import sys
+import json
+import time
+import zipfile
+import argparse
+from concurrent.futures import wait, FIRST_COMPLETED
+from concurrent.futures.process import BrokenProcessPool
+
+from render_pool import RenderPool, DEFAULT_TIMEOUT
+from cv_pdf_generator import sanitize_filename
+
+
+# ============================================================
+# 1️⃣ Input: directory of JSON files or JSONL
+# ============================================================
+def iter_cv_sources(source: str):
+    """
+    Yields (name, cv_dict, error) for every CV in a directory or JSONL file.
+    Unreadable entries are yielded with cv_dict=None and the error message.
+    """
+    if os.path.isdir(source):
+        for fname in sorted(os.listdir(source)):
+            if not fname.lower().endswith(".json"):
+                continue
+            name = os.path.splitext(fname)[0]
+            try:
+                with open(os.path.join(source, fname), "r", encoding="utf-8") as f:
+                    yield name, json.load(f), None
+            except Exception as e:
+                yield name, None, f"invalid JSON: {e}"
+        return
+
+    stem = os.path.splitext(os.path.basename(source))[0]
+    with open(source, "r", encoding="utf-8") as f:
+        for lineno, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            name = f"{stem}_{lineno:05d}"
+            try:
+                yield name, json.loads(line), None
+            except Exception as e:
+                yield name, None, f"invalid JSON: {e}"
+
+
+# ============================================================
+# 2️⃣ Output: directory or ZIP
+# ============================================================
+class PdfSink:
+    """Writes rendered PDFs into a directory or (if the target ends with .zip) a ZIP archive."""
+
+    def __init__(self, target: str):
+        self.target = target
+        self._zip = None
+        self._names = set()
+        if target.lower().endswith(".zip"):
+            parent = os.path.dirname(target)
+            if parent:
+                os.makedirs(parent, exist_ok=True)
+            # PDF streams are already compressed, so store them as-is
+            self._zip = zipfile.ZipFile(target, "w", compression=zipfile.ZIP_STORED)
+        else:
+            os.makedirs(target, exist_ok=True)
+
+    def _unique(self, file_name: str) -> str:
+        base, ext = os.path.splitext(file_name)
+        candidate, n = file_name, 2
+        while candidate in self._names:
+            candidate = f"{base}_{n}{ext}"
+            n += 1
+        self._names.add(candidate)
+        return candidate
+
+    def write(self, name: str, pdf_bytes: bytes) -> str:
+        file_name = self._unique(f"{sanitize_filename(name)}.pdf")
+        if self._zip is not None:
+            self._zip.writestr(file_name, pdf_bytes)
+        else:
+            with open(os.path.join(self.target, file_name), "wb") as f:
+                f.write(pdf_bytes)
+        return file_name
+
+    def close(self):
+        if self._zip is not None:
+            self._zip.close()
+
+
+# ============================================================
+# 3️⃣ Parallel rendering
+# ============================================================
+def bulk_render(source: str, target: str, workers=None, prefix="CV Inpro", timeout=DEFAULT_TIMEOUT) -> dict:
+    """
+    Renders every CV from `source` into `target` using a pool of worker processes.
+    Results are written as soon as they finish, so memory stays bounded.
+    A render that hangs longer than `timeout` is recorded as a failure and its worker
+    is replaced; the CVs queued behind it are rendered again on the new worker.
+    Returns a summary dict with counts, pages/sec and the list of failures.
+    """
+    workers = workers or (os.cpu_count() or 1)
+    window = workers * 2  # renders in flight (running + queued)
+
+    pool = RenderPool(workers=workers, max_pending=window, timeout=timeout)
+    sink = PdfSink(target)
+
+    rendered, pages = 0, 0
+    failures = []
+    pending = {}   # future → (name, cv), in submission order
+    retried = set()
+    start = time.perf_counter()
+
+    def collect(done):
+        nonlocal rendered, pages
+        for future in done:
+            name, cv = pending.pop(future)
+            try:
+                result = future.result()
+                sink.write(name, result["pdf_bytes"])
+                rendered += 1
+                pages += result["page_count"]
+            except BrokenProcessPool as e:
+                # Queued behind a hung render whose worker was recycled: render again (once)
+                if name in retried:
+                    failures.append({"name": name, "error": f"{type(e).__name__}: {e}"})
+                    print(f"❌ {name}: {e}")
+                    continue
+                retried.add(name)
+                pending[pool.submit(cv, prefix=prefix)] = (name, cv)
+            except Exception as e:
+                failures.append({"name": name, "error": f"{type(e).__name__}: {e}"})
+                print(f"❌ {name}: {e}")
+
+    def drop_hung():
+        """Nothing finished within `timeout`: the oldest render of each busy worker hangs."""
+        seen = set()
+        for future, (name, _) in list(pending.items()):
+            worker = pool.worker_of(future)
+            if worker is None or worker in seen:
+                continue
+            seen.add(worker)
+            del pending[future]
+            failures.append({"name": name, "error": f"RenderTimeout: no result within {timeout}s"})
+            print(f"❌ {name}: no result within {timeout}s")
+            pool.recycle(future)
+
+    def wait_for_one():
+        done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+        if done:
+            collect(done)
+        else:
+            drop_hung()
+
+    try:
+        for name, cv, error in iter_cv_sources(source):
+            if error:
+                failures.append({"name": name, "error": error})
+                print(f"❌ {name}: {error}")
+                continue
+            if not isinstance(cv, dict):
+                failures.append({"name": name, "error": "CV JSON is not an object"})
+                print(f"❌ {name}: CV JSON is not an object")
+                continue
+
+            while len(pending) >= window:
+                wait_for_one()
+
+            pending[pool.submit(cv, prefix=prefix)] = (name, cv)
+
+        while pending:
+            wait_for_one()
+    finally:
+        sink.close()
+        pool.close(wait=False)
+
+    elapsed = time.perf_counter() - start
+    return {
+        "rendered": rendered,
+        "failed": len(failures),
+        "pages": pages,
+        "seconds": round(elapsed, 2),
+        "pages_per_sec": round(pages / elapsed, 1) if elapsed else 0.0,
+        "failures": failures,
+    }
+
+
+# ============================================================
+# 🧪 CLI
+# ============================================================
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Render stored CV JSON to PDF in bulk (no GPT)")
+    parser.add_argument("source", help="directory with *.json files or a .jsonl file")
+    parser.add_argument("target", help="output directory or .zip file")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--prefix", default="CV Inpro")
+    parser.add_argument("--timeout", type=int, default=DEFAULT_TIMEOUT, help="seconds per render")
+    parser.add_argument("--report", help="write the summary (incl. failures) as JSON to this path")
+    args = parser.parse_args()
+
+    summary = bulk_render(args.source, args.target, workers=args.workers, prefix=args.prefix, timeout=args.timeout)
+
+    print(
+        f"\n✅ {summary['rendered']} PDFs, {summary['pages']} pages in {summary['seconds']}s "
+        f"({summary['pages_per_sec']} pages/sec), ❌ {summary['failed']} failed"
+    )
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+
+    sys.exit(1 if summary["failed"] else 0)
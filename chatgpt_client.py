@@ -13,10 +13,78 @@ load_dotenv()
 client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 logging.basicConfig(level=logging.INFO)
 
+# ============================================================
+# 🔎 Locally pre-detected tools (see skill_mapper.scan_tech_inventory)
+# ============================================================
+def _known_tech_block(known_tech) -> str:
+    """Prompt section listing tools that are categorized locally, so GPT does not repeat them."""
+    if not known_tech:
+        return ""
+    by_category = {}
+    for tool in known_tech:
+        by_category.setdefault(tool["category"], []).append(tool["name"])
+    lines = "\n".join(f"  {cat}: {', '.join(names)}" for cat, names in by_category.items())
+    return f"""
+=== PRE-DETECTED TOOLS ===
+- These tools were already found and categorized locally; they are merged into "hard_skills" automatically.
+- Do NOT repeat them in "hard_skills" — list there only tools that are missing from this list.
+- Still use them in "skills_overview" where relevant.
+{lines}
+"""
+
+
+def _known_employers_block(known_employers) -> str:
+    """Prompt section listing employers whose industry is known locally (company_gazetteer)."""
+    if not known_employers:
+        return ""
+    names = ", ".join(sorted(known_employers))
+    return f"""
+=== KNOWN EMPLOYERS ===
+- The industries of these companies are set locally: do NOT infer "domains" for their projects (leave [] there).
+{names}
+"""
+
+
+# ============================================================
+# 📇 Fields extracted locally (see field_extractor.extract_local_fields)
+# ============================================================
+PROMPT_SKIPPABLE_FIELDS = ("languages", "education", "website")
+
+LANGUAGES_RULES = """=== LANGUAGES ===
+- Extract only explicitly mentioned languages and their levels (e.g., "German: native", "English: C1").
+- Recognize section titles such as "Languages", "Language Skills", "Sprachen", or "Sprachkenntnisse".
+- Do NOT infer any languages that are not explicitly written in the CV.
+- Detect levels written as “native”, “fluent”, “C2”, “B1”, etc.
+- If no languages are mentioned, return an empty list: []
+- Output format:
+  "languages": [
+      {"language": "German", "level": "C2"},
+      {"language": "English", "level": "C1"}
+  ]
+
+"""
+
+
+def _languages_rules(skip_fields) -> str:
+    return "" if "languages" in (skip_fields or ()) else LANGUAGES_RULES
+
+
+def _skip_fields_block(skip_fields) -> str:
+    """Prompt section telling GPT to leave locally extracted fields empty."""
+    fields = [f for f in PROMPT_SKIPPABLE_FIELDS if f in (skip_fields or ())]
+    if not fields:
+        return ""
+    return f"""
+=== FIELDS EXTRACTED LOCALLY ===
+- Return {", ".join(f'"{f}"' for f in fields)} as empty values ("" or []); they are filled from the CV text automatically.
+"""
+
+
 # ============================================================
 # 🧠 Hauptfunktion zum Aufruf von GPT
 # ============================================================
-def ask_chatgpt(text, mode="details", base_structure=None, model="gpt-5-mini"):
+def ask_chatgpt(text, mode="details", base_structure=None, model="gpt-5-mini", known_tech=None, skip_fields=None,
+                known_employers=None):
     """
     Universal function to call GPT for CV parsing.
 
@@ -24,6 +92,10 @@ def ask_chatgpt(text, mode="details", base_structure=None, model="gpt-5-mini"):
     - structure: returns only the JSON skeleton (keys with empty values)
     - details: extracts all fields from the text
     - fix: fills missing/empty fields while keeping the schema intact
+
+    known_tech: optional local tech inventory; those tools are left out of GPT's hard_skills.
+    skip_fields: fields already extracted locally (languages, education, website); GPT leaves them empty.
+    known_employers: companies found in the company gazetteer; GPT does not infer their domains.
     """
     if mode == "structure":
         task_description = "Extract only the structural JSON skeleton of the CV with all field names but empty values."
@@ -78,29 +150,18 @@ INSTRUCTIONS:
 
 - For "skills_overview":
   * Include all tools used in projects or summary.
-  * Estimate approximate "years_of_experience" logically (e.g., from project durations or global statements like "5+ years with Azure").
+  * "years_of_experience": fill ONLY if the CV states it explicitly (e.g., "5+ years with Azure" → "5"), else leave "". Do NOT estimate it from project durations — it is computed locally.
   * Include ALL categories that can be supported by CV content (no minimum count).
   * Each row must follow this format: {{ "category": "", "tools": [], "years_of_experience": "" }}
   * Do not leave "tools" empty — extract at least one tool per category if mentioned anywhere in the CV.
 
+{_known_tech_block(known_tech)}{_skip_fields_block(skip_fields)}
 === PROFILE SUMMARY ===
 - Write a technical, third-person summary (80–100 words) describing technical specialization (e.g., Cloud Engineer, Data Engineer, DevOps Specialist), key tools, and strengths.
 - Do NOT mention business domains/industries (Banking, Healthcare, etc.) in this summary — those belong in the "domains" field.
 - Align this summary strictly with real CV content — don't invent.
 
-=== LANGUAGES ===
-- Extract only explicitly mentioned languages and their levels (e.g., "German: native", "English: C1").
-- Recognize section titles such as "Languages", "Language Skills", "Sprachen", or "Sprachkenntnisse".
-- Do NOT infer any languages that are not explicitly written in the CV.
-- Detect levels written as “native”, “fluent”, “C2”, “B1”, etc.
-- If no languages are mentioned, return an empty list: []
-- Output format:
-  "languages": [
-      {{"language": "German", "level": "C2"}},
-      {{"language": "English", "level": "C1"}}
-  ]
-
-=== DOMAINS ===
+{_languages_rules(skip_fields)}=== DOMAINS ===
 - Determine the candidate’s professional domains based strictly on the business industries of the companies they worked for.
 - Use ONLY employer/client industries that are clearly stated or unambiguously inferable from company names or company sector descriptions (e.g., "bank", "insurance", "telecom provider", "university", "hospital").
 - Do NOT treat areas of work (e.g., AI, Marketing, Sales) as industries unless explicitly stated as the employer’s business sector.
@@ -111,7 +172,7 @@ INSTRUCTIONS:
   • a role, job title, or responsibility.
 - If the candidate worked in multiple industries, list all relevant domains as a JSON array of strings.
 
-=== OUTPUT RULES ===
+{_known_employers_block(known_employers)}=== OUTPUT RULES ===
 - Return a single valid JSON object strictly matching the SCHEMA.
 - Do NOT return markdown, explanations, comments, or prose — only JSON.
 - Do NOT hallucinate tools, projects, dates, or titles.
@@ -272,8 +333,12 @@ def _call_gpt_and_parse(prompt: str, model: str = "gpt-4o-mini") -> dict:
         return {"success": False, "json": {}, "raw_response": ""}
 
 
-def gpt_extract_cv_without_projects(text: str, model: str = "gpt-4o-mini") -> dict:
-    """Extracts all CV fields except projects_experience (keeps it as [])."""
+def gpt_extract_cv_without_projects(text: str, model: str = "gpt-4o-mini", known_tech=None, skip_fields=None) -> dict:
+    """
+    Extracts all CV fields except projects_experience (keeps it as []).
+    known_tech: optional local tech inventory; those tools are left out of GPT's hard_skills.
+    skip_fields: fields already extracted locally (languages, education, website); GPT leaves them empty.
+    """
     prompt = f"""
 TASK: Extract a structured CV JSON from the text, but DO NOT extract any projects.
 
@@ -283,7 +348,6 @@ INSTRUCTIONS:
 
 - Avoid assumptions — rely only on what's clearly stated or strongly implied in the resume.
 - If a field is unknown or not present in the CV, use empty values: "" for strings, [] for lists, {{}} for objects. Do NOT guess.
-- The ONLY exception: for "skills_overview.years_of_experience" you MUST infer an approximate integer value based on project durations and global statements (e.g., "5+ years").
 - Do NOT wrap arrays or objects into strings. Always output proper JSON values.
 - Always extract and include exact start and end dates for every project, job, or education entry.
 
@@ -302,29 +366,17 @@ INSTRUCTIONS:
 
 - For "skills_overview":
   * Include all tools used in projects or summary.
-  * Estimate approximate "years_of_experience" logically (e.g., from project durations or global statements like "5+ years with Azure").
+  * "years_of_experience": fill ONLY if the CV states it explicitly (e.g., "5+ years with Azure" → "5"), else leave "". Do NOT estimate it from project durations — it is computed locally.
   * Include ALL categories that can be supported by CV content (no minimum count).
   * Each row must follow this format: {{ "category": "", "tools": [], "years_of_experience": "" }}
-  * "years_of_experience" MUST never be empty. If not explicitly stated, infer a conservative integer (e.g., 1, 2, 3, 5) from project durations or CV summary.
   * Do not leave "tools" empty — extract at least one tool per category if mentioned anywhere in the CV.
 
+{_known_tech_block(known_tech)}{_skip_fields_block(skip_fields)}
 === PROFILE SUMMARY ===
 - Write a technical, third-person summary (80–100 words) describing actual domains, tools, and strengths.
 - Align this summary strictly with real CV content — don't invent.
 
-=== LANGUAGES ===
-- Extract only explicitly mentioned languages and their levels (e.g., "German: native", "English: C1").
-- Recognize section titles such as "Languages", "Language Skills", "Sprachen", or "Sprachkenntnisse".
-- Do NOT infer any languages that are not explicitly written in the CV.
-- Detect levels written as “native”, “fluent”, “C2”, “B1”, etc.
-- If no languages are mentioned, return an empty list: []
-- Output format:
-  "languages": [
-      {{"language": "German", "level": "C2"}},
-      {{"language": "English", "level": "C1"}}
-  ]
-
-=== DOMAINS ===
+{_languages_rules(skip_fields)}=== DOMAINS ===
 - Determine the candidate's professional domains based STRICTLY on the business industries/sectors of the companies or clients they worked for.
 - Domains MUST represent what the company/client DOES as a business (industry/market sector).
 - Examples of CORRECT domains: Banking, Insurance, Healthcare, Manufacturing, Retail, E-Commerce, Telecommunications, Automotive, Energy, Government, Education, Consulting, Real Estate, Logistics, Media, Hospitality.
@@ -441,8 +493,11 @@ CV_TEXT:
         return {"success": False, "text": "", "raw_response": ""}
 
 
-def gpt_structurize_projects_from_text(projects_text: str, model: str = "gpt-4o-mini") -> dict:
-    """Converts === PROJECT N === text blocks into the target schema's projects_experience."""
+def gpt_structurize_projects_from_text(projects_text: str, model: str = "gpt-4o-mini", known_employers=None) -> dict:
+    """
+    Converts === PROJECT N === text blocks into the target schema's projects_experience.
+    known_employers: companies found in the company gazetteer; GPT does not infer their domains.
+    """
     prompt = f"""
 TASK: Convert the following PROJECTS text into structured JSON objects.
 
@@ -492,13 +547,13 @@ INSTRUCTIONS:
   - tech_stack as flat list of tools.
 - If any field is missing in the text, leave it as an empty string or empty list.
 - Return ONLY JSON of the form {{ "projects_experience": [PROJECT_SCHEMA, ...]}}.
-
+{_known_employers_block(known_employers)}
 PROJECTS_TEXT:
 {projects_text}
 """
     return _call_gpt_and_parse(prompt, model=model)
 
-def run_stage_based_parsing(text: str, model: str = "gpt-4o-mini") -> dict:
+def run_stage_based_parsing(text: str, model: str = "gpt-4o-mini", known_tech=None, skip_fields=None) -> dict:
     """
     Stage-based pipeline:
     1. Extract general CV info without projects
@@ -509,7 +564,7 @@ def run_stage_based_parsing(text: str, model: str = "gpt-4o-mini") -> dict:
 
     try:
       # Step 1: extract general CV info (no projects)
-        step1 = gpt_extract_cv_without_projects(text, model=model)
+        step1 = gpt_extract_cv_without_projects(text, model=model, known_tech=known_tech, skip_fields=skip_fields)
         if not step1.get("success"):
             return {"success": False, "error": "Step 1 failed: general CV info"}
 
@@ -0,0 +1,205 @@
+"""
+Company → industry gazetteer (no GPT).
+
+Maps known employers/clients to an industry ("Siemens AG" → siemens → Manufacturing).
+Names are stored without legal form and looked up through a hashed n-gram index:
+every word n-gram of a text (up to the longest known name) is one dict lookup, so
+the cost depends on the text length, not on the number of companies.
+
+The entries live in company_industries.json and are learned from stored results:
+    python company_gazetteer.py build data_output/cvs cvs.jsonl
+    python company_gazetteer.py lookup "Erste Bank der oesterreichischen Sparkassen AG"
+"""
+import os
+import re
+import json
+import argparse
+from collections import Counter, defaultdict
+
+GAZETTEER_FILE = "company_industries.json"
+MIN_SHARE = 0.6   # share of a company's stored projects that must agree on the industry
+
+# Legal forms and suffixes stripped from company names (lower case, without dots)
+LEGAL_FORMS = {
+    "ag", "gmbh", "mbh", "kg", "og", "eu", "ohg", "gbr", "ug", "se", "kgaa", "co", "cokg", "ev",
+    "sa", "sas", "sarl", "spa", "srl", "bv", "nv", "oy", "ab", "as", "asa", "aps",
+    "ltd", "limited", "llc", "llp", "inc", "incorporated", "corp", "corporation", "plc", "lp",
+    "group", "gruppe", "holding", "holdings",
+}
+
+_TOKEN_RE = re.compile(r"\w+(?:[.&'’-]\w+)*")
+
+
+def _tokens(text: str) -> list:
+    """Lower-cased word tokens, dots/apostrophes removed ("S.p.A." → "spa", "E.ON" → "eon")."""
+    return [re.sub(r"[.'’]", "", t.lower()) for t in _TOKEN_RE.findall(text or "")]
+
+
+def company_key(name: str) -> str:
+    """Index key of a company name: lower-cased tokens without trailing legal forms ("Siemens AG" → "siemens")."""
+    tokens = _tokens(name)
+    while len(tokens) > 1 and tokens[-1] in LEGAL_FORMS:
+        tokens.pop()
+    return " ".join(tokens)
+
+
+# ============================================================
+# 1️⃣ Index
+# ============================================================
+_index = None   # {"keys": {key: industry}, "names": {key: name}, "max_tokens": int}, loaded on first use
+
+
+def build_index(entries: dict) -> dict:
+    keys, names = {}, {}
+    for name, industry in entries.items():
+        key = company_key(name)
+        if key and industry:
+            keys[key] = industry
+            names[key] = name
+    return {"keys": keys, "names": names, "max_tokens": max((k.count(" ") + 1 for k in keys), default=0)}
+
+
+def load_gazetteer(path: str = GAZETTEER_FILE) -> dict:
+    """Reads company_industries.json ({"companies": {name: industry}}); missing file → empty."""
+    global _index
+    entries = {}
+    if os.path.exists(path):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entries = json.load(f).get("companies", {})
+        except Exception as e:
+            print(f"Error loading company gazetteer: {e}")
+    _index = build_index(entries)
+    return entries
+
+
+def _get_index() -> dict:
+    if _index is None:
+        load_gazetteer()
+    return _index
+
+
+def lookup_company(name: str):
+    """Industry of a company name ("Siemens AG" → "Manufacturing") or None."""
+    key = company_key(name)
+    return _get_index()["keys"].get(key) if key else None
+
+
+def find_companies(text: str, require_capital: bool = True) -> dict:
+    """
+    Known companies named anywhere in `text` → {name: industry} (names as in the gazetteer).
+    Longest n-gram first at each position; with require_capital, one-word names must be
+    capitalized in the text ("Post" the company, not "post" the verb).
+    """
+    index = _get_index()
+    keys, max_n = index["keys"], index["max_tokens"]
+    if not keys:
+        return {}
+    words = _TOKEN_RE.findall(text or "")
+    tokens = [re.sub(r"[.'’]", "", w.lower()) for w in words]
+    found = {}
+    i = 0
+    while i < len(tokens):
+        for n in range(min(max_n, len(tokens) - i), 0, -1):
+            key = " ".join(tokens[i:i + n])
+            if key in keys and (n > 1 or not require_capital or words[i][:1].isupper()):
+                found[index["names"][key]] = keys[key]
+                i += n - 1
+                break
+        i += 1
+    return found
+
+
+def project_industries(project: dict) -> list:
+    """
+    Industries of a project's known employer/client: the "company" field first,
+    else company names in the title/overview.
+    """
+    if not isinstance(project, dict):
+        return []
+    company = str(project.get("company", "") or "")
+    industry = lookup_company(company)
+    if industry:
+        return [industry]
+    found = find_companies(company, require_capital=False)
+    if not found:
+        text = "\n".join(str(project.get(k, "") or "") for k in ("project_title", "overview"))
+        found = find_companies(text)
+    return sorted(set(found.values()))
+
+
+# ============================================================
+# 2️⃣ Learning from stored results
+# ============================================================
+def learn_companies(cvs, min_share: float = MIN_SHARE) -> dict:
+    """
+    {company name: industry} from stored CV dicts: every project with a company and exactly
+    one domain is a vote; a company is kept when min_share of its votes agree.
+    """
+    votes = defaultdict(Counter)
+    names = {}
+    for cv in cvs:
+        for project in (cv or {}).get("projects_experience") or []:
+            if not isinstance(project, dict):
+                continue
+            domains = [str(d).strip() for d in project.get("domains") or [] if str(d).strip()]
+            key = company_key(str(project.get("company", "") or ""))
+            if not key or len(domains) != 1:
+                continue
+            votes[key][domains[0].title()] += 1
+            names.setdefault(key, str(project["company"]).strip())
+
+    learned = {}
+    for key, counter in votes.items():
+        industry, count = counter.most_common(1)[0]
+        if count / sum(counter.values()) >= min_share:
+            learned[names[key]] = industry
+    return learned
+
+
+def save_gazetteer(entries: dict, path: str = GAZETTEER_FILE) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"companies": dict(sorted(entries.items(), key=lambda e: e[0].lower()))}, f, ensure_ascii=False, indent=2)
+    load_gazetteer(path)
+
+
+def update_gazetteer(cvs, path: str = GAZETTEER_FILE, override: bool = True) -> int:
+    """
+    Merges companies learned from `cvs` into the gazetteer file; returns the number of new/changed entries.
+    With override=False only unknown companies are added and existing industries are kept.
+    """
+    entries = load_gazetteer(path)
+    by_key = {company_key(name): name for name in entries}
+    changed = 0
+    for name, industry in learn_companies(cvs).items():
+        existing = by_key.get(company_key(name))
+        if existing and (entries[existing] == industry or not override):
+            continue
+        entries[existing or name] = industry
+        changed += 1
+    if changed:
+        save_gazetteer(entries, path)
+    return changed
+
+
+# ============================================================
+# 🧪 CLI
+# ============================================================
+if __name__ == "__main__":
+    from bulk_render import iter_cv_sources
+
+    parser = argparse.ArgumentParser(description="Company → industry gazetteer")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p_build = sub.add_parser("build", help="learn companies from stored CV JSON (directories or JSONL files)")
+    p_build.add_argument("sources", nargs="+")
+    p_lookup = sub.add_parser("lookup", help="industry of a company name")
+    p_lookup.add_argument("names", nargs="+")
+    args = parser.parse_args()
+
+    if args.cmd == "build":
+        cvs = [cv for source in args.sources for _, cv, error in iter_cv_sources(source) if not error]
+        changed = update_gazetteer(cvs, override=True)
+        print(f"{len(cvs)} CVs gelesen, {changed} Firmen neu/geändert, {len(load_gazetteer())} Firmen in {GAZETTEER_FILE}")
+    else:
+        for name in args.names:
+            print(f"{name} → {lookup_company(name) or '-'}")
@@ -6,20 +6,51 @@ from reportlab.lib.enums import TA_LEFT, TA_CENTER
 from reportlab.lib import colors
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import mm
+from reportlab.lib.utils import ImageReader
+from reportlab.rl_config import _FUZZ
 from reportlab.pdfbase.ttfonts import TTFont
 from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.pdfdoc import PDFImageXObject
 from datetime import date
+from functools import lru_cache
+from collections import OrderedDict
 from typing import Dict
 import re
+import io
+import copy
+import hashlib
 import os
 import json
 import ast
 
+from utils import make_domain_variant
+
 # --- Fonts ---
-pdfmetrics.registerFont(TTFont("Roboto", "fonts/Roboto-Regular.ttf"))
-pdfmetrics.registerFont(TTFont("Roboto-Bold", "fonts/Roboto-Bold.ttf"))
+FONT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fonts")
+FONT_FILES = {
+    "Roboto": "Roboto-Regular.ttf",
+    "Roboto-Bold": "Roboto-Bold.ttf",
+    "Roboto-Italic": "Roboto-Italic.ttf",
+}
 BASE_FONT = "Roboto"
 BOLD_FONT = "Roboto-Bold"
+ITALIC_FONT = "Roboto-Italic"
+
+
+def register_fonts():
+    """Registers the TTF fonts once per process (paths are resolved relative to this module)."""
+    registered = set(pdfmetrics.getRegisteredFontNames())
+    for name, file_name in FONT_FILES.items():
+        if name not in registered:
+            pdfmetrics.registerFont(TTFont(name, os.path.join(FONT_DIR, file_name)))
+
+
+register_fonts()
+
+# --- Page layout ---
+PAGE_MARGINS = {"leftMargin": 18 * mm, "rightMargin": 18 * mm, "topMargin": 25 * mm, "bottomMargin": 18 * mm}
+FRAME_PADDING = 6  # SimpleDocTemplate frame padding (top and bottom)
+FRAME_HEIGHT = A4[1] - PAGE_MARGINS["topMargin"] - PAGE_MARGINS["bottomMargin"] - 2 * FRAME_PADDING
 
 # --- Styles ---
 styles = getSampleStyleSheet()
@@ -85,6 +116,109 @@ project_card_stack_style = ParagraphStyle(
     spaceAfter=2,
 )
 
+# --- Shared paragraph styles (built once per process, reused by every render call) ---
+TEXT_COLOR = colors.HexColor("#222e3a")
+
+# First page
+styles.add(ParagraphStyle("LeftHeader", parent=styles["Heading3"], fontName=BOLD_FONT, spaceAfter=6))
+styles.add(ParagraphStyle("Summary", parent=styles["Normal"], leading=16))
+styles.add(ParagraphStyle(
+    "CardTitleBig",
+    parent=styles["Title"],
+    fontName=BOLD_FONT,
+    fontSize=28,
+    leading=32,
+    spaceAfter=10,
+    textColor=FIRM_COLOR,
+))
+styles.add(ParagraphStyle(
+    "ContactInfoBig",
+    parent=styles["Normal"],
+    fontSize=13,
+    leading=18,
+    spaceAfter=12,
+    textColor=colors.HexColor("#888888"),
+))
+
+# Hard skills overview
+styles.add(ParagraphStyle(
+    "OverviewTitle",
+    parent=styles["Heading2"],
+    fontName=BOLD_FONT,
+    fontSize=18,
+    leading=22,
+    textColor=FIRM_COLOR,
+    spaceBefore=6,
+    spaceAfter=6,
+))
+styles.add(ParagraphStyle("OverviewLeft", parent=styles["Normal"], fontName=BOLD_FONT, fontSize=11))
+styles.add(ParagraphStyle(
+    "OverviewRight",
+    parent=styles["Normal"],
+    fontSize=11,
+    leading=13,
+    wordWrap="CJK",  # nicer line wrapping
+    textColor=TEXT_COLOR,
+))
+
+# Project cards
+styles.add(ParagraphStyle(
+    "SectionTitle",
+    parent=styles["Heading2"],
+    fontSize=18,
+    leading=22,
+    spaceAfter=10,
+    textColor=FIRM_COLOR,
+))
+styles.add(ParagraphStyle(
+    "CardRespTitle",
+    parent=styles["Normal"],
+    fontSize=10,
+    leading=12,
+    spaceAfter=6,
+    textColor=FIRM_COLOR,
+))
+styles.add(ParagraphStyle(
+    "CardRespItem",
+    parent=styles["Normal"],
+    fontSize=10,
+    leading=12,
+    leftIndent=20,
+    firstLineIndent=-10,
+    textColor=TEXT_COLOR,
+))
+styles.add(ParagraphStyle(
+    "CardStackFixed",
+    parent=styles["Normal"],
+    fontSize=10,
+    leading=13,
+    leftIndent=55,
+    firstLineIndent=-55,
+    spaceBefore=4,
+    spaceAfter=8,
+    textColor=FIRM_COLOR,
+))
+
+# Skills overview table
+styles.add(ParagraphStyle(
+    "SkillsOverviewTitle",
+    parent=styles["Heading2"],
+    fontSize=18,
+    leading=22,
+    spaceAfter=12,
+    textColor=FIRM_COLOR,
+))
+styles.add(ParagraphStyle("HeaderLeft", parent=styles["Normal"], fontName=BOLD_FONT, fontSize=11,
+                          alignment=TA_LEFT, textColor=TEXT_COLOR))
+styles.add(ParagraphStyle("HeaderCenter", parent=styles["Normal"], fontName=BOLD_FONT, fontSize=11,
+                          alignment=TA_CENTER, textColor=TEXT_COLOR))
+styles.add(ParagraphStyle("CellLeft", parent=styles["Normal"], fontSize=11, alignment=TA_LEFT,
+                          textColor=TEXT_COLOR))
+styles.add(ParagraphStyle("CellCenter", parent=styles["Normal"], fontSize=11, alignment=TA_CENTER,
+                          textColor=TEXT_COLOR))
+styles.add(ParagraphStyle("CellTools", parent=styles["Normal"], fontSize=11, leading=13, alignment=TA_LEFT,
+                          wordWrap="CJK", textColor=TEXT_COLOR))
+
 # ============================================================
 #  HEADER / FOOTER
 # ============================================================
@@ -98,33 +232,73 @@ def resolve_logo_path():
         return None
 
 
-def add_inpro_header_footer(canvas, doc):
-    """Branded header + footer for Inpro Analytics, including the logo."""
-    width, height = A4
+HEADER_FOOTER_FORM = "InproHeaderFooter"
+LOGO_XOBJECT = "InproLogo"
+
+
+@lru_cache(maxsize=1)
+def load_logo():
+    """Decodes the logo once per process (None if there is no logo)."""
+    logo_path = resolve_logo_path()
+    if not logo_path:
+        return None
+    try:
+        return ImageReader(logo_path)
+    except Exception as e:
+        print(f"⚠️ Error loading logo: {e}")
+        return None
+
+
+@lru_cache(maxsize=1)
+def load_logo_xobject():
+    """
+    The logo as a PDF image object, encoded (ASCII85) once per process instead of once
+    per PDF; documents register copies that share the encoded stream (None if there is no logo).
+    """
+    logo = load_logo()
+    if logo is None:
+        return None
+    try:
+        xobject = PDFImageXObject(LOGO_XOBJECT, logo, mask="auto")
+    except Exception as e:
+        print(f"⚠️ Error encoding logo: {e}")
+        return None
+    xobject.XObjects = None
+    return xobject
+
+
+def draw_logo(canvas, x, y, width, height):
+    """Draws the pre-encoded logo, adding it to the document on first use."""
+    xobject = load_logo_xobject()
+    if xobject is None:
+        return
+    if not canvas.hasForm(LOGO_XOBJECT):
+        # A registered object is bound to its document: each document gets its own copy
+        canvas._doc.addForm(LOGO_XOBJECT, copy.copy(xobject))
+    canvas.saveState()
+    canvas.translate(x, y)
+    canvas.scale(width, height)
+    canvas.doForm(LOGO_XOBJECT)
+    canvas.restoreState()
+
+
+def draw_inpro_header_footer(canvas):
+    """Draws the branded header (logo) and footer for Inpro Analytics."""
     canvas.saveState()
 
     # Logo
-    logo_path = resolve_logo_path()
     page_width, page_height = A4
     logo_height = 58  # fixed logo height (can be adjusted)
 
-    if logo_path:
-        try:
-            canvas.drawImage(
-                logo_path,
-                0, page_height - logo_height,     # X=0 to start from the very left edge
-                width=page_width, height=logo_height,  # stretch to full page width
-                preserveAspectRatio=False,        # ⚠️ disable aspect ratio preservation
-                mask="auto"
-            )
-        except Exception as e:
-            print(f"⚠️ Error inserting logo: {e}")
+    try:
+        # X=0 to start from the very left edge, stretched to full page width (no aspect ratio)
+        draw_logo(canvas, 0, page_height - logo_height, page_width, logo_height)
+    except Exception as e:
+        print(f"⚠️ Error inserting logo: {e}")
 
-
- 
     # Footer
     footer_lines = ["Austria, Graz", "recruiting@inpro-analytics.at", "www.inpro-analytics.at"]
-    canvas.setFont("Roboto", 8)
+    canvas.setFont(BASE_FONT, 8)
     canvas.setFillColor(colors.HexColor("#A9A8A8"))
     y = 20
     for line in footer_lines:
@@ -134,6 +308,18 @@ def add_inpro_header_footer(canvas, doc):
     canvas.restoreState()
 
 
+def add_inpro_header_footer(canvas, doc):
+    """
+    Page callback: the header + footer are recorded once per document as a form XObject
+    (logo embedded once) and every page only references that form.
+    """
+    if not canvas.hasForm(HEADER_FOOTER_FORM):
+        canvas.beginForm(HEADER_FOOTER_FORM)
+        draw_inpro_header_footer(canvas)
+        canvas.endForm()
+    canvas.doForm(HEADER_FOOTER_FORM)
+
+
 # --- Utilities ---
 def sanitize_filename(name: str) -> str:
     return re.sub(r"[^A-Za-z0-9._-]+", "_", name.strip()) or "Unknown"
@@ -141,6 +327,62 @@ def sanitize_filename(name: str) -> str:
 def p(text, style):
     return Paragraph(text.replace("\n", "<br/>"), style)
 
+def content_key(value) -> str:
+    """Stable hash of a JSON-like value (used to reuse laid-out sections between renders)."""
+    raw = json.dumps(value, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.blake2b(raw.encode("utf-8"), digest_size=16).hexdigest()
+
+def cached_section(cache, name, inputs, build):
+    """
+    Returns build() memoized in `cache` under (name, content_key(inputs)).
+    Without a cache dict the section is simply built.
+    Cached flowables may be reused by consecutive (not concurrent) doc builds.
+    """
+    if cache is None:
+        return build()
+    key = (name, content_key(inputs))
+    if key not in cache:
+        cache[key] = build()
+    return cache[key]
+
+
+class SectionCache(OrderedDict):
+    """
+    Bounded LRU of built sections for repeated renders of the same CV
+    (e.g. incremental saves): only sections whose content hash changed are rebuilt.
+    Not thread-safe; one cache per rendering process.
+    """
+
+    def __init__(self, maxsize=512):
+        super().__init__()
+        self.maxsize = maxsize
+
+    def __getitem__(self, key):
+        value = super().__getitem__(key)
+        self.move_to_end(key)
+        return value
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+        while len(self) > self.maxsize:
+            self.popitem(last=False)
+
+class MeasuredTable(Table):
+    """
+    Table that computes its column widths and row heights once per available width.
+    Cached tables (skills, first page) are shared by consecutive documents, e.g. the
+    domain variants, and are not laid out again in each of them.
+    """
+
+    def wrap(self, availWidth, availHeight):
+        if getattr(self, "_measured_w", None) != availWidth:
+            self._calc(availWidth, availHeight)
+            self._measured_w = availWidth
+        self.availWidth = availWidth
+        return self._width, self._height
+
+
 def format_category_name(key: str) -> str:
     return {
         "cloud_platforms": "Cloud Platforms",
@@ -161,7 +403,7 @@ def format_category_name(key: str) -> str:
 # --- Sections ---
 def make_left_box(data, styles):
     items = []
-    header_style = ParagraphStyle("LeftHeader", parent=styles["Heading3"], fontName=BOLD_FONT, spaceAfter=6)
+    header_style = styles["LeftHeader"]
 
     edu = data.get("education", "")
     # Support both formats: new (degree/institution/year) and legacy (Institution/Abschluss/Jahr)
@@ -209,7 +451,7 @@ def make_left_box(data, styles):
 
 def make_right_box(data, styles):
     text = data.get("profile_summary", "") or ""
-    body = [p(text, ParagraphStyle("Summary", parent=styles["Normal"], leading=16))]
+    body = [p(text, styles["Summary"])]
     return KeepInFrame(0, 0, body, mode="shrink")
 
 def make_overview_box(data, styles):
@@ -222,18 +464,7 @@ def make_overview_box(data, styles):
         return None
 
     # Title
-    title_style = ParagraphStyle(
-        "OverviewTitle",
-        parent=styles["Heading2"],
-        fontName=BOLD_FONT,
-        fontSize=18,
-        leading=22,
-        textColor=FIRM_COLOR,
-        spaceBefore=6,
-        spaceAfter=6,
-    )
-
-    rows = [[Paragraph("OVERVIEW – Hard Skills", title_style), ""]]
+    rows = [[Paragraph("OVERVIEW – Hard Skills", styles["OverviewTitle"]), ""]]
     rows.append(["", ""])
 
     # Display order
@@ -304,17 +535,11 @@ def make_overview_box(data, styles):
         if len(tools_str) > 120:
             tools_str = tools_str[:117].rsplit(",", 1)[0]
 
-        left = Paragraph(f"<b>{format_category_name(key)}:</b>",
-                         ParagraphStyle("Left", parent=styles["Normal"],
-                                        fontName=BOLD_FONT, fontSize=11))
-        right = Paragraph(tools_str,
-                          ParagraphStyle("Right", parent=styles["Normal"],
-                                         fontSize=11, leading=13,
-                                         wordWrap='CJK',  # nicer line wrapping
-                                         textColor=colors.HexColor("#222e3a")))
+        left = Paragraph(f"<b>{format_category_name(key)}:</b>", styles["OverviewLeft"])
+        right = Paragraph(tools_str, styles["OverviewRight"])
         rows.append([left, right])
 
-    table = Table(rows, colWidths=[55*mm, 120*mm], hAlign="LEFT")
+    table = MeasuredTable(rows, colWidths=[55*mm, 120*mm], hAlign="LEFT")
     style = TableStyle([
         ("VALIGN", (0, 0), (-1, -1), "TOP"),
         ("LEFTPADDING", (0, 0), (-1, -1), 4),
@@ -335,10 +560,8 @@ def make_overview_box(data, styles):
     return table
 
 
-def make_first_page_section(data, styles):
-    """
-    First page: name, title, contacts, Education, Languages, Domains, and Summary.
-    """
+def make_first_page_header(data, styles):
+    """Contacts + name/title block at the top of the first page."""
     elements = []
 
     full_name = data.get("full_name", "")
@@ -347,6 +570,31 @@ def make_first_page_section(data, styles):
     email = data.get("email", "")
     phone = data.get("phone", "")
 
+    # --- Header (name and title) ---
+    header = f'<b>{full_name}</b>'
+    if position:
+        header += f'<br/><font size="20" color="#888888">{position}</font>'
+    header_p = Paragraph(header, styles["CardTitleBig"])
+
+    # --- Contact info ---
+    contact_lines = []
+    if location:
+        contact_lines.append(f'<font color="#888888">{location}</font>')
+    if email:
+        contact_lines.append(f'<font color="#888888">{email}</font>')
+    if phone:
+        contact_lines.append(f'<font color="#888888">{phone}</font>')
+
+    if contact_lines:
+        contact_p = Paragraph("<br/>".join(contact_lines), styles["ContactInfoBig"])
+        elements.append(contact_p)
+
+    elements.append(header_p)
+    return elements
+
+
+def make_first_page_columns(data, styles):
+    """Two-column table: Education, Languages, Domains, Companies | Profile Summary."""
     # --- Left column (Education, Languages, Domains) ---
     left_box = make_left_box(data, styles)
 
@@ -356,7 +604,7 @@ def make_first_page_section(data, styles):
     # --- Two-column table ---
     left_w = 70 * mm
     right_w = 90 * mm
-    table = Table([[left_box, right_box]], colWidths=[left_w, right_w], hAlign="LEFT")
+    table = MeasuredTable([[left_box, right_box]], colWidths=[left_w, right_w], hAlign="LEFT")
     table.setStyle(TableStyle([
         ("VALIGN", (0, 0), (-1, -1), "TOP"),
         ("LEFTPADDING", (0, 0), (-1, -1), 0),
@@ -364,45 +612,20 @@ def make_first_page_section(data, styles):
         ("TOPPADDING", (0, 0), (-1, -1), 0),
         ("BOTTOMPADDING", (0, 0), (-1, -1), 0),
     ]))
+    return table
 
-    # --- Header (name and title) ---
-    header = f'<b>{full_name}</b>'
-    if position:
-        header += f'<br/><font size="20" color="#888888">{position}</font>'
-    header_p = Paragraph(header, ParagraphStyle(
-        "CardTitleBig",
-        parent=styles["Title"],
-        fontName=BOLD_FONT,
-        fontSize=28,
-        leading=32,
-        spaceAfter=10,
-        textColor=FIRM_COLOR,
-    ))
 
-    # --- Contact info ---
-    contact_lines = []
-    if location:
-        contact_lines.append(f'<font color="#888888">{location}</font>')
-    if email:
-        contact_lines.append(f'<font color="#888888">{email}</font>')
-    if phone:
-        contact_lines.append(f'<font color="#888888">{phone}</font>')
-
-    if contact_lines:
-        contact_p = Paragraph("<br/>".join(contact_lines), ParagraphStyle(
-            "ContactInfoBig",
-            parent=styles["Normal"],
-            fontSize=13,
-            leading=18,
-            spaceAfter=12,
-            textColor=colors.HexColor("#888888"),
-        ))
-        elements.append(contact_p)
+def make_first_page_section(data, styles, cache=None):
+    """
+    First page: name, title, contacts, Education, Languages, Domains, and Summary.
+    """
+    header_inputs = [data.get(k, "") for k in ("full_name", "title", "location", "email", "phone")]
+    column_inputs = [data.get(k) for k in ("education", "languages", "domains", "companies", "profile_summary")]
 
-    # --- Assemble block ---
-    elements.append(header_p)
+    elements = []
+    elements += cached_section(cache, "first_page_header", header_inputs, lambda: make_first_page_header(data, styles))
     elements.append(Spacer(1, 10))
-    elements.append(table)
+    elements.append(cached_section(cache, "first_page_columns", column_inputs, lambda: make_first_page_columns(data, styles)))
     elements.append(Spacer(1, 20))
 
     return elements
@@ -410,6 +633,16 @@ def make_first_page_section(data, styles):
 
 
 class RoundedCard(Flowable):
+    """
+    Project card with a rounded border.
+
+    The content is measured once per inner width and the line breaks/heights are
+    cached, so repeated wrap() calls (KeepTogether, frame split checks, draw) do not
+    lay the paragraphs out again. A card taller than the space left on the page keeps
+    its size (the frame moves it to the next page); only a card taller than a whole
+    frame (FRAME_HEIGHT) is shrunk with KeepInFrame(mode="shrink"), once per width.
+    """
+
     def __init__(self, content, width, padding=20, radius=6,
                  strokeColor=colors.HexColor("#2196F3"),
                  strokeWidth=1.2, shadow=True):
@@ -426,6 +659,43 @@ class RoundedCard(Flowable):
         self._height = 0
         self._outerW = width  # actual width used in draw()
 
+        # Measure-once cache: inner width -> (content height, [(flowable, width, y_from_top)])
+        self._measured_w = None
+        self._measured = None
+        self._shrunk = None  # (inner width, KeepInFrame, height) for cards taller than a frame
+
+    def measure(self, innerW):
+        """Wraps every content flowable once at innerW and caches heights and positions."""
+        if self._measured_w == innerW and self._measured is not None:
+            return self._measured
+
+        placed = []
+        y = 0  # distance from the top of the content box
+        pS = 0
+        first = True
+        for f in self.content:
+            # Flowables shared between cards (cached card bodies) keep their last wrap at this width
+            wrapped = getattr(f, "_card_wrap", None)
+            if wrapped and wrapped[0] == innerW:
+                w, h = wrapped[1:]
+            else:
+                w, h = f.wrapOn(self.canv, innerW, 0xfffffff)
+                f._card_wrap = (innerW, w, h)
+            if h < _FUZZ:
+                continue
+            if not first:
+                y += max(f.getSpaceBefore() - pS, 0)
+            first = False
+            y += h
+            placed.append((f, w, y))
+            pS = f.getSpaceAfter()
+            y += pS
+
+        height = y - pS
+        self._measured_w = innerW
+        self._measured = (height, placed)
+        return self._measured
+
     def wrap(self, availW, availH):
         # Small epsilon to ensure we never exceed the frame width
         EPS = 1.0
@@ -437,15 +707,31 @@ class RoundedCard(Flowable):
         innerW = self._outerW - 2 * self.padding
         innerW = max(1, innerW)
 
-        innerH = max(1, availH - 2 * self.padding)
-
-        kif = KeepInFrame(innerW, innerH, self.content, mode="shrink")
-        w, h = kif.wrapOn(self.canv, innerW, innerH)
+        # The limit is a whole frame, not availH: a card that does not fit the rest of
+        # the page is moved to the next one at its natural size
+        maxH = max(1, FRAME_HEIGHT - 2 * self.padding - border)
 
-        # KeepInFrame may return 0 height for empty content, which breaks layout
+        if self._shrunk and self._shrunk[0] == innerW:
+            self._inner, h = self._shrunk[1:]
+        else:
+            h, _ = self.measure(innerW)
+            if h <= maxH + _FUZZ:
+                self._inner = None
+                h = h - _FUZZ
+            else:
+                # Taller than a frame: shrink to fit. The content is re-wrapped at the scaled
+                # width, so its natural measurements no longer match the flowables' state
+                kif = KeepInFrame(innerW, maxH, self.content, mode="shrink")
+                w, h = kif.wrapOn(self.canv, innerW, maxH)
+                self._inner = kif
+                self._shrunk = (innerW, kif, h)
+                self._measured_w = self._measured = None
+                for f in self.content:
+                    f._card_wrap = None
+
+        # Empty content may measure as 0 height, which breaks layout
         h = max(1, h)
 
-        self._inner = kif
         self._height = max(1, h + 2 * self.padding + border)
 
         # ⬅️ Return the actual width we will draw
@@ -469,167 +755,161 @@ class RoundedCard(Flowable):
 
         if self._inner:
             self._inner.drawOn(c, self.padding, self.padding)
+            return
+
+        # Place the cached measurements directly (no second layout pass)
+        innerW = self._measured_w
+        content_h, placed = self._measured
+        top = self.padding + content_h - _FUZZ
+        for f, fw, y in placed:
+            f.drawOn(c, self.padding, top - y, _sW=innerW - fw)
+
+def make_project_card_header(project, idx):
+    """Numbered title paragraph of a project card (the only part that depends on the card number)."""
+    title = (project.get("project_title") or "").strip()
+    role = (project.get("role") or "").strip()
+    duration = (project.get("duration") or "").strip()
+
+    header = f"<b>Project {idx}. {title}</b>"
+    if role:
+        header += f'<br/><font size="11" color="#888888">{role}</font>'
+    if duration:
+        header += f'<br/><font name="{ITALIC_FONT}" size="10" color="#2196F3">{duration}</font>'
+    return Paragraph(header, project_card_title_style)
+
+
+def make_project_card_body(project, styles):
+    """Builds the card content below the header (None for empty projects)."""
+    # Normalize (editors often return None)
+    title = (project.get("project_title") or "").strip()
+    role = (project.get("role") or "").strip()
+    overview = (project.get("overview") or "").strip()
+    duration = (project.get("duration") or "").strip()
+    tech_stack = project.get("tech_stack") or []
+    responsibilities = project.get("responsibilities") or []
+
+    # Skip empty projects (otherwise the card may become degenerate)
+    has_any = bool(title or role or overview or duration)
+    if not has_any:
+        if isinstance(tech_stack, list) and any(str(x).strip() for x in tech_stack):
+            has_any = True
+        if isinstance(responsibilities, list) and any(str(x).strip() for x in responsibilities):
+            has_any = True
+    if not has_any:
+        return None
 
-def make_projects_section(projects, styles):
+    # --- Project description ---
+    desc_p = Paragraph(overview, project_card_desc_style) if overview else None
+
+    # --- Responsibilities ---
+    resp_items = []
+
+    # Normalize responsibilities into list[str]
+    if isinstance(responsibilities, list):
+        responsibilities = [str(r).strip() for r in responsibilities if str(r).strip()]
+    elif isinstance(responsibilities, str) and responsibilities.strip():
+        s = responsibilities.strip()
+        # Handle stringified list, e.g. "['a', 'b']" or "[\"a\", \"b\"]"
+        if s.startswith("[") and s.endswith("]"):
+            parsed = None
+            try:
+                parsed = ast.literal_eval(s)
+            except Exception:
+                try:
+                    parsed = json.loads(s)
+                except Exception:
+                    parsed = None
+            if isinstance(parsed, list):
+                responsibilities = [str(r).strip() for r in parsed if str(r).strip()]
+            else:
+                responsibilities = [s]
+        else:
+            # Split multiline/bulleted text into separate items
+            lines = [ln.strip() for ln in s.splitlines() if ln.strip()]
+            if len(lines) > 1:
+                responsibilities = [ln.lstrip("•*-·–— ").strip() for ln in lines if ln.strip()]
+            else:
+                responsibilities = [s]
+    else:
+        responsibilities = []
+
+    if responsibilities:
+        resp_items.append(Paragraph("Responsibilities:", styles["CardRespTitle"]))
+        for r in responsibilities:
+            resp_items.append(Paragraph(f"• {r}", styles["CardRespItem"]))
+
+    # --- Tech stack (aligned with the rest of the text) ---
+    stack_p = None
+    if isinstance(tech_stack, list):
+        tech_stack = [str(t).strip() for t in tech_stack if str(t).strip()]
+    elif isinstance(tech_stack, str) and tech_stack.strip():
+        tech_stack = [tech_stack.strip()]
+    else:
+        tech_stack = []
+
+    if tech_stack:
+        stack = " · ".join(tech_stack)
+        stack_p = Paragraph(
+            f'<b><font color="#2196F3">Tech stack:</font></b> {stack}',
+            styles["CardStackFixed"],
+        )
+
+    # --- Assemble card content ---
+    card_content = []
+    if desc_p:
+        card_content.append(desc_p)
+    if resp_items:
+        card_content.extend(resp_items)
+    if stack_p:
+        card_content.append(stack_p)
+
+    return card_content
+
+
+def make_project_card(project, idx, styles, cache=None):
+    """
+    Builds the rounded card for one project (None for empty projects).
+    The body is cached by project content, so a renumbered card (e.g. in a domain
+    variant) only lays out its header again.
+    """
+    body = cached_section(cache, "project_body", project, lambda: make_project_card_body(project, styles))
+    if body is None:
+        return None
+
+    # --- Create rounded card ---
+    return RoundedCard(
+        content=[make_project_card_header(project, idx)] + body,
+        width=None,
+        padding=20,
+        radius=6,
+        strokeColor=FIRM_COLOR,
+        strokeWidth=1.2,
+        shadow=True,
+    )
+
+
+def make_projects_section(projects, styles, cache=None):
     if not projects:
         return []
 
     elements = []
-    FIRM_COLOR = colors.HexColor("#2196F3")
 
     # --- Section title ---
     section_title = Paragraph(
         '<font color="#2196F3"><b>PROJECTS & EXPERIENCE</b></font>',
-        ParagraphStyle(
-            "SectionTitle",
-            parent=styles["Heading2"],
-            fontSize=18,
-            leading=22,
-            spaceAfter=10,
-            textColor=FIRM_COLOR,
-        )
+        styles["SectionTitle"],
     )
 
     cards_on_page = 0
     first_card_done = False
 
     for idx, project in enumerate(projects, 1):
-        # Normalize (editors often return None)
-        title = (project.get("project_title") or "").strip()
-        role = (project.get("role") or "").strip()
-        overview = (project.get("overview") or "").strip()
-        duration = (project.get("duration") or "").strip()
-        tech_stack = project.get("tech_stack") or []
-        responsibilities = project.get("responsibilities") or []
-
-        # Skip empty projects (otherwise the card may become degenerate)
-        has_any = bool(title or role or overview or duration)
-        if not has_any:
-            if isinstance(tech_stack, list) and any(str(x).strip() for x in tech_stack):
-                has_any = True
-            if isinstance(responsibilities, list) and any(str(x).strip() for x in responsibilities):
-                has_any = True
-        if not has_any:
-            continue
-
-        pdfmetrics.registerFont(TTFont("Roboto-Italic", "fonts/Roboto-Italic.ttf"))
-
-        # --- Card header ---
-        header = f"<b>Project {idx}. {title}</b>"
-        if role:
-            header += f'<br/><font size="11" color="#888888">{role}</font>'
-        if duration:
-            header += f'<br/><font name="Roboto-Italic" size="10" color="#2196F3">{duration}</font>'
-        header_p = Paragraph(header, project_card_title_style)
-
-        # --- Project description ---
-        desc_p = Paragraph(overview, project_card_desc_style) if overview else None
-
-        # --- Responsibilities ---
-        resp_items = []
-
-        # Normalize responsibilities into list[str]
-        if isinstance(responsibilities, list):
-            responsibilities = [str(r).strip() for r in responsibilities if str(r).strip()]
-        elif isinstance(responsibilities, str) and responsibilities.strip():
-            s = responsibilities.strip()
-            # Handle stringified list, e.g. "['a', 'b']" or "[\"a\", \"b\"]"
-            if s.startswith("[") and s.endswith("]"):
-                parsed = None
-                try:
-                    parsed = ast.literal_eval(s)
-                except Exception:
-                    try:
-                        parsed = json.loads(s)
-                    except Exception:
-                        parsed = None
-                if isinstance(parsed, list):
-                    responsibilities = [str(r).strip() for r in parsed if str(r).strip()]
-                else:
-                    responsibilities = [s]
-            else:
-                # Split multiline/bulleted text into separate items
-                lines = [ln.strip() for ln in s.splitlines() if ln.strip()]
-                if len(lines) > 1:
-                    responsibilities = [ln.lstrip("•*-·–— ").strip() for ln in lines if ln.strip()]
-                else:
-                    responsibilities = [s]
-        else:
-            responsibilities = []
-
-        if responsibilities:
-            resp_items.append(Paragraph(
-                "Responsibilities:",
-                ParagraphStyle(
-                    "CardRespTitle",
-                    parent=styles["Normal"],
-                    fontSize=10,
-                    leading=12,
-                    spaceAfter=6,
-                    textColor=FIRM_COLOR,
-                ),
-            ))
-            for r in responsibilities:
-                resp_items.append(
-                    Paragraph(
-                        f"• {r}",
-                        ParagraphStyle(
-                            "CardRespItem",
-                            parent=styles["Normal"],
-                            fontSize=10,
-                            leading=12,
-                            leftIndent=20,
-                            firstLineIndent=-10,
-                            textColor=colors.HexColor("#222e3a"),
-                        ),
-                    )
-                )
-
-        # --- Tech stack (aligned with the rest of the text) ---
-        stack_p = None
-        if isinstance(tech_stack, list):
-            tech_stack = [str(t).strip() for t in tech_stack if str(t).strip()]
-        elif isinstance(tech_stack, str) and tech_stack.strip():
-            tech_stack = [tech_stack.strip()]
-        else:
-            tech_stack = []
-
-        if tech_stack:
-            stack = " · ".join(tech_stack)
-            stack_p = Paragraph(
-                f'<b><font color="#2196F3">Tech stack:</font></b> {stack}',
-                ParagraphStyle(
-                    "CardStackFixed",
-                    parent=styles["Normal"],
-                    fontSize=10,
-                    leading=13,
-                    leftIndent=55,
-                    firstLineIndent=-55,
-                    spaceBefore=4,
-                    spaceAfter=8,
-                    textColor=FIRM_COLOR,
-                ),
-            )
-
-        # --- Assemble card content ---
-        card_content = [header_p]
-        if desc_p:
-            card_content.append(desc_p)
-        if resp_items:
-            card_content.extend(resp_items)
-        if stack_p:
-            card_content.append(stack_p)
-
-        # --- Create rounded card ---
-        card = RoundedCard(
-            content=card_content,
-            width=None,
-            padding=20,
-            radius=6,
-            strokeColor=FIRM_COLOR,
-            strokeWidth=1.2,
-            shadow=True,
+        # Cards are keyed by number + content, so unchanged cards keep their cached layout
+        card = cached_section(
+            cache, "project_card", [idx, project], lambda: make_project_card(project, idx, styles, cache=cache)
         )
+        if card is None:
+            continue
 
         # --- Add cards to the flow ---
         if not first_card_done:
@@ -690,14 +970,7 @@ def make_skills_overview_box(data, styles):
 
     title = Paragraph(
         '<font color="#2196F3"><b>SKILLS OVERVIEW</b></font>',
-        ParagraphStyle(
-            "SkillsOverviewTitle",
-            parent=styles["Heading2"],
-            fontSize=18,
-            leading=22,
-            spaceAfter=12,
-            textColor=colors.HexColor("#2196F3"),
-        )
+        styles["SkillsOverviewTitle"],
     )
 
     grouped = {}
@@ -726,22 +999,12 @@ def make_skills_overview_box(data, styles):
             grouped[cat]["max_years_num"] = yoe_num
             grouped[cat]["yoe_display"] = (yoe_raw or "-")
 
-    # --- Styles
-    header_left = ParagraphStyle("HeaderLeft", parent=styles["Normal"],
-                                 fontName=BOLD_FONT, fontSize=11,
-                                 alignment=TA_LEFT, textColor=colors.HexColor("#222e3a"))
-    header_center = ParagraphStyle("HeaderCenter", parent=styles["Normal"],
-                                   fontName=BOLD_FONT, fontSize=11,
-                                   alignment=TA_CENTER, textColor=colors.HexColor("#222e3a"))
-    cell_left = ParagraphStyle("CellLeft", parent=styles["Normal"],
-                               fontSize=11, alignment=TA_LEFT,
-                               textColor=colors.HexColor("#222e3a"))
-    cell_center = ParagraphStyle("CellCenter", parent=styles["Normal"],
-                                 fontSize=11, alignment=TA_CENTER,
-                                 textColor=colors.HexColor("#222e3a"))
-    cell_tools = ParagraphStyle("CellTools", parent=styles["Normal"],
-                                fontSize=11, leading=13, alignment=TA_LEFT,
-                                wordWrap='CJK', textColor=colors.HexColor("#222e3a"))
+    # --- Styles (shared registry, see top of module)
+    header_left = styles["HeaderLeft"]
+    header_center = styles["HeaderCenter"]
+    cell_left = styles["CellLeft"]
+    cell_center = styles["CellCenter"]
+    cell_tools = styles["CellTools"]
 
     # --- Table ---
     rows = [[
@@ -773,7 +1036,7 @@ def make_skills_overview_box(data, styles):
 
 
 
-    table = Table(rows, colWidths=[55 * mm, 95 * mm, 25 * mm], hAlign="LEFT")
+    table = MeasuredTable(rows, colWidths=[55 * mm, 95 * mm, 25 * mm], hAlign="LEFT")
 
     style = TableStyle([
         ("VALIGN", (0, 0), (-1, -1), "TOP"),
@@ -798,47 +1061,106 @@ def make_skills_overview_box(data, styles):
 
 
 # --- Main PDF build ---
-def create_pretty_first_section(json_data, output_dir=".", prefix="CV Inpro"):
-    """Creates a PDF named 'CV Inpro <FirstName> <Position>.pdf' in a Windows-safe way."""
+def build_pdf_filename(json_data, prefix="CV Inpro", suffix="") -> str:
+    """Returns 'CV Inpro <FirstName> <Position>.pdf' in a Windows-safe way."""
     full_name = json_data.get("full_name", "Unknown").strip()
     title = json_data.get("title", "").strip()
 
     # Combine name and title into one string and sanitize immediately
-    raw_filename = f"{prefix} {full_name} {title}".strip()
-    safe_filename = sanitize_filename(raw_filename)
+    raw_filename = f"{prefix} {full_name} {title} {suffix}".strip()
+    return f"{sanitize_filename(raw_filename)}.pdf"
 
-    # Add extension
-    fname = f"{safe_filename}.pdf"
-    out_path = os.path.join(output_dir, fname)
-
-    # Create PDF
-    doc = SimpleDocTemplate(
-        out_path,
-        pagesize=A4,
-        leftMargin=18 * mm,
-        rightMargin=18 * mm,
-        topMargin=25 * mm,
-        bottomMargin=18 * mm,
-    )
 
+def make_cv_story(json_data, cache=None):
+    """
+    Builds the full list of flowables for one CV.
+    With a cache dict, sections whose content is unchanged reuse the flowables
+    (and cached card measurements) of a previous call.
+    """
     elements = []
-    elements += make_first_page_section(json_data, styles)
+    elements += make_first_page_section(json_data, styles, cache=cache)
 
-    overview_box = make_overview_box(json_data, styles)
+    overview_box = cached_section(
+        cache, "overview", json_data.get("hard_skills"), lambda: make_overview_box(json_data, styles)
+    )
     if overview_box:
         elements.append(overview_box)
 
-    projects_section = make_projects_section(json_data.get("projects_experience", []), styles)
+    projects_section = make_projects_section(json_data.get("projects_experience", []), styles, cache=cache)
     elements += projects_section
 
-    skills_overview_box = make_skills_overview_box(json_data, styles)
+    skills_overview_box = cached_section(
+        cache, "skills_overview", json_data.get("skills_overview"), lambda: make_skills_overview_box(json_data, styles)
+    )
     if skills_overview_box:
         elements.extend([Spacer(1, 6), *skills_overview_box])
 
+    return elements
+
+
+def render_cv_pdf(json_data, prefix="CV Inpro", output_dir=None, cache=None, file_suffix="") -> Dict:
+    """
+    Renders the CV into memory and returns the PDF bytes plus metadata:
+    {"pdf_bytes", "file_name", "page_count", "path"}.
+    The PDF is written to disk only if output_dir is given ("path" is None otherwise).
+    """
+    file_name = build_pdf_filename(json_data, prefix=prefix, suffix=file_suffix)
+
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(
+        buffer,
+        pagesize=A4,
+        **PAGE_MARGINS,
+    )
+
     # Build PDF with branded header and footer
-    doc.build(elements, onFirstPage=add_inpro_header_footer, onLaterPages=add_inpro_header_footer)
+    story = make_cv_story(json_data, cache=cache)
+    doc.build(story, onFirstPage=add_inpro_header_footer, onLaterPages=add_inpro_header_footer)
+    pdf_bytes = buffer.getvalue()
+
+    out_path = None
+    if output_dir is not None:
+        os.makedirs(output_dir, exist_ok=True)
+        out_path = os.path.join(output_dir, file_name)
+        with open(out_path, "wb") as f:
+            f.write(pdf_bytes)
+
+    return {
+        "pdf_bytes": pdf_bytes,
+        "file_name": file_name,
+        "page_count": doc.page,
+        "path": out_path,
+    }
+
 
-    return out_path
+def render_cv_pdf_variants(json_data, domain_filters, prefix="CV Inpro", output_dir=None) -> list[Dict]:
+    """
+    Renders one PDF per domain selection in a single call (an empty selection = all projects).
+    The first-page header, the hard-skills overview, the skills table and every project card
+    are built and measured once and shared by all variants; only the domain/company column
+    and the card flow are rebuilt per variant.
+    Returns render_cv_pdf() results, each with an extra "domains" key.
+    """
+    cache = {}
+    results = []
+    for selected in domain_filters:
+        selected = [str(d) for d in (selected or []) if str(d).strip()]
+        variant = make_domain_variant(json_data, selected)
+        result = render_cv_pdf(
+            variant,
+            prefix=prefix,
+            output_dir=output_dir,
+            cache=cache,
+            file_suffix=" ".join(selected),
+        )
+        result["domains"] = selected
+        results.append(result)
+    return results
+
+
+def create_pretty_first_section(json_data, output_dir=".", prefix="CV Inpro"):
+    """Creates a PDF named 'CV Inpro <FirstName> <Position>.pdf' in output_dir and returns its path."""
+    return render_cv_pdf(json_data, prefix=prefix, output_dir=output_dir)["path"]
 
 # Streamlit-dependent comparison utilities were moved to similarity_view.py to decouple this module.
 
@@ -0,0 +1,172 @@
+import re
+from functools import lru_cache
+from typing import NamedTuple, Optional
+
+# ============================================================
+# 🗓 Date parser shared by pdf_processor and postprocess
+# ============================================================
+# Every date-handling step (merging date lines in the PDF text, duration
+# normalization, open ranges) tokenizes strings with the same regex into typed
+# intervals. Results are memoized, so repeated strings (durations of long
+# project lists, the same CV re-processed) are parsed once.
+
+MONTH_ABBR = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+
+MONTH_WORDS = {
+    "jan": 1, "january": 1, "januar": 1, "jän": 1, "jänner": 1,
+    "feb": 2, "february": 2, "februar": 2,
+    "mar": 3, "march": 3, "mär": 3, "märz": 3, "maerz": 3,
+    "apr": 4, "april": 4,
+    "may": 5, "mai": 5,
+    "jun": 6, "june": 6, "juni": 6,
+    "jul": 7, "july": 7, "juli": 7,
+    "aug": 8, "august": 8,
+    "sep": 9, "sept": 9, "september": 9,
+    "oct": 10, "october": 10, "okt": 10, "oktober": 10,
+    "nov": 11, "november": 11,
+    "dec": 12, "december": 12, "dez": 12, "dezember": 12,
+}
+
+PRESENT_WORDS = (
+    r"(?:till|until|bis)\s+(?:now|today|heute|dato)|to\s+date|present|now|today|currently|current|"
+    r"heute|jetzt|aktuell|derzeit|gegenwärtig|momentan|laufend|ongoing"
+)
+
+_MONTH_NAME = "|".join(sorted(MONTH_WORDS, key=len, reverse=True))
+_YEAR4 = r"(?:19|20)\d{2}"
+_HSPACE = r"[^\S\r\n]"   # whitespace within a line: a date or range never spans a line break
+
+_DATE_FORMS = {
+    "month": rf"(?P<mname>{_MONTH_NAME})\.?(?![a-zäöü]),?{_HSPACE}*(?P<myear>{_YEAR4}|'\d{{2}})",
+    "day": rf"(?:0?[1-9]|[12]\d|3[01])\.(?P<dmonth>0?[1-9]|1[0-2])\.(?P<dyear>{_YEAR4})",
+    "numeric": rf"(?P<nmonth>0?[1-9]|1[0-2])(?:{_HSPACE}?[./]{_HSPACE}?|-(?={_YEAR4}))(?P<nyear>{_YEAR4}|\d{{2}})",
+    "year": rf"(?P<year>{_YEAR4})",
+}
+_DATE_RE = re.compile("|".join(f"(?:{form})" for form in _DATE_FORMS.values()), re.I)
+_NAMED_GROUP = re.compile(r"\(\?P<\w+>")
+_DATE = "(?:" + "|".join(f"(?:{_NAMED_GROUP.sub('(?:', form)})" for form in _DATE_FORMS.values()) + r")(?!\d|[./]\d)"
+
+_TOKEN_RE = re.compile(
+    rf"(?<![\w./])(?:"
+    rf"(?:seit|since)\s+(?P<since>{_DATE})"
+    rf"|(?P<start>{_DATE})"
+    rf"(?:(?:{_HSPACE}*[-–—−]+{_HSPACE}*|{_HSPACE}+(?:bis|to|until|till){_HSPACE}+)"
+    rf"(?:(?P<end>{_DATE})|(?P<present>{PRESENT_WORDS})(?![\w])|(?P<yy>\d{{2}})(?=[ \t]*(?:$|\n|[,;)|]))"
+    rf"|(?P<open>)(?=[ \t]*(?:$|\n|[,;)|]))))?"
+    rf")",
+    re.I,
+)
+
+
+class DateInterval(NamedTuple):
+    """
+    A date or date range found in a string.
+    start/end are (year, month) with month None for year-only dates; end is None
+    for single dates and open ranges ("07.21 – heute": open_ended=True).
+    pos/endpos locate the match in the parsed string.
+    """
+    start: tuple
+    end: Optional[tuple]
+    open_ended: bool
+    pos: int
+    endpos: int
+    style: str  # "month" (Mar 2021), "numeric" (03.21, 03/2021, 1.3.2021) or "year"
+
+    @property
+    def is_range(self) -> bool:
+        return self.open_ended or self.end is not None
+
+
+def expand_year(two_digits: int) -> int:
+    """'21' → 2021, '95' → 1995 (same heuristic as before: < 30 → 2000+)."""
+    return 2000 + two_digits if two_digits < 30 else 1900 + two_digits
+
+
+@lru_cache(maxsize=4096)
+def parse_date(text: str):
+    """Parses exactly one date ("Mar 2021", "03.21", "1.3.2021", "2021") → ((year, month), style) or None."""
+    m = _DATE_RE.fullmatch(text.strip())
+    if not m:
+        return None
+    if m.group("mname"):
+        year = m.group("myear")
+        year = expand_year(int(year[1:])) if year.startswith("'") else int(year)
+        return (year, MONTH_WORDS[m.group("mname").lower()]), "month"
+    if m.group("dmonth"):
+        return (int(m.group("dyear")), int(m.group("dmonth"))), "numeric"
+    if m.group("nmonth"):
+        year = m.group("nyear")
+        year = int(year) if len(year) == 4 else expand_year(int(year))
+        return (year, int(m.group("nmonth"))), "numeric"
+    return (int(m.group("year")), None), "year"
+
+
+def _order_key(d: tuple) -> tuple:
+    return d[0], d[1] or 0
+
+
+@lru_cache(maxsize=8192)
+def parse_dates(text: str) -> tuple:
+    """Tokenizes `text` once into DateInterval objects (memoized per string)."""
+    intervals = []
+    for m in _TOKEN_RE.finditer(text or ""):
+        if m.group("since"):
+            start, style = parse_date(m.group("since"))
+            intervals.append(DateInterval(start, None, True, m.start(), m.end(), style))
+            continue
+
+        start, style = parse_date(m.group("start"))
+        end, open_ended, endpos = None, False, m.end()
+        if m.group("end"):
+            end = parse_date(m.group("end"))[0]
+        elif m.group("present") or m.group("open") is not None:
+            open_ended = True
+        elif m.group("yy"):
+            if style == "year":  # "2020 – 23"
+                end = (start[0] // 100 * 100 + int(m.group("yy")), None)
+            else:
+                endpos = m.end("start")
+
+        if end is not None and _order_key(end) < _order_key(start):
+            start, end = end, start
+        intervals.append(DateInterval(start, end, open_ended, m.start(), endpos, style))
+    return tuple(intervals)
+
+
+# ============================================================
+# Formatting
+# ============================================================
+def format_date(d: tuple) -> str:
+    year, month = d
+    return f"{MONTH_ABBR[month - 1]} {year}" if month else str(year)
+
+
+def format_interval(interval: DateInterval) -> str:
+    """'Jul 2021 – Present', 'Mar 2020 – Oct 2023', '2020 – 2023' or a single 'Jul 2021'."""
+    start = format_date(interval.start)
+    if interval.open_ended:
+        return f"{start} – Present"
+    if interval.end is not None:
+        return f"{start} – {format_date(interval.end)}"
+    return start
+
+
+def rewrite_dates(text: str, intervals=None, formatter=format_interval) -> str:
+    """Replaces every date/range in `text` with formatter(interval), keeping the text around it."""
+    if intervals is None:
+        intervals = parse_dates(text)
+    if not intervals:
+        return text
+    parts, pos = [], 0
+    for interval in intervals:
+        parts.append(text[pos:interval.pos])
+        parts.append(formatter(interval))
+        pos = interval.endpos
+    parts.append(text[pos:])
+    return "".join(parts)
+
+
+@lru_cache(maxsize=4096)
+def normalize_date_text(text: str) -> str:
+    """Canonical form of all dates in a string ('07.21 -' → 'Jul 2021 – Present')."""
+    return rewrite_dates(text)
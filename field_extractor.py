@@ -0,0 +1,253 @@
+import re
+
+# ============================================================
+# 📇 Local extraction of regular CV fields (no GPT)
+# ============================================================
+# Languages + CEFR levels, education rows, e-mail, phone and website follow
+# very regular patterns. They are extracted here from the page text (before the
+# GPT normalization strips "@" and "+"), and fields found with confidence are
+# left out of the GPT prompts.
+
+LANGUAGE_NAMES = {
+    "english": "English", "englisch": "English",
+    "german": "German", "deutsch": "German",
+    "french": "French", "französisch": "French", "franzoesisch": "French",
+    "spanish": "Spanish", "spanisch": "Spanish",
+    "italian": "Italian", "italienisch": "Italian",
+    "russian": "Russian", "russisch": "Russian",
+    "ukrainian": "Ukrainian", "ukrainisch": "Ukrainian",
+    "polish": "Polish", "polnisch": "Polish",
+    "czech": "Czech", "tschechisch": "Czech",
+    "slovak": "Slovak", "slowakisch": "Slovak",
+    "hungarian": "Hungarian", "ungarisch": "Hungarian",
+    "romanian": "Romanian", "rumänisch": "Romanian",
+    "croatian": "Croatian", "kroatisch": "Croatian",
+    "serbian": "Serbian", "serbisch": "Serbian",
+    "bosnian": "Bosnian", "bosnisch": "Bosnian",
+    "slovenian": "Slovenian", "slowenisch": "Slovenian",
+    "bulgarian": "Bulgarian", "bulgarisch": "Bulgarian",
+    "portuguese": "Portuguese", "portugiesisch": "Portuguese",
+    "dutch": "Dutch", "niederländisch": "Dutch",
+    "swedish": "Swedish", "schwedisch": "Swedish",
+    "turkish": "Turkish", "türkisch": "Turkish",
+    "arabic": "Arabic", "arabisch": "Arabic",
+    "chinese": "Chinese", "chinesisch": "Chinese",
+    "japanese": "Japanese", "japanisch": "Japanese",
+    "korean": "Korean", "koreanisch": "Korean",
+    "hindi": "Hindi",
+}
+
+LEVEL_WORDS = {
+    "native": "Native", "mother tongue": "Native", "muttersprache": "Native", "muttersprachlich": "Native",
+    "fluent": "Fluent", "fließend": "Fluent", "verhandlungssicher": "Fluent",
+    "business fluent": "Fluent", "proficient": "Fluent",
+    "advanced": "Advanced", "sehr gut": "Advanced", "sehr gute kenntnisse": "Advanced",
+    "intermediate": "Intermediate", "gut": "Intermediate", "gute kenntnisse": "Intermediate",
+    "basic": "Basic", "basics": "Basic", "grundkenntnisse": "Basic", "elementary": "Basic",
+}
+
+# Cyrillic look-alikes show up in CEFR levels of converted CVs ("В2")
+_LOOKALIKES = str.maketrans({"А": "A", "В": "B", "С": "C", "а": "a", "в": "b", "с": "c"})
+
+_LANGUAGE_RE = re.compile(r"(?<!\w)(" + "|".join(sorted(LANGUAGE_NAMES, key=len, reverse=True)) + r")(?!\w)", re.I)
+_CEFR_RE = re.compile(r"(?<!\w)([ABC][12])(\+?)(?!\w)")
+_LEVEL_WORD_RE = re.compile(r"(?<!\w)(" + "|".join(sorted(LEVEL_WORDS, key=len, reverse=True)) + r")(?!\w)", re.I)
+
+EMAIL_RE = re.compile(r"(?<![\w.+-])[\w.+-]+@[\w-]+(?:\.[\w-]+)*\.[A-Za-z]{2,}(?!\w)")
+PHONE_RE = re.compile(r"(?<![\w+])(?:\+|00)\d{1,3}[\s./-]?(?:\(0\)\s?)?\d[\d\s./-]{5,}\d(?!\d)")
+PHONE_LABELED_RE = re.compile(r"(?i)\b(?:tel\.?|telefon|phone|mobile?|mobil|handy)\s*[:.]?\s*(\+?[\d(][\d\s()./-]{6,}\d)")
+PROFILE_URL_RE = re.compile(r"(?i)(?:https?://)?(?:www\.)?(?:linkedin\.com/in|github\.com|xing\.com/profile)/[\w\-./%]+")
+WEBSITE_LABELED_RE = re.compile(r"(?i)\b(?:website|homepage|web|portfolio)\s*:\s*((?:https?://)?[\w-]+(?:\.[\w-]+)+(?:/[\w\-./%]*)?)")
+
+DEGREE_RE = re.compile(
+    r"(?<!\w)(B\.\s?Sc\.?|M\.\s?Sc\.?|BSc|MSc|B\.\s?A\.|M\.\s?A\.|B\.\s?Eng\.?|M\.\s?Eng\.?|MBA|Ph\.?\s?D\.?|"
+    r"Dipl\.?[\s-]?Ing\.?|Diplom[\w-]*|Mag\.|Magister|Bachelor|Master|Doktor|Dr\.|HTL|Matura|Abitur)"
+    r"(?!\w)"
+)
+INSTITUTION_RE = re.compile(
+    r"(?:[A-ZÄÖÜ][\w&.'-]*\s+){0,4}"
+    r"(?:[A-ZÄÖÜ][a-zäöü]*(?:universität|universitaet|university|hochschule|akademie)|"
+    r"Universität|Universitaet|University|Hochschule|Akademie|College|Institute|Institut|Academy|School|"
+    r"TU|FH|HTL|WU|ETH)"
+    r"(?:\s+(?:of|für|for|de)\s+[A-ZÄÖÜ][\w-]*(?:\s+[A-ZÄÖÜ][\w-]*){0,3}|(?:\s+[A-ZÄÖÜ][\w-]+){1,2})?"
+)
+_MONTH = (
+    r"(?:jan|feb|mar|mär|apr|may|mai|jun|jul|aug|sep|oct|okt|nov|dec|dez)[a-zä]*\.?\s+"
+)
+_SECTION_TAG_LINE_RE = re.compile(r"\[[A-Z_]+\]")
+PERIOD_RE = re.compile(
+    rf"(?i)(?:(?:{_MONTH}|\d{{1,2}}[./])?(?:19|20)\d{{2}})"
+    rf"(?:\s*[-–]\s*(?:(?:{_MONTH}|\d{{1,2}}[./])?(?:19|20)\d{{2}}|present|heute|now))?"
+)
+
+
+# ============================================================
+# 1️⃣ Single fields
+# ============================================================
+def extract_languages(text: str) -> list[dict]:
+    """
+    Languages with their level (CEFR or level word) on the same line, e.g. 'Deutsch – Muttersprache'.
+    A language without a level is returned with level "".
+    """
+    found = {}
+    for line in text.translate(_LOOKALIKES).splitlines():
+        matches = list(_LANGUAGE_RE.finditer(line))
+        for i, m in enumerate(matches):
+            # The level belongs to this language: look up to the next language name (max. 40 chars)
+            end = matches[i + 1].start() if i + 1 < len(matches) else len(line)
+            window = line[m.end(): min(end, m.end() + 40)]
+            cefr = _CEFR_RE.search(window)
+            word = _LEVEL_WORD_RE.search(window)
+            if cefr:
+                level = cefr.group(1) + cefr.group(2)
+            elif word:
+                level = LEVEL_WORDS[word.group(1).lower()]
+            else:
+                level = ""
+            language = LANGUAGE_NAMES[m.group(1).lower()]
+            if not found.get(language):
+                found[language] = level
+    return [{"language": lang, "level": level} for lang, level in found.items()]
+
+
+def languages_section(text: str) -> str:
+    """
+    Lines of the Languages/Sprachen section(s), headers as pdf_processor.mark_section_headers
+    finds them: from a header at the start of a line up to the next section header.
+    "" without such a section ("Programmiersprachen" or "Programming Languages:" mid-line do not count).
+    """
+    from pdf_processor import mark_section_headers  # PyMuPDF/langdetect only when needed
+
+    lines = mark_section_headers(text or "").splitlines()
+    section, inside = [], False
+    for i, line in enumerate(lines):
+        if _SECTION_TAG_LINE_RE.fullmatch(line):
+            inside = line == "[LANGUAGES]" and (i == 0 or not lines[i - 1].strip())
+            continue
+        if inside:
+            section.append(line)
+    return "\n".join(section)
+
+
+def extract_education(text: str) -> list[dict]:
+    """Rows with a degree keyword plus an institution or a year/period on the same line."""
+    rows = []
+    previous = ""
+    for line in text.splitlines():
+        if not line.strip():
+            continue
+        prev_line, previous = previous, line
+        degree = DEGREE_RE.search(line)
+        if not degree:
+            continue
+        institution = INSTITUTION_RE.search(line)
+        period = PERIOD_RE.search(line)
+        if not institution:
+            # "Master data management ..." is not a degree: without an institution
+            # the degree has to open the line and come with a year/period
+            if not period or line[:degree.start()].strip(" •*-·–\t"):
+                continue
+
+        # Degree text runs until the institution, the period or a separator
+        stops = [m.start() for m in (institution, period) if m and m.start() > degree.start()]
+        sep = re.search(r"[,;|]", line[degree.end():])
+        if sep:
+            stops.append(degree.end() + sep.start())
+        degree_text = line[degree.start(): min(stops) if stops else len(line)]
+
+        # Institution often sits on the previous non-empty line ("TU Graz" / "MSc Informatik 2012 – 2014")
+        if not institution:
+            institution = INSTITUTION_RE.search(prev_line)
+
+        rows.append({
+            "degree": degree_text.strip(" .,-–|"),
+            "institution": institution.group(0).strip(" .,") if institution else "",
+            "year": period.group(0).strip() if period else "",
+        })
+    return rows
+
+
+def extract_email(text: str) -> list[str]:
+    return list(dict.fromkeys(m.group(0) for m in EMAIL_RE.finditer(text)))
+
+
+def extract_phone(text: str) -> list[str]:
+    phones = [m.group(0) for m in PHONE_RE.finditer(text)]
+    phones += [m.group(1) for m in PHONE_LABELED_RE.finditer(text)]
+    return list(dict.fromkeys(" ".join(p.split()) for p in phones))
+
+
+def extract_website(text: str) -> list[str]:
+    """Profile links (LinkedIn/GitHub/Xing) and explicitly labeled websites — no footer URLs."""
+    urls = [m.group(0) for m in PROFILE_URL_RE.finditer(text)]
+    urls += [m.group(1) for m in WEBSITE_LABELED_RE.finditer(text)]
+    return list(dict.fromkeys(u.rstrip("./") for u in urls))
+
+
+# ============================================================
+# 2️⃣ All fields + confidence
+# ============================================================
+def extract_local_fields(text: str) -> dict:
+    """
+    Returns {"fields": {...}, "confident": [...]}.
+    A field is confident when the match is unambiguous (e.g. exactly one e-mail,
+    every language of the Languages section with a level, every education row complete).
+    Languages come from the Languages/Sprachen section; without one, language names anywhere
+    in the text ("a German bank") are only a fallback for an empty GPT result, never confident.
+    """
+    text = text or ""
+    languages = extract_languages(languages_section(text))
+    from_section = bool(languages)
+    if not from_section:
+        languages = extract_languages(text)
+    education = extract_education(text)
+    emails = extract_email(text)
+    phones = extract_phone(text)
+    websites = extract_website(text)
+
+    fields = {
+        "languages": languages,
+        "education": education,
+        "email": emails[0] if emails else "",
+        "phone": phones[0] if phones else "",
+        "website": websites[0] if websites else "",
+    }
+
+    confident = []
+    if from_section and all(row["level"] for row in languages):
+        confident.append("languages")
+    if education and all(row["degree"] and row["institution"] and row["year"] for row in education):
+        confident.append("education")
+    if len(emails) == 1:
+        confident.append("email")
+    if len(phones) == 1:
+        confident.append("phone")
+    if len(websites) == 1:
+        confident.append("website")
+
+    return {"fields": fields, "confident": confident}
+
+
+def apply_local_fields(data: dict, local: dict) -> dict:
+    """
+    Merges extract_local_fields() into the GPT result:
+    confident fields replace GPT's value, the others only fill empty fields.
+    E-mail and phone go into data["contacts"] (editable in the app, not printed on the PDF).
+    """
+    if not isinstance(data, dict) or not local:
+        return data
+    fields = local.get("fields", {})
+    confident = set(local.get("confident", []))
+
+    for key in ("languages", "education", "website"):
+        value = fields.get(key)
+        if value and (key in confident or not data.get(key)):
+            data[key] = value
+
+    contacts = data.get("contacts") if isinstance(data.get("contacts"), dict) else {}
+    for key in ("email", "phone"):
+        if fields.get(key) and (key in confident or not contacts.get(key)):
+            contacts[key] = fields[key]
+    if contacts:
+        data["contacts"] = contacts
+    return data
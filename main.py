@@ -4,7 +4,12 @@ import time
 import logging
 from concurrent.futures import ThreadPoolExecutor
 from pdf_processor import prepare_cv_text
+from preflight import preflight_pdf
+from ocr import ocr_available
 from postprocess import postprocess_filled_cv, fix_open_date_ranges, safe_parse_if_str
+from skill_mapper import scan_tech_inventory
+from field_extractor import extract_local_fields, apply_local_fields
+from company_gazetteer import find_companies
 from chatgpt_client import (
     gpt_extract_cv_without_projects,
     gpt_extract_projects_text,
@@ -23,10 +28,30 @@ def main():
     logging.basicConfig(level=logging.INFO, format="%(message)s")
     logging.info("🚀 Starte vollständige CV-Pipeline (PDF → GPT → JSON)...")
 
+    # 0️⃣ Preflight: reject broken/encrypted/scanned/non-CV files before any GPT call
+    preflight = preflight_pdf(INPUT_PDF)
+    use_ocr = preflight["verdict"] == "scanned" and ocr_available()
+    if not preflight["ok"] and not use_ocr:
+        logging.error(f"⛔ Preflight: {preflight['reason']} ({preflight['verdict']})")
+        return
+    for warning in preflight["warnings"]:
+        logging.warning(f"⚠️ {warning}")
+    if use_ocr:
+        logging.info("🔍 Gescanntes Dokument – Text wird per OCR erkannt.")
+
     # 1️⃣ Text preparation (including block merging)
-    prepared_text, raw_text = prepare_cv_text(INPUT_PDF)
+    prepared_text, raw_text, page_texts = prepare_cv_text(INPUT_PDF, ocr=use_ocr)
     logging.info("📄 Text erfolgreich extrahiert und normalisiert (inkl. Projektdaten & Datumszeilen).")
 
+    # Local tech inventory: categorized without GPT, cross-filled in post-processing
+    tech_inventory = scan_tech_inventory(prepared_text)
+    logging.info(f"🔎 {len(tech_inventory)} Technologien lokal erkannt.")
+
+    # Languages, education and contacts from the page text (keeps "@"/"+" that the normalization drops);
+    # the pages come from prepare_cv_text's extraction/OCR pass, the PDF is not read again
+    local_fields = extract_local_fields("\n".join(page_texts))
+    logging.info(f"📇 Lokal sicher erkannt: {', '.join(local_fields['confident']) or '—'}")
+
     # 📁 Sicherstellen, dass der Output-Ordner existiert
     os.makedirs(os.path.dirname(OUTPUT_JSON), exist_ok=True)
 
@@ -40,7 +65,12 @@ def main():
 
     with ThreadPoolExecutor(max_workers=2) as executor:
         fut_projects_text = executor.submit(gpt_extract_projects_text, prepared_text)
-        fut_base_cv = executor.submit(gpt_extract_cv_without_projects, prepared_text)
+        fut_base_cv = executor.submit(
+            gpt_extract_cv_without_projects,
+            prepared_text,
+            known_tech=tech_inventory,
+            skip_fields=local_fields["confident"],
+        )
 
         projects_text_result = fut_projects_text.result()
         base_result = fut_base_cv.result()
@@ -66,7 +96,8 @@ def main():
 
     # 4️⃣ GPT step 3: structure projects from TEXT 2 into the target schema
     logging.info("🧠 GPT-Schritt 3: Strukturiere Projekte aus projects_raw.txt...")
-    projects_struct_result = gpt_structurize_projects_from_text(projects_text)
+    known_employers = find_companies(projects_text)
+    projects_struct_result = gpt_structurize_projects_from_text(projects_text, known_employers=known_employers)
     if not projects_struct_result.get("success"):
         logging.error("❌ GPT (Projekt-Structurierung) hat keine gültige Antwort geliefert.")
         return
@@ -80,7 +111,7 @@ def main():
         json.dump(projects_payload, f, indent=2, ensure_ascii=False)
 
     # 5️⃣ Merge: Schema 1 + Schema 2 (projects)
-    filled_json = base_cv
+    filled_json = apply_local_fields(base_cv, local_fields)
     filled_json["projects_experience"] = projects_experience
     raw_gpt_response = projects_struct_result.get("raw_response", "")
 
@@ -105,7 +136,7 @@ def main():
 
     # 7️⃣ Post-processing
     logging.info("🧩 Führe Nachbearbeitung durch...")
-    filled_json = postprocess_filled_cv(filled_json, raw_for_postprocess)
+    filled_json = postprocess_filled_cv(filled_json, raw_for_postprocess, tech_inventory=tech_inventory)
 
     # 🧠 Re-stabilize types after post-processing
     for key in ["projects_experience", "skills_overview", "languages"]:
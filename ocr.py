@@ -0,0 +1,152 @@
+import os
+import re
+import shutil
+import hashlib
+import logging
+import importlib.util
+import fitz  # PyMuPDF
+
+# ============================================================
+# 🔍 OCR ingestion for scanned PDFs and photos of CVs
+# ============================================================
+# Pages are rasterized with PyMuPDF in the calling process and OCR'd with a
+# local Tesseract (pytesseract) in a pool of worker processes, so multi-page
+# scans use all cores. Results are cached by the hash of the page image: the
+# same scan uploaded twice, or read again for local field extraction, is not
+# OCR'd twice.
+
+OCR_DPI = 300                 # rasterization resolution for PDF pages
+OCR_LANG = os.getenv("CV_OCR_LANG", "deu+eng")
+OCR_WORKERS = max(1, min(4, (os.cpu_count() or 1)))
+OCR_CACHE_DIR = os.path.join("data_output", "ocr_cache")
+OCR_MEMORY_CACHE_SIZE = 256   # page texts kept in memory per process
+
+
+def ocr_available() -> bool:
+    """True when pytesseract and the tesseract binary are installed."""
+    return importlib.util.find_spec("pytesseract") is not None and shutil.which("tesseract") is not None
+
+
+# ============================================================
+# 1️⃣ Rasterization + page-image hash
+# ============================================================
+def rasterize_pages(path: str, dpi: int = OCR_DPI):
+    """
+    Yields one PNG (bytes) per page. PDFs are rendered at `dpi`, image files
+    (JPEG/PNG/TIFF, opened by PyMuPDF as one-page documents) at their own resolution.
+    """
+    with fitz.open(path) as doc:
+        for page in doc:
+            if doc.is_pdf:
+                pix = page.get_pixmap(dpi=dpi)
+            else:
+                images = page.get_image_info()
+                zoom = max(1.0, images[0]["width"] / page.rect.width) if images else 1.0
+                pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom))
+            yield pix.tobytes("png")
+
+
+def page_image_key(png: bytes, lang: str = OCR_LANG) -> str:
+    return hashlib.blake2b(png + lang.encode("utf-8"), digest_size=16).hexdigest()
+
+
+# ============================================================
+# 2️⃣ Cache (memory + disk)
+# ============================================================
+_memory_cache = {}
+
+
+def _cache_get(key: str, cache_dir: str):
+    if key in _memory_cache:
+        return _memory_cache[key]
+    path = os.path.join(cache_dir, f"{key}.txt") if cache_dir else None
+    if path and os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            text = f.read()
+        _cache_put(key, text, None)
+        return text
+    return None
+
+
+def _cache_put(key: str, text: str, cache_dir: str):
+    if len(_memory_cache) >= OCR_MEMORY_CACHE_SIZE:
+        _memory_cache.pop(next(iter(_memory_cache)))
+    _memory_cache[key] = text
+    if cache_dir:
+        os.makedirs(cache_dir, exist_ok=True)
+        with open(os.path.join(cache_dir, f"{key}.txt"), "w", encoding="utf-8") as f:
+            f.write(text)
+
+
+# ============================================================
+# 3️⃣ OCR in worker processes
+# ============================================================
+def _ocr_png(png: bytes, lang: str) -> str:
+    """Worker: OCR of one page image, whitespace normalized like extract_text_by_page()."""
+    import io
+    import pytesseract
+    from PIL import Image
+
+    with Image.open(io.BytesIO(png)) as image:
+        text = pytesseract.image_to_string(image, lang=lang)
+
+    text = re.sub(r"[ \t]+", " ", text)
+    text = re.sub(r"\n{2,}", "\n", text)
+    return text.strip()
+
+
+_ocr_pool = None
+
+
+def _get_ocr_pool():
+    """Process pool for OCR, started on first use."""
+    global _ocr_pool
+    if _ocr_pool is None:
+        import atexit
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+
+        # "spawn": never fork a multi-threaded Streamlit server (as in render_pool)
+        _ocr_pool = ProcessPoolExecutor(
+            max_workers=OCR_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+        atexit.register(_ocr_pool.shutdown, wait=False, cancel_futures=True)
+    return _ocr_pool
+
+
+def iter_ocr_text_by_page(path: str, lang: str = OCR_LANG, cache_dir: str = OCR_CACHE_DIR):
+    """
+    Yields the OCR text page by page (in page order). All uncached pages are
+    submitted to the pool up front, so pages are recognized concurrently while
+    the caller already processes page 1.
+    """
+    if not ocr_available():
+        raise RuntimeError("OCR nicht verfügbar: pytesseract und das tesseract-Programm installieren")
+
+    pool = _get_ocr_pool()
+    pending = []  # (key, cached_text or future)
+    for png in rasterize_pages(path):
+        key = page_image_key(png, lang)
+        cached = _cache_get(key, cache_dir)
+        pending.append((key, cached if cached is not None else pool.submit(_ocr_png, png, lang)))
+
+    try:
+        for key, item in pending:
+            if isinstance(item, str):
+                yield item
+                continue
+            text = item.result()
+            _cache_put(key, text, cache_dir)
+            yield text
+    finally:
+        for _, item in pending:
+            if not isinstance(item, str):
+                item.cancel()
+
+
+def ocr_text_by_page(path: str, lang: str = OCR_LANG, cache_dir: str = OCR_CACHE_DIR) -> list[str]:
+    """OCR counterpart of pdf_processor.extract_text_by_page()."""
+    texts = list(iter_ocr_text_by_page(path, lang=lang, cache_dir=cache_dir))
+    logging.info(f"🔍 OCR: {len(texts)} Seiten, {sum(len(t) for t in texts)} Zeichen erkannt.")
+    return texts
@@ -1,54 +1,178 @@
 import os
 import re
 import fitz  # PyMuPDF
-from langdetect import detect, DetectorFactory
+from langdetect import detect, DetectorFactory, detector_factory
 from chatgpt_client import ask_chatgpt
+from date_parser import parse_dates, rewrite_dates
 
 DetectorFactory.seed = 0  # Für stabile Sprachenerkennung
+detector_factory.init_factory()  # Sprachprofile beim Start laden, nicht beim ersten detect()
 
 # ============================================================
 # 1️⃣ PDF → Text Extraktion (seitenweise)
 # ============================================================
-def extract_text_by_page(pdf_path: str) -> list[str]:
+PARALLEL_MIN_PAGES = 40     # ab dieser Seitenzahl wird auf mehrere Prozesse verteilt
+EXTRACT_WORKERS = max(1, min(4, (os.cpu_count() or 1)))
+
+
+def _page_text(page) -> str:
+    blocks = page.get_text("blocks") or page.get_text("text")
+    if isinstance(blocks, list):
+        text = "\n".join([b[4] for b in blocks if b[4].strip()])
+    else:
+        text = blocks
+
+    text = re.sub(r"[ \t]+", " ", text)
+    text = re.sub(r"\n{2,}", "\n", text)
+    return text.strip()
+
+
+def _extract_page_range(pdf_path: str, start: int, end: int) -> list[str]:
+    """Worker: Text der Seiten [start, end) – jeder Prozess öffnet das PDF selbst."""
+    with fitz.open(pdf_path) as doc:
+        return [_page_text(doc[i]) for i in range(start, end)]
+
+
+_extract_pool = None
+
+
+def _get_extract_pool():
+    """Prozess-Pool für große Dokumente, wird beim ersten Bedarf gestartet."""
+    global _extract_pool
+    if _extract_pool is None:
+        import atexit
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+
+        # "spawn": nie einen Streamlit-Server mit Threads forken (wie render_pool)
+        _extract_pool = ProcessPoolExecutor(
+            max_workers=EXTRACT_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+        atexit.register(_extract_pool.shutdown, wait=False, cancel_futures=True)
+    return _extract_pool
+
+
+def iter_text_by_page(pdf_path: str, workers: int = None):
+    """
+    Liefert den Text Seite für Seite (Generator), damit die Weiterverarbeitung schon
+    mit Seite 1 beginnen kann. Große Dokumente (>= PARALLEL_MIN_PAGES) werden in
+    Seitenbereiche aufgeteilt und parallel extrahiert; die Reihenfolge bleibt erhalten.
+    """
+    workers = EXTRACT_WORKERS if workers is None else workers
+    with fitz.open(pdf_path) as doc:
+        page_count = doc.page_count
+        if workers <= 1 or page_count < PARALLEL_MIN_PAGES:
+            for page in doc:
+                yield _page_text(page)
+            return
+
+    # Kleine Bereiche, damit die ersten Seiten früh fertig sind
+    chunk = max(1, min(8, page_count // (workers * 2)))
+    pool = _get_extract_pool()
+    futures = [
+        pool.submit(_extract_page_range, pdf_path, start, min(start + chunk, page_count))
+        for start in range(0, page_count, chunk)
+    ]
+    try:
+        for future in futures:
+            yield from future.result()
+    finally:
+        for future in futures:
+            future.cancel()
+
+
+def extract_text_by_page(pdf_path: str, workers: int = None) -> list[str]:
     """Extrahiert den Text jeder Seite aus dem PDF."""
-    doc = fitz.open(pdf_path)
-    pages_text = []
+    return list(iter_text_by_page(pdf_path, workers=workers))
 
-    for page in doc:
-        blocks = page.get_text("blocks") or page.get_text("text")
-        if isinstance(blocks, list):
-            text = "\n".join([b[4] for b in blocks if b[4].strip()])
-        else:
-            text = blocks
 
-        text = re.sub(r"[ \t]+", " ", text)
-        text = re.sub(r"\n{2,}", "\n", text)
-        pages_text.append(text.strip())
+# ============================================================
+# 1️⃣.5️⃣ Spracherkennung pro Seite (Stichproben)
+# ============================================================
+LANG_SAMPLE_WINDOW = 300    # Zeichen pro Stichprobe
+LANG_SAMPLE_WINDOWS = 3     # Stichproben pro Seite (Anfang, Mitte, Ende)
+LANG_MIN_LETTERS = 40       # kürzere Seiten übernehmen die Mehrheitssprache
+
+
+def sample_text(text: str, window: int = LANG_SAMPLE_WINDOW, count: int = LANG_SAMPLE_WINDOWS) -> str:
+    """Gleichmäßig verteilte, begrenzte Ausschnitte des Textes (Kosten unabhängig von der Seitenlänge)."""
+    if len(text) <= window * count:
+        return text
+    step = (len(text) - window) / (count - 1) if count > 1 else 0
+    return "\n".join(text[int(i * step): int(i * step) + window] for i in range(count))
+
+
+def detect_page_language(page: str):
+    """Sprache einer Seite anhand von Stichproben; None bei zu wenig Text."""
+    if sum(ch.isalpha() for ch in page) < LANG_MIN_LETTERS:
+        return None
+    try:
+        return detect(sample_text(page))
+    except Exception:
+        return None
+
+
+def fill_page_languages(detected: list) -> list[str]:
+    """Seiten ohne Ergebnis (z. B. nur Name/Kontakt) bekommen die Mehrheitssprache (Standard: "en")."""
+    known = [lang for lang in detected if lang]
+    majority = max(set(known), key=known.count) if known else "en"
+    return [lang or majority for lang in detected]
+
+
+def detect_page_languages(pages: list[str]) -> list[str]:
+    """Erkennt die Sprache jeder Seite anhand von Stichproben."""
+    return fill_page_languages([detect_page_language(page) for page in pages])
+
+
+def translate_pages(pages: list[str], languages: list[str]) -> list[str]:
+    """
+    Übersetzt nur die nicht-englischen Seiten; zusammenhängende Seiten gehen in einem
+    GPT-Aufruf. Englische Seiten in gemischten CVs bleiben unverändert.
+    """
+    result = list(pages)
+    i = 0
+    while i < len(pages):
+        if languages[i] == "en":
+            i += 1
+            continue
+        j = i
+        while j < len(pages) and languages[j] != "en":
+            j += 1
+
+        chunk = "\n\n".join(pages[i:j])
+        translation_prompt = f"""
+Translate this CV text from German to English word-by-word, preserving the exact line structure.
+Do NOT split or merge projects. Do NOT add numbering or new sections.
+Preserve ALL original formatting and project boundaries.
+TEXT:
+{chunk[:15000]}
+"""
+        translated = ask_chatgpt(translation_prompt)
+        if isinstance(translated, dict) and "raw_response" in translated:
+            translated = translated["raw_response"]
+        if isinstance(translated, str):
+            translated = re.sub(r"(?i)\b(sprachen|sprachkenntnisse)\b", "Languages", translated)
+            translated = re.sub(r"(?i)\b(ausbildung|bildung)\b", "Education", translated)
+            translated = re.sub(r"(?i)\b(berufserfahrung|erfahrung|projekte|projects?)\b", "Experience", translated)
+            translated = re.sub(r"(?i)\b(kenntnisse|skills|kompetenzen|technologien|tools)\b", "Skills", translated)
 
-    doc.close()
-    return pages_text
+            # The run is replaced as a whole (page breaks inside it are not preserved)
+            result[i] = translated
+            for k in range(i + 1, j):
+                result[k] = None
+        i = j
+
+    return [page for page in result if page is not None]
 
 
 # ============================================================
 # 2️⃣ Datumserkennung (inkl. Deutschformate)
 # ============================================================
 def tag_dates(text: str) -> str:
-    """Markiert Zeiträume und einzelne Datumsangaben mit [DATE]...[/DATE]."""
-    patterns = [
-        r"\b(0?[1-9]|1[0-2])\.(\d{2})\s*[-–]\s*(0?[1-9]|1[0-2])\.(\d{2})\b",
-        r"\b(0?[1-9]|1[0-2])\.(\d{2})\s*[-–]\s*(Jetzt|Derzeit|Heute|Present|Now|Aktuell)\b",
-        r"\b(0?[1-9]|1[0-2])\.\d{2}\b\s*[-–]\s*$",
-        r"\b(0?[1-9]|1[0-2])\/(\d{4})\s*[-–]\s*(0?[1-9]|1[0-2])\/(\d{4})\b",
-        r"\b(0?[1-9]|1[0-2])\/(\d{4})\s*[-–]\s*(Jetzt|Derzeit|Heute|Present|Now|Aktuell)\b",
-        r"(?i)\b(seit|since)\s+(0?[1-9]|1[0-2])[./](\d{2,4})\b",
-        r"\b(20\d{2}|19\d{2})\s*[-–]\s*(20\d{2}|Present|Now|Heute|Jetzt|Aktuell)\b",
-        r"(?:(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*)\s+\d{4}\s*[-–]\s*(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)?[a-z]*\s*\d{4}",
-        r"\b(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+\d{4}\s*[-–]\s*(Present|Now|\d{4})",
-        r"\b(0?[1-9]|1[0-2])[./-](\d{2,4})\s*[-–]\s*(0?[1-9]|1[0-2])[./-](\d{2,4})\b",
-    ]
-
-    for pattern in patterns:
-        text = re.sub(pattern, lambda m: f"[DATE]{m.group(0)}[/DATE]", text, flags=re.IGNORECASE)
+    """Markiert Zeiträume (inkl. "seit 03.21") mit [DATE]...[/DATE]."""
+    ranges = [i for i in parse_dates(text) if i.is_range]
+    text = rewrite_dates(text, ranges, formatter=lambda i: f"[DATE]{text[i.pos:i.endpos]}[/DATE]")
 
     text = re.sub(r"\bn(Jetzt|Heute)\b", r"\1", text, flags=re.IGNORECASE)
     text = re.sub(r"\b(Jetzt|Derzeit|Aktuell|Heute)\b", "Present", text, flags=re.IGNORECASE)
@@ -56,68 +180,192 @@ def tag_dates(text: str) -> str:
 
 
 def merge_floating_dates(text: str) -> str:
-    """Fügt Datumsteile zusammen, die durch Zeilenumbrüche getrennt wurden."""
-    text = re.sub(r'(?<!\d)(\d{2}\.\d{2})\s*\n\s*(\d{2}\.\d{2})(?!\d)', r'\1 – \2', text)
-    text = re.sub(r'(?<!\d)(\d{2}/\d{4})\s*\n\s*(\d{2}/\d{4})(?!\d)', r'\1 – \2', text)
-    return text
+    """Fügt Datumsteile zusammen, die durch Zeilenumbrüche getrennt wurden ('07.21\\n12.23' → '07.21 – 12.23')."""
+    parts, pos, joined_until = [], 0, 0
+    dates = parse_dates(text)
+    for first, second in zip(dates, dates[1:]):
+        # The second date may open a range of its own ('07.21\n12.23 -'); each date is joined once
+        if first.is_range or "year" in (first.style, second.style) or first.pos < joined_until:
+            continue
+        gap = text[first.endpos:second.pos]
+        if "\n" in gap and not gap.strip():
+            parts.append(text[pos:first.endpos])
+            parts.append(" – ")
+            pos = second.pos
+            joined_until = second.endpos
+    parts.append(text[pos:])
+    return "".join(parts)
 
 # ============================================================
 # 2️⃣.5️⃣ Projekte mit Datumszeilen verbinden
 # ============================================================
+# Date lines joined with the previous line, in this order (as separate passes: a date line
+# consumed by one pass is not joined again). The patterns look across the line break on
+# purpose ("12.23 -\n07.20"), unlike date_parser ranges, which never span lines.
+_BLOCK_DATE_PATTERNS = [
+    (re.compile(r"(\n)(\d{1,2}[./]\d{2}\s*[–-]\s*(Jetzt|Heute|Present|\d{1,2}[./]\d{2}))"), r" \2"),
+    (re.compile(r"(\n)(\d{4}\s*[–-]\s*(Present|\d{4}))"), r" \2"),
+    (
+        re.compile(
+            r"(\b(?:Developer|Engineer|Architect|Consultant|Manager|Lead|Analyst|Director|Specialist))\s*\n\s*"
+            r"(\d{1,2}[./]\d{2}\s*[–-]\s*(?:Jetzt|Heute|Present|\d{1,2}[./]\d{2}))",
+            re.IGNORECASE,
+        ),
+        r"\1 \2",
+    ),
+]
+
+
 def merge_project_blocks(text: str) -> str:
     """
     Combines role lines and date lines into a single block:
     'Lead BI Developer - Inpro Analytics GmbH' + '01.23 – Jetzt'
     → 'Lead BI Developer - Inpro Analytics GmbH 01.23 – Jetzt'
     """
-    # Join dates that appear on a separate line with the previous line
-    text = re.sub(r'(\n)(\d{1,2}[./]\d{2}\s*[–-]\s*(Jetzt|Heute|Present|\d{1,2}[./]\d{2}))', r' \2', text)
-    text = re.sub(r'(\n)(\d{4}\s*[–-]\s*(Present|\d{4}))', r' \2', text)
-
-    # Instead of lookbehind, use a safe pattern with a backreference
-    text = re.sub(
-        r'(\b(?:Developer|Engineer|Architect|Consultant|Manager|Lead|Analyst|Director|Specialist))\s*\n\s*(\d{1,2}[./]\d{2}\s*[–-]\s*(?:Jetzt|Heute|Present|\d{1,2}[./]\d{2}))',
-        r'\1 \2',
-        text,
-        flags=re.IGNORECASE,
-    )
-
+    for pattern, replacement in _BLOCK_DATE_PATTERNS:
+        text = pattern.sub(replacement, text)
     return text
 
 
 # ============================================================
 # 3️⃣ Sektionen markieren & strukturieren
 # ============================================================
+SECTION_MARKERS = [
+    # (Tag, Überschriften, Doppelpunkt Pflicht) – Reihenfolge wie die bisherigen Ersetzungen
+    ("DOMAINS", r"Domains?|Industries", False),
+    ("LANGUAGES", r"Languages?|Sprachen|Sprachkenntnisse", False),
+    ("EDUCATION", r"Education|Studium|Ausbildung|Academic Background", False),
+    ("PROFILE_SUMMARY", r"Profile|Summary|Über mich|Professional Summary", True),
+    ("PROJECTS", r"Projects?|Experience|Berufserfahrung|Work Experience", False),
+    ("SKILLS", r"Skills|Technologies|Kompetenzen|Tools", False),
+]
+
+# Eine Sektion endet vor der nächsten Überschrift eines *späteren* Tags in dieser Liste
+SECTION_TAGS = ["DOMAINS", "SKILLS", "LANGUAGES", "EDUCATION", "PROJECTS", "PROFILE_SUMMARY"]
+_SECTION_RANK = {tag: i for i, tag in enumerate(SECTION_TAGS)}
+
+_SECTION_HEADER_RES = [
+    (tag, re.compile(f"(?i)({words}){':' if colon else ':?'}")) for tag, words, colon in SECTION_MARKERS
+]
+# Schneller Weg: dieselben Muster ohne (?i) auf text.lower() (mehrfach schneller, gleiche Positionen).
+# "ı"/"ſ" trifft (?i) als "i"/"s", lower() aber nicht – dann wie bisher mit (?i)
+_SECTION_HEADER_RES_LOWER = [
+    (tag, re.compile(f"({words.lower()}){':' if colon else ':?'}")) for tag, words, colon in SECTION_MARKERS
+]
+_SECTION_TAG_RE = re.compile(r"\[(" + "|".join(SECTION_TAGS) + r")\]")
+
+
+def mark_section_headers(text: str) -> str:
+    """
+    Setzt vor jede Überschrift eine Zeile mit ihrem Tag ("Skills:" → "\n[SKILLS]\nSkills").
+    Alle Treffer werden auf dem Originaltext gesucht und in einem Durchlauf eingefügt
+    (überlappende Treffer wie "ProjectSkills" ergeben wie bisher zwei Tags).
+    """
+    lowered = text.lower()
+    if len(lowered) == len(text) and "ı" not in text and "ſ" not in text:
+        haystack, patterns = lowered, _SECTION_HEADER_RES_LOWER
+    else:
+        haystack, patterns = text, _SECTION_HEADER_RES
+
+    edits = []
+    for order, (tag, rx) in enumerate(patterns):
+        for m in rx.finditer(haystack):
+            edits.append((m.start(), order, tag, m.end(1), m.end()))
+    if not edits:
+        return text
+
+    edits.sort()
+    parts, pos = [], 0
+    for start, _, tag, word_end, end in edits:
+        parts.append(text[pos:start])
+        parts.append(f"\n[{tag}]\n")
+        pos = max(pos, start)
+        if end > word_end:  # Doppelpunkt entfällt
+            parts.append(text[pos:word_end])
+            pos = end
+    parts.append(text[pos:])
+    return "".join(parts)
+
+
+def lex_sections(text: str) -> list[dict]:
+    """
+    Ein Durchlauf über die Tag-Positionen statt einer DOTALL-Regex pro Tag.
+    Gibt die Sektionen als Spannen zurück: {"tag", "start", "content_start", "end"};
+    end ist die Position des Zeilenumbruchs vor der nächsten Überschrift eines späteren
+    Tags oder None (= bis zum Textende).
+    """
+    markers = [(m.start(), m.end(), m.group(1)) for m in _SECTION_TAG_RE.finditer(text)]
+
+    # Von hinten: nächste Überschrift (mit Zeilenumbruch davor) je Tag-Rang
+    next_header = [None] * len(SECTION_TAGS)
+    ends = [None] * len(markers)
+    for k in range(len(markers) - 1, -1, -1):
+        start, _, tag = markers[k]
+        rank = _SECTION_RANK[tag]
+        later = [pos for pos in next_header[rank + 1:] if pos is not None]
+        ends[k] = min(later) if later else None
+        if start > 0 and text[start - 1] == "\n":
+            next_header[rank] = start - 1
+
+    # Gleicher Tag innerhalb einer offenen Sektion gehört zu deren Inhalt
+    spans = []
+    open_until = {}
+    for (start, content_start, tag), end in zip(markers, ends):
+        limit = open_until.get(tag, -1)
+        if limit is None or start < limit:
+            continue
+        open_until[tag] = end
+        spans.append({"tag": tag, "start": start, "content_start": content_start, "end": end})
+    return spans
+
+
+def close_sections(text: str, spans: list[dict]) -> str:
+    """Fügt die schließenden Tags ([/SKILLS] …) an den Sektionsenden ein."""
+    inserts = sorted(
+        (span["end"], _SECTION_RANK[span["tag"]], span["tag"]) for span in spans if span["end"] is not None
+    )
+    parts, pos = [], 0
+    for end, _, tag in inserts:
+        parts.append(text[pos:end])
+        parts.append(f"[/{tag}]\n")
+        pos = end
+    parts.append(text[pos:])
+    result = "".join(parts)
+
+    # Sektionen bis zum Textende werden in Tag-Reihenfolge angehängt; der letzte Tag
+    # schließt wie bisher vor einem abschließenden Zeilenumbruch ("\n$")
+    last_tag = SECTION_TAGS[-1]
+    for span in sorted((s for s in spans if s["end"] is None), key=lambda s: _SECTION_RANK[s["tag"]]):
+        if span["tag"] != last_tag:
+            result += f"[/{span['tag']}]\n"
+            continue
+        cut = len(result)
+        if result.endswith("\n\n"):
+            cut -= 2
+        elif result.endswith("\n"):
+            cut -= 1
+        result = result[:cut] + f"[/{last_tag}]\n" + result[cut:]
+    return result
+
+
+def section_slices(text: str, spans: list[dict] = None) -> list[dict]:
+    """Strukturierte Sicht auf dieselben Spannen: [{"tag", "text"}, ...] (Text ohne Tag-Zeile)."""
+    if spans is None:
+        spans = lex_sections(text)
+    return [
+        {"tag": span["tag"], "text": text[span["content_start"]: span["end"]].strip()}
+        for span in spans
+    ]
+
+
 def clean_text(text: str) -> str:
     """Erkennt und markiert Hauptsektionen wie [PROJECTS], [SKILLS], usw."""
     text = re.sub(r"\[\d+\]|\(\d+\)", "", text)
     text = re.sub(r"[ \t]+", " ", text)
     text = re.sub(r"\s{2,}", " ", text)
 
-    section_markers = {
-        r"(?i)(Domains?|Industries):?": "[DOMAINS]",
-        r"(?i)(Languages?|Sprachen|Sprachkenntnisse):?": "[LANGUAGES]",
-        r"(?i)(Education|Studium|Ausbildung|Academic Background):?": "[EDUCATION]",
-        r"(?i)(Profile|Summary|Über mich|Professional Summary):": "[PROFILE_SUMMARY]",
-        r"(?i)(Projects?|Experience|Berufserfahrung|Work Experience):?": "[PROJECTS]",
-        r"(?i)(Skills|Technologies|Kompetenzen|Tools):?": "[SKILLS]",
-    }
-
-    for pattern, marker in section_markers.items():
-        text = re.sub(pattern, f"\n{marker}\n\\1", text)
-
-    tags = ["DOMAINS", "SKILLS", "LANGUAGES", "EDUCATION", "PROJECTS", "PROFILE_SUMMARY"]
-    for i, tag in enumerate(tags):
-        next_tags = tags[i + 1:]
-        next_pattern = "|".join(f"\\[{t}\\]" for t in next_tags) if next_tags else "$"
-
-        # Explicitly close the section so it doesn't consume the rest of the text
-        text = re.sub(
-            rf"(\[{tag}\])(.*?)(?=\n({next_pattern})|\Z)",
-            rf"\1\2[/{tag}]\n",
-            text,
-            flags=re.DOTALL,
-        )
+    text = mark_section_headers(text)
+    text = close_sections(text, lex_sections(text))
     text = re.sub(r"\]\s*\[", "]\n\n[", text)
 
     # Zusätzliche GPT-Hilfen
@@ -153,59 +401,79 @@ def normalize_structure(text: str) -> str:
 
     return text
 
+# ============================================================
+# 3️⃣.5️⃣ Zeichen-Normalisierung (ein Durchlauf)
+# ============================================================
+_KEEP_CHARS = r"\w\.\-/–—:,"
+# Lücke = maximale Folge von Zeichen außerhalb von _KEEP_CHARS (Whitespace + Sonderzeichen).
+# Getroffen werden nur Lücken, die sich ändern können (ein einzelnes " " nicht); das Muster
+# beginnt mit einer Zeichenklasse, damit re schnell von Lücke zu Lücke springt.
+_GAP_RE = re.compile(
+    rf"[^{_KEEP_CHARS}]"
+    rf"(?:[^{_KEEP_CHARS}]{{2,}}|[^{_KEEP_CHARS}](?![^{_KEEP_CHARS}])|(?<! )(?![^{_KEEP_CHARS}]))"
+)
+_DATE_TAG_RE = re.compile(r"\[DATE\]|\[/DATE\]")
+
+
+def _normalize_gap(m) -> str:
+    gap = m.group()
+    if len(gap) >= 3:
+        return "\n"
+    # Sonderzeichen und Tabs werden zu Leerzeichen, übriger Whitespace bleibt
+    chars = [c if c.isspace() and c not in " \t" else " " for c in gap]
+    if len(chars) == 2 and chars[0] == chars[1] and chars[0] in " \n":
+        return chars[0]
+    return "".join(chars)
+
+
+def normalize_chars(text: str, strip_date_tags: bool = False) -> str:
+    """
+    Ersetzt die bisherige Kette aus fünf re.sub-Durchläufen ([DATE]-Tags entfernen,
+    Sonderzeichen zu Leerzeichen, 3+ Whitespace zu Zeilenumbruch, Leerzeichen/Tabs
+    zusammenfassen, Leerzeilen entfernen) durch einen Durchlauf mit identischem Ergebnis.
+    Jede Lücke zwischen zwei erlaubten Zeichen wird für sich behandelt: ab 3 Zeichen
+    wird sie zu einem Zeilenumbruch, kürzere Lücken werden einzeln umgeschrieben.
+    """
+    if strip_date_tags and "DATE]" in text:
+        text = _DATE_TAG_RE.sub("", text)
+    return _GAP_RE.sub(_normalize_gap, text)
+
+
 # ============================================================
 # 4️⃣ Hauptfunktion zur Vorbereitung des CV-Texts
 # ============================================================
-def prepare_cv_text(pdf_path: str, cache_dir="data_output") -> tuple[str, str]:
+def prepare_cv_text(pdf_path: str, cache_dir="data_output", ocr: bool = False) -> tuple[str, str, list[str]]:
     """
     Extrahiert Text aus dem PDF, übersetzt ihn bei Bedarf, markiert Datumsangaben,
     bereinigt die Struktur und bereitet den Text für GPT vor. Gibt zurück:
-    (den normalisierten Text, den Originaltext).
+    (den normalisierten Text, den Originaltext, die unübersetzten Seitentexte).
+    Die Seitentexte sind dieselben wie von extract_text_by_page() bzw. der OCR, damit
+    Aufrufer (z. B. extract_local_fields) das PDF nicht ein zweites Mal auslesen.
+    ocr=True: Text per OCR (gescannte PDFs, Fotos von CVs), danach dieselbe Normalisierung.
     """
-    import os
-    from langdetect import detect
-
     os.makedirs(cache_dir, exist_ok=True)
 
-    pages = extract_text_by_page(pdf_path)
-    raw_text = "\n\n".join(pages)
+    if ocr:
+        from ocr import iter_ocr_text_by_page
+        page_source = iter_ocr_text_by_page(pdf_path)
+    else:
+        page_source = iter_text_by_page(pdf_path)
 
-    try:
-        detected_lang = detect(raw_text)
-    except Exception:
-        detected_lang = "en"
-
-    if detected_lang != "en":
-        translation_prompt = f"""
-Translate this CV text from German to English word-by-word, preserving the exact line structure.
-Do NOT split or merge projects. Do NOT add numbering or new sections.
-Preserve ALL original formatting and project boundaries.
-TEXT:
-{raw_text[:15000]}
-"""
-        result = ask_chatgpt(translation_prompt)
+    # Seiten werden gestreamt: die Spracherkennung läuft, während weitere Seiten extrahiert werden
+    pages, detected = [], []
+    for page in page_source:
+        pages.append(page)
+        detected.append(detect_page_language(page))
 
-        if isinstance(result, dict) and "raw_response" in result:
-            raw_text = result["raw_response"]
-        elif isinstance(result, str):
-            raw_text = result
-
-        raw_text = re.sub(r"(?i)\b(sprachen|sprachkenntnisse)\b", "Languages", raw_text)
-        raw_text = re.sub(r"(?i)\b(ausbildung|bildung)\b", "Education", raw_text)
-        raw_text = re.sub(r"(?i)\b(berufserfahrung|erfahrung|projekte|projects?)\b", "Experience", raw_text)
-        raw_text = re.sub(r"(?i)\b(kenntnisse|skills|kompetenzen|technologien|tools)\b", "Skills", raw_text)
+    # Sprache pro Seite: nur deutsche (nicht-englische) Seiten werden übersetzt
+    page_languages = fill_page_languages(detected)
+    raw_text = "\n\n".join(translate_pages(pages, page_languages))
 
     # Skip date tagging as per user request
-    tagged_text = raw_text
-    tagged_text = merge_project_blocks(tagged_text)
-    
-    # Remove any existing date tags
-    tagged_text = re.sub(r'\[DATE\]|\[/DATE\]', '', tagged_text)
+    tagged_text = merge_project_blocks(raw_text)
 
-    tagged_text = re.sub(r"[^\w\s\.\-/–—:,]", " ", tagged_text) 
-    tagged_text = re.sub(r"\s{3,}", "\n", tagged_text)
-    tagged_text = re.sub(r"[ \t]+", " ", tagged_text)
-    tagged_text = re.sub(r"\n{2,}", "\n", tagged_text)
+    # Remove any existing date tags + character cleanup
+    tagged_text = normalize_chars(tagged_text, strip_date_tags=True)
 
     cleaned_text = clean_text(tagged_text)
 
@@ -222,12 +490,9 @@ TEXT:
         f.write(final_text)
 
     # Lightweight cleanup for raw_text
-    raw_text = re.sub(r"[^\w\s\.\-/–—:,]", " ", raw_text)
-    raw_text = re.sub(r"\s{3,}", "\n", raw_text)
-    raw_text = re.sub(r"[ \t]+", " ", raw_text)
-    raw_text = re.sub(r"\n{2,}", "\n", raw_text)
+    raw_text = normalize_chars(raw_text)
 
-    return final_text, raw_text
+    return final_text, raw_text, pages
 
 
 # ============================================================
@@ -237,7 +502,7 @@ if __name__ == "__main__":
     path = "data_input/CV Manuel Wolfsgruber.pdf"
     os.makedirs("debug", exist_ok=True)
 
-    prepared, raw = prepare_cv_text(path)
+    prepared, raw, _ = prepare_cv_text(path)
 
     with open("debug/full_prepared_text.txt", "w", encoding="utf-8") as f:
         f.write(prepared)
@@ -2,7 +2,10 @@ import re
 import json
 import ast
 from collections import defaultdict
-from datetime import datetime
+from datetime import date
+from skill_mapper import cross_fill_tech, classify_tech, ToolIndex
+from company_gazetteer import project_industries
+from date_parser import parse_dates, rewrite_dates, format_interval, normalize_date_text, expand_year
 
 # ===============================================
 # 🔤 Languages
@@ -53,64 +56,27 @@ def unify_languages(langs, original_text=None):
 # ===============================================
 
 def unify_durations(projects):
-    months = {
-        "01": "Jan", "1": "Jan", "02": "Feb", "2": "Feb", "03": "Mar", "3": "Mar",
-        "04": "Apr", "4": "Apr", "05": "May", "5": "May", "06": "Jun", "6": "Jun",
-        "07": "Jul", "7": "Jul", "08": "Aug", "8": "Aug", "09": "Sep", "9": "Sep",
-        "10": "Oct", "11": "Nov", "12": "Dec"
-    }
-
+    """
+    Brings every project duration into one format ('Jul 2021 – Dec 2023', '2020 – 2023',
+    'Jul 2021 – Present'). Text around the dates is kept. Without a date in the duration,
+    the first date range in the overview is used.
+    """
     for project in projects:
-        duration = project.get("duration", "").strip()
-        if not duration:
-            continue
-
-        duration = re.sub(r"[–—−]+", "-", duration)
-        duration = re.sub(r"\s*-\s*", " - ", duration)
-        duration = re.sub(r"(?i)\b(Jetzt|Heute|Aktuell|Now|Present|Gegenwärtig|Momentan|Derzeit)\b", "Present", duration)
-
-        # 1: "07.21 - 12.23"
-        m = re.match(r"^\s*(\d{1,2})[./-](\d{2,4})\s*-\s*(\d{1,2})[./-](\d{2,4}|Present)\s*$", duration)
-        if m:
-            sm, sy, em, ey = m.groups()
-            sy = normalize_year(sy)
-            ey = "Present" if "Present" in ey else normalize_year(ey)
-            project["duration"] = f"{months.get(sm.zfill(2), 'Jan')} {sy} – {months.get(em.zfill(2), 'Jan')} {ey}"
-            continue
-
-        # 2: "07.21 –"
-        m = re.match(r"^\s*(\d{1,2})[./-](\d{2,4})\s*-\s*$", duration)
-        if m:
-            sm, sy = m.groups()
-            sy = normalize_year(sy)
-            project["duration"] = f"{months.get(sm.zfill(2), 'Jan')} {sy} – Present"
+        if not isinstance(project, dict):
             continue
-
-        # 3: "2020 – 2023"
-        m = re.match(r"^\s*((19|20)\d{2})\s*-\s*((?:19|20)?\d{2}|Present)\s*$", duration)
-        if m:
-            sy, _, ey = m.groups()
-            if len(ey) == 2:
-                ey = "20" + ey
-            if int(sy) > int(ey.replace("Present", str(datetime.now().year))):
-                sy, ey = ey, sy
-            project["duration"] = f"{sy} – {ey}"
+        duration = str(project.get("duration", "") or "").strip()
+        if not duration:
             continue
 
-        # 4: Already valid "Mar 2020 - Oct 2023"
-        m = re.match(r"(?i)^\s*(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]* \d{4} - .*", duration)
-        if m:
-            project["duration"] = duration.replace("-", "–").strip()
+        intervals = parse_dates(duration)
+        if intervals:
+            project["duration"] = rewrite_dates(duration, intervals)
             continue
 
-        # 5: Fallback from text overview
-        overview = project.get("overview", "")
-        match = re.search(r"(\b\d{4}\b).{0,20}?(\b\d{4}\b|Present)", overview)
-        if match:
-            y1, y2 = match.groups()
-            if int(y1) > int(y2.replace("Present", str(datetime.now().year))):
-                y1, y2 = y2, y1
-            project["duration"] = f"{y1} – {y2}"
+        # Fallback from text overview
+        ranges = [i for i in parse_dates(str(project.get("overview", "") or "")) if i.is_range]
+        if ranges:
+            project["duration"] = format_interval(ranges[0])
 
     return projects
 
@@ -123,24 +89,19 @@ def normalize_year(text: str) -> str:
     '2020' → '2020'
     '21' → '2021'
     """
-    import re
-
     if not text:
         return ""
 
     text = str(text).strip()
 
-    # Versuche, Jahr mit 4 Ziffern zu finden (z. B. 2021 oder 1999)
-    match = re.search(r"\b(19|20)\d{2}\b", text)
-    if match:
-        return match.group(0)
+    intervals = parse_dates(text)
+    if intervals:
+        return str(intervals[0].start[0])
 
     # Zweistelliges Jahr erkennen und auf 20xx mappen
     match = re.search(r"\b(\d{2})\b", text)
     if match:
-        year = int(match.group(1))
-        # Heuristik: falls < 30 → 2000+, sonst 1900+
-        return f"20{year:02d}" if year < 30 else f"19{year:02d}"
+        return str(expand_year(int(match.group(1))))
 
     return ""
 
@@ -149,55 +110,61 @@ def normalize_year(text: str) -> str:
 # 📆 Fix open date ranges
 # ============================================================
 def fix_open_date_ranges(text_or_json):
+    """
+    Normalizes dates in "duration"/"years_of_experience" values (recursively for dicts
+    and lists): '07.21' → 'Jul 2021', open ranges ('07.21 –', 'seit 2019') → '… – Present'.
+    """
     if isinstance(text_or_json, dict):
         for key, value in text_or_json.items():
-            if isinstance(value, dict):
+            if isinstance(value, (dict, list)):
                 text_or_json[key] = fix_open_date_ranges(value)
-            elif isinstance(value, list):
-                new_list = []
-                for item in value:
-                    if isinstance(item, (dict, str)):
-                        new_list.append(fix_open_date_ranges(item))
-                    else:
-                        new_list.append(item)
-                text_or_json[key] = new_list
             elif key.lower() in ["duration", "years_of_experience"] and isinstance(value, str):
                 text_or_json[key] = fix_open_date_ranges(value)
         return text_or_json
 
-    text = str(text_or_json)
-    month_map = {
-        "01": "Jan", "1": "Jan", "02": "Feb", "2": "Feb", "03": "Mar", "3": "Mar",
-        "04": "Apr", "4": "Apr", "05": "May", "5": "May", "06": "Jun", "6": "Jun",
-        "07": "Jul", "7": "Jul", "08": "Aug", "8": "Aug", "09": "Sep", "9": "Sep",
-        "10": "Oct", "11": "Nov", "12": "Dec"
-    }
-
-    for num, name in month_map.items():
-        text = re.sub(rf"\b{num}\.?\s?(\d{{2}})\b", rf"{name} 20\1", text)
-
-    text = re.sub(r"([A-Za-z]{{3}} 20\d{{2}})\s*[–-]\s*$", r"\1 – Present", text)
-    text = re.sub(r"\b(0?[1-9]|1[0-2])[./](20\d{2})\b", lambda m: f"{month_map[m.group(1).zfill(2)]} {m.group(2)}", text)
+    if isinstance(text_or_json, list):
+        # Only containers: free-text strings in lists (responsibilities, tech_stack) stay untouched
+        return [fix_open_date_ranges(item) if isinstance(item, (dict, list)) else item for item in text_or_json]
 
-    return text
+    return normalize_date_text(str(text_or_json))
 
-def clean_duplicates_in_skills(skills):
+def clean_duplicates_in_skills(skills, tools=None):
+    """
+    Drops repeated tools, also across categories. Spelling variants count as repeats
+    ("Azure DevOps" / "azure-devops" / "Azure DevOps Pipelines", see skill_mapper.ToolIndex);
+    the first entry is kept under the group's display name.
+    """
     if not isinstance(skills, dict):
         return {}
+    if tools is None:
+        tools = ToolIndex(_skill_names(skills))
     cleaned = {}
+    seen = set()
     for cat, items in skills.items():
         if not isinstance(items, list):
             continue
-        seen = set()
         unique = []
         for item in items:
-            value = item.strip().lower() if isinstance(item, str) else str(item).strip().lower()
-            if value and value not in seen:
-                unique.append(item)
-                seen.add(value)
+            name = item.get("name", "") if isinstance(item, dict) else item
+            value = str(name).strip()
+            if not value:
+                continue
+            canonical = tools.canonical(value)
+            if canonical.lower() not in seen:
+                unique.append({**item, "name": canonical} if isinstance(item, dict) else canonical)
+                seen.add(canonical.lower())
         cleaned[cat] = unique
     return cleaned
 
+def _skill_names(skills):
+    """Tool names of a hard_skills dict, in order."""
+    for items in skills.values():
+        if isinstance(items, list):
+            for item in items:
+                name = item.get("name", "") if isinstance(item, dict) else item
+                if str(name).strip():
+                    yield name
+
 def split_skills_overview_rows(skills):
     if not isinstance(skills, list):
         return []
@@ -229,10 +196,102 @@ def split_skills_overview_rows(skills):
             })
     return result
    
-def generate_skills_overview(skills_overview_raw):
+# ===============================================
+# ⏳ Years of experience from project intervals
+# ===============================================
+
+def project_months(project: dict, today=None):
+    """
+    Month span [start, end) of a project from its duration (months counted as year*12 + month-1).
+    Open ranges run until the current month, year-only dates cover the whole year.
+    """
+    duration = str(project.get("duration", "") or "") if isinstance(project, dict) else ""
+    intervals = parse_dates(duration)
+    if not intervals:
+        return None
+    interval = next((i for i in intervals if i.is_range), intervals[0])
+    today = today or date.today()
+
+    start_year, start_month = interval.start
+    start = start_year * 12 + (start_month or 1) - 1
+    if interval.open_ended:
+        end = today.year * 12 + today.month
+    else:
+        end_year, end_month = interval.end or interval.start
+        end = end_year * 12 + (end_month or 12)
+    return (start, end) if end > start else None
+
+
+def union_months(spans) -> int:
+    """Length of the union of [start, end) spans (sweep line: sort by start, merge overlaps)."""
+    total, current_start, current_end = 0, None, None
+    for start, end in sorted(spans):
+        if current_end is None or start > current_end:
+            if current_end is not None:
+                total += current_end - current_start
+            current_start, current_end = start, end
+        else:
+            current_end = max(current_end, end)
+    if current_end is not None:
+        total += current_end - current_start
+    return total
+
+
+def months_to_years(months: int) -> int:
+    return max(1, round(months / 12)) if months > 0 else 0
+
+
+def compute_experience(projects, tool_categories=None, today=None, tools=None) -> dict:
+    """
+    Exact experience from the projects' durations and tech_stacks:
+    {"tools": {tool_lower: months}, "categories": {category: months}}.
+    Overlapping projects are counted once per tool and per category. A tool's category
+    comes from `tool_categories` (tool_lower → category, e.g. the skills overview rows),
+    else from TECH_MAPPING. With `tools` (a ToolIndex), stack spellings count under their display name.
+    """
+    tool_categories = tool_categories or {}
+    tool_spans = defaultdict(list)
+    category_spans = defaultdict(list)
+
+    for project in projects or []:
+        span = project_months(project, today)
+        if span is None:
+            continue
+        stack = project.get("tech_stack")
+        if isinstance(stack, str):
+            stack = re.split(r"[,/]", stack)
+        categories = set()
+        for tool in stack if isinstance(stack, list) else []:
+            tool = str(tool).strip()
+            if not tool:
+                continue
+            if tools is not None:
+                tool = tools.canonical(tool)
+            tool_spans[tool.lower()].append(span)
+            category = tool_categories.get(tool.lower()) or classify_tech(tool)
+            if category:
+                categories.add(category)
+        for category in categories:
+            category_spans[category].append(span)
+
+    return {
+        "tools": {tool: union_months(spans) for tool, spans in tool_spans.items()},
+        "categories": {category: union_months(spans) for category, spans in category_spans.items()},
+    }
+
+
+def generate_skills_overview(skills_overview_raw, projects=None, today=None, tools=None):
+    """
+    Groups the flat (category, tool) rows back into one row per category; tool spelling
+    variants are merged via `tools` (the ToolIndex shared with hard_skills).
+    years_of_experience is computed from the project intervals (compute_experience);
+    a larger value stated in the CV itself ("10+ years Python", passed through by GPT) is kept.
+    """
     if not isinstance(skills_overview_raw, list):
         return []
 
+    if tools is None:
+        tools = ToolIndex(row.get("tool", "") for row in skills_overview_raw)
     grouped = defaultdict(lambda: {"tools": [], "years": []})
 
     for row in skills_overview_raw:
@@ -243,20 +302,24 @@ def generate_skills_overview(skills_overview_raw):
         if not category or not tool:
             continue
 
-        grouped[category]["tools"].append(tool)
+        grouped[category]["tools"].append(tools.canonical(tool))
         try:
             years_clean = re.sub(r"[^\d.]", "", years)
             grouped[category]["years"].append(float(years_clean) if years_clean else 0)
         except Exception:
             grouped[category]["years"].append(0)
 
+    tool_categories = {tool.lower(): category for category, data in grouped.items() for tool in data["tools"]}
+    experience = compute_experience(projects, tool_categories, today, tools)
 
     final_overview = []
     for category, data in grouped.items():
+        stated = int(max(data["years"])) if data["years"] else 0
+        computed = months_to_years(experience["categories"].get(category, 0))
         final_overview.append({
             "category": category,
             "tools": sorted(set(data["tools"])),
-            "years_of_experience": str(int(max(data["years"]))) if data["years"] else "0"
+            "years_of_experience": str(max(stated, computed))
         })
 
     return final_overview
@@ -361,35 +424,144 @@ INDUSTRY_KEYWORDS = {
 }
 
 
+# Keywords that also match as the start of a longer word ("consult" → "consultancy")
+INDUSTRY_KEYWORD_PREFIXES = {"consult", "pharma", "telecom"}
+
+# Project fields that describe the employer/client (tech_stack, role etc. are not scanned:
+# "Azure Data Factory" is not a factory, a "Consultant" role is not a consulting client)
+DOMAIN_TEXT_FIELDS = ("project_title", "company", "overview", "responsibilities")
+
+
+def _trie_pattern(node: dict, prefixes) -> str:
+    """Regex for a trie node: common prefixes are factored out, longer keywords tried first."""
+    branches = [re.escape(ch) + _trie_pattern(child, prefixes) for ch, child in sorted(node.items()) if ch]
+    if "" in node:
+        # Keyword ends here: at a word boundary (plural "s" allowed), prefix keywords anywhere
+        branches.append("" if node[""] in prefixes else r"s?(?!\w)")
+    if len(branches) == 1 and "" not in node:
+        return branches[0]
+    return "(?:" + "|".join(branches) + ")"
+
+
+def compile_keyword_matcher(keywords: dict, prefixes=INDUSTRY_KEYWORD_PREFIXES):
+    """
+    Compiles keywords (keyword → value) into one trie-shaped regex anchored at word starts.
+    Each position costs at most the length of the longest keyword, independent of the
+    number of keywords (the regex is the keyword trie, not a list of alternatives).
+    Returns (regex, lower-cased keyword → value).
+    """
+    lookup = {keyword.lower(): value for keyword, value in keywords.items()}
+    trie = {}
+    for keyword in lookup:
+        node = trie
+        for ch in keyword:
+            node = node.setdefault(ch, {})
+        node[""] = keyword
+    return re.compile(r"(?<!\w)" + _trie_pattern(trie, prefixes)), lookup
+
+
+def scan_keywords(text: str, matcher) -> set:
+    """Values of all keywords found in `text` (one regex pass over the lower-cased text)."""
+    regex, lookup = matcher
+    found = set()
+    for m in regex.finditer(text.lower()):
+        word = m.group(0)
+        value = lookup.get(word)
+        found.add(value if value is not None else lookup[word[:-1]])
+    return found
+
+
+# Compiled once per process: GPT domain strings are matched against keywords and industry names
+_INDUSTRY_MATCHER = compile_keyword_matcher(
+    {**{industry: industry for industry in INDUSTRY_KEYWORDS.values()}, **INDUSTRY_KEYWORDS}
+)
+
+
+def _domain_text(data) -> str:
+    if not isinstance(data, dict):
+        return ""
+    parts = []
+    for key in DOMAIN_TEXT_FIELDS:
+        value = data.get(key)
+        if isinstance(value, list):
+            parts.extend(str(v) for v in value)
+        elif value:
+            parts.append(str(value))
+    return "\n".join(parts)
+
+
 def normalize_domains(domains, data):
-    text = json.dumps(data, ensure_ascii=False).lower()
+    """
+    Industries of a project: GPT's domain list, accepted only where it names an industry,
+    plus keyword hits in the project's employer/client fields (DOMAIN_TEXT_FIELDS).
+    """
     result = set()
 
     # 1️⃣ If GPT provided domains, accept ONLY if they are industries
     if isinstance(domains, list):
-        for d in domains:
-            d_low = d.lower()
-            for industry in INDUSTRY_KEYWORDS.values():
-                if industry in d_low:
-                    result.add(industry)
+        result |= scan_keywords("\n".join(str(d) for d in domains), _INDUSTRY_MATCHER)
 
-    # 2️⃣ Fallback: search within CV text / companies
-    for key, industry in INDUSTRY_KEYWORDS.items():
-        if key in text:
-            result.add(industry)
+    # 2️⃣ Fallback: search within the project's text / company
+    result |= scan_keywords(_domain_text(data), _INDUSTRY_MATCHER)
 
     return [d.title() for d in sorted(result)]
 
 def normalize_project_domains(project: dict) -> list[str]:
+    """Known employer/client (company gazetteer) first, else GPT domains + keyword hits."""
     if not isinstance(project, dict):
         return []
+    known = project_industries(project)
+    if known:
+        return [d.title() for d in known]
     return normalize_domains(project.get("domains", []), project)
 
+# ===============================================
+# 🧩 Per-project fixes
+# ===============================================
+_ROLE_RE = re.compile(
+    r"\b(CEO|Lead|Senior|Junior|Data|BI|Cloud|AI|ML|DevOps)?\s*"
+    r"(Developer|Engineer|Architect|Consultant|Manager|Analyst|Director|Specialist)\b",
+    re.I,
+)
+
+
+def postprocess_project(project: dict) -> dict:
+    """
+    Post-processes one project in place: duration format and open ranges, domains,
+    role/duration auto-fill, then the field transforms (PROJECT_FIELD_TRANSFORMS)
+    and the text cleanup in one traversal.
+    Independent of the other projects, so projects can be processed as they arrive
+    (streaming / fanned-out GPT stage); finalize_cv() then adds the CV-wide fields.
+    """
+    if not isinstance(project, dict):
+        return clean_text_fields(project)
+
+    unify_durations([project])
+    project["domains"] = normalize_project_domains(project)
+
+    # Auto-fill role and duration if GPT missed them (only from the current project)
+    if not project.get("role") or not project.get("duration"):
+        tech = project.get("tech_stack")
+        combined_text = " ".join([
+            project.get("project_title", "") or "",
+            project.get("overview", "") or "",
+            " ".join(map(str, tech)) if isinstance(tech, list) else str(tech or ""),
+        ])
+        if not project.get("role"):
+            role_match = _ROLE_RE.search(combined_text)
+            project["role"] = " ".join(p for p in role_match.groups() if p).strip().title() if role_match else ""
+        if not project.get("duration"):
+            ranges = [i for i in parse_dates(combined_text) if i.is_range]
+            project["duration"] = format_interval(ranges[0]) if ranges else ""
+
+    return clean_text_fields(project, PROJECT_FIELD_TRANSFORMS)
+
+
 # ===============================================
 # Main entry point
 # ===============================================
 
-def postprocess_filled_cv(data: dict, original_text: str = "") -> dict:
+def postprocess_filled_cv(data: dict, original_text: str = "", tech_inventory=None) -> dict:
     # If projects arrived as a string, parse them back into a list
     if isinstance(data.get("projects_experience"), str):
         import json, ast
@@ -402,82 +574,55 @@ def postprocess_filled_cv(data: dict, original_text: str = "") -> dict:
             except Exception:
                 data["projects_experience"] = []
 
-    # Apply duration normalization/fixes
-    data["projects_experience"] = unify_durations(data.get("projects_experience", []))
-    data["projects_experience"] = fix_open_date_ranges(data["projects_experience"])
+    if not isinstance(data.get("projects_experience"), list):
+        data["projects_experience"] = []
 
-    # Skills
-    data["hard_skills"] = clean_duplicates_in_skills(data.get("hard_skills", {}))
+    projects = data["projects_experience"]
+    for i, project in enumerate(projects):
+        projects[i] = postprocess_project(project)
+    return finalize_cv(data, original_text, tech_inventory)
 
-    # Skills overview
-    flat_skills = split_skills_overview_rows(data.get("skills_overview", []))
-    reconstructed = generate_skills_overview(flat_skills)
-    data["skills_overview"] = filter_skills_overview(reconstructed)
 
-    # Project domains (hybrid: GPT output + fallback via keywords per project)
-    for project in data.get("projects_experience", []):
-        if not isinstance(project, dict):
-            continue
-        project["domains"] = normalize_project_domains(project)
+def finalize_cv(data: dict, original_text: str = "", tech_inventory=None) -> dict:
+    """
+    CV-wide post-processing once all projects went through postprocess_project():
+    text cleanup of the other fields, aggregated domains, locally detected tools,
+    hard_skills deduplication and the skills overview.
+    """
+    if not isinstance(data.get("projects_experience"), list):
+        data["projects_experience"] = []
+
+    # Text cleanup of everything except the (already cleaned) projects, in place
+    for key, value in data.items():
+        if key != "projects_experience":
+            data[key] = clean_text_fields(value)
 
     # Global domains: derived ONLY from project domains (no global extraction)
-    project_domains = []
-    for p in data.get("projects_experience", []):
+    project_domains = set()
+    for p in data["projects_experience"]:
         if isinstance(p, dict) and isinstance(p.get("domains"), list):
-            project_domains.extend([str(x) for x in p.get("domains", []) if str(x).strip()])
-    combined = sorted({d.strip().title() for d in project_domains if str(d).strip()})
-    data["domains"] = combined
-
-    # Format responsibilities for each project
-    for project in data.get("projects_experience", []):
-        if isinstance(project, dict) and "responsibilities" in project:
-            project["responsibilities"] = format_responsibilities(project.get("responsibilities", []))
-
-    # Clean text fields
-    data = clean_text_fields(data)
-
-    # Safety net: if it's a string again after processing, parse again
-    if isinstance(data.get("projects_experience"), str):
-        import ast
-        try:
-            data["projects_experience"] = ast.literal_eval(data["projects_experience"])
-        except Exception:
-            data["projects_experience"] = []
-
-    # Auto-fill role and duration if GPT missed them
-    for project in data.get("projects_experience", []):
-        title = project.get("project_title", "") or ""
-        overview = project.get("overview", "") or ""
-        tech = " ".join(project.get("tech_stack", [])) if project.get("tech_stack") else ""
-
-        combined_text = " ".join([title, overview, tech])
+            project_domains.update(str(d).strip().title() for d in p["domains"] if str(d).strip())
+    data["domains"] = sorted(project_domains)
 
-        # --- ROLE (only from the current project) ---
-        if not project.get("role"):
-            role_match = re.search(
-                r"\b(CEO|Lead|Senior|Junior|Data|BI|Cloud|AI|ML|DevOps)?\s*"
-                r"(Developer|Engineer|Architect|Consultant|Manager|Analyst|Director|Specialist)\b",
-                combined_text,
-                re.I,
-            )
-            if role_match:
-                parts = [p for p in role_match.groups() if p]
-                project["role"] = " ".join(parts).strip().title()
-            else:
-                project["role"] = ""
+    # Locally detected tools GPT left out (tech_inventory from the prompt, else scanned from the text)
+    data = cross_fill_tech(data, inventory=tech_inventory, text=original_text)
 
-        # --- DURATION (only from the current project's text) ---
-        if not project.get("duration"):
-            duration_match = re.search(
-                r"(\d{1,2}\.\d{2}|\b(19|20)\d{2}\b)\s*[–-]\s*(Jetzt|Heute|Present|\d{1,2}\.\d{2}|\b(19|20)\d{2}\b)",
-                combined_text,
-            )
-            if duration_match:
-                start = duration_match.group(1)
-                end = duration_match.group(3)
-                project["duration"] = f"{start} – {end}"
-            else:
-                project["duration"] = ""
+    # Skills: one tool index per CV over every spelling (hard_skills, overview, tech stacks),
+    # so hard_skills and skills_overview share the display name
+    flat_skills = split_skills_overview_rows(data.get("skills_overview", []))
+    hard_skills = data.get("hard_skills") if isinstance(data.get("hard_skills"), dict) else {}
+    tools = ToolIndex(_skill_names(hard_skills))
+    for row in flat_skills:
+        tools.add(row["tool"])
+    for p in data["projects_experience"]:
+        stack = p.get("tech_stack") if isinstance(p, dict) else None
+        for tool in stack if isinstance(stack, list) else []:
+            tools.add(tool)
+    data["hard_skills"] = clean_duplicates_in_skills(hard_skills, tools)
+
+    # Skills overview (years from the project intervals, once tech_stacks and durations are complete)
+    reconstructed = generate_skills_overview(flat_skills, data.get("projects_experience"), tools=tools)
+    data["skills_overview"] = filter_skills_overview(reconstructed)
     return data
 
 
@@ -485,18 +630,49 @@ def postprocess_filled_cv(data: dict, original_text: str = "") -> dict:
 # Text cleanup and structure validation
 # ===============================================
 
-def clean_text_fields(data):
-    """Recursively cleans strings from noise and special symbols."""
-    if isinstance(data, dict):
-        return {k: clean_text_fields(v) for k, v in data.items()}
-    elif isinstance(data, list):
-        return [clean_text_fields(v) for v in data]
-    elif isinstance(data, str):
-        text = re.sub(r"[ \t]+", " ", data)
-        text = re.sub(r"[\u2022\u2023\u25E6\u2043\u2219\u00B7]", "-", text)
-        text = re.sub(r"\s*\n\s*", "\n", text)
-        text = text.replace("\xa0", " ").strip()
-        return text
+_BULLETS = str.maketrans(dict.fromkeys("\u2022\u2023\u25E6\u2043\u2219\u00B7", "-"))
+_SPACES_RE = re.compile(r"[ \t]*\t[ \t]*| {2,}")
+_NEWLINE_RE = re.compile(r"\s*\n\s*")
+
+
+def clean_text(text: str) -> str:
+    """Collapses spaces/tabs, turns bullet symbols into "-", trims around line breaks."""
+    text = _SPACES_RE.sub(" ", text.translate(_BULLETS))
+    if "\n" in text:
+        text = _NEWLINE_RE.sub("\n", text)
+    if "\xa0" in text:
+        text = text.replace("\xa0", " ")
+    return text.strip()
+
+
+def clean_text_fields(data, transforms=None):
+    """
+    Cleans every string in the tree with clean_text(), in place (one iterative traversal,
+    no copies). `transforms` maps field paths (("projects_experience", "*", "duration"),
+    list items as "*") to functions applied to the value before it is cleaned/descended into.
+    """
+    if isinstance(data, str):
+        return clean_text(data)
+    if not isinstance(data, (dict, list)):
+        return data
+    transforms = transforms or {}
+    max_depth = max(map(len, transforms), default=0)
+
+    stack = [(data, ())]
+    while stack:
+        node, path = stack.pop()
+        items = node.items() if isinstance(node, dict) else enumerate(node)
+        for key, value in items:
+            child_path = None
+            if path is not None and len(path) < max_depth:
+                child_path = path + (key if isinstance(node, dict) else "*",)
+                transform = transforms.get(child_path)
+                if transform is not None:
+                    value = node[key] = transform(value)
+            if isinstance(value, str):
+                node[key] = clean_text(value)
+            elif isinstance(value, (dict, list)):
+                stack.append((value, child_path))
     return data
 
 def validate_cv_schema(cv_json):
@@ -591,4 +767,12 @@ def format_responsibilities(responsibilities):
     if len(formatted) > 5:
         formatted = formatted[:5]
     
-    return formatted
\ No newline at end of file
+    return formatted
+
+
+# Transforms per field path inside a project (list items are "*"), applied by
+# clean_text_fields in postprocess_project before the text cleanup of the returned value.
+# Durations are not listed: unify_durations already rewrites them (rewrite_dates).
+PROJECT_FIELD_TRANSFORMS = {
+    ("responsibilities",): format_responsibilities,
+}
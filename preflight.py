@@ -0,0 +1,156 @@
+import re
+import time
+import fitz  # PyMuPDF
+
+# ============================================================
+# 🛫 Preflight: cheap triage of an uploaded PDF (no GPT)
+# ============================================================
+# Runs before extraction/translation/GPT. Reads only the first pages, so it
+# takes milliseconds even for long documents, and rejects inputs that would
+# burn a full GPT round trip for nothing: broken or password-protected files,
+# scans without a text layer and documents that are clearly not a CV.
+
+PREFLIGHT_MAX_PAGES = 8         # pages inspected (text density, images, CV score)
+MIN_TEXT_CHARS = 200            # below this (over the inspected pages) the PDF has no usable text layer
+SCANNED_IMAGE_COVERAGE = 0.25   # image share of a page that marks a text-less PDF as a scan/photo
+MIN_CV_SCORE = 0.2              # below this the document is not treated as a CV
+MAX_CV_PAGES = 60               # longer documents are accepted but flagged
+
+
+class PreflightRejected(ValueError):
+    """Raised by check_pdf() when the preflight verdict is not "ok"."""
+
+    def __init__(self, report: dict):
+        super().__init__(report.get("reason") or report.get("verdict"))
+        self.report = report
+
+CV_SECTION_WORDS = {
+    "experience": r"experience|berufserfahrung|erfahrung|work history|employment|projekte?|projects?",
+    "education": r"education|ausbildung|studium|universit|hochschule|degree",
+    "skills": r"skills|kenntnisse|kompetenzen|technologies|technologien|tools",
+    "languages": r"languages|sprachen|sprachkenntnisse",
+    "cv": r"curriculum vitae|lebenslauf|resume|résumé|\bcv\b|profil|profile",
+}
+_SECTION_RES = {name: re.compile(pattern, re.I) for name, pattern in CV_SECTION_WORDS.items()}
+_DATE_RANGE_RE = re.compile(r"(?:19|20)\d{2}\s*[-–]\s*(?:(?:\d{1,2}[./])?(?:19|20)\d{2}|heute|present|now|jetzt|today)", re.I)
+_EMAIL_RE = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+
+
+# ============================================================
+# 1️⃣ Per-page measurements
+# ============================================================
+def image_coverage(page) -> float:
+    """Share of the page area covered by images (0..1, overlaps are not merged)."""
+    page_area = abs(page.rect) or 1.0
+    covered = 0.0
+    for info in page.get_image_info():
+        bbox = fitz.Rect(info["bbox"]) & page.rect
+        covered += abs(bbox)
+    return min(1.0, covered / page_area)
+
+
+def cv_score(text: str) -> float:
+    """0..1: share of CV section groups found, plus date ranges and an e-mail address."""
+    hits = sum(1 for rx in _SECTION_RES.values() if rx.search(text))
+    signals = hits + (1 if len(_DATE_RANGE_RE.findall(text)) >= 2 else 0) + (1 if _EMAIL_RE.search(text) else 0)
+    return round(signals / (len(_SECTION_RES) + 2), 2)
+
+
+# ============================================================
+# 2️⃣ Triage
+# ============================================================
+def preflight_pdf(pdf_path: str) -> dict:
+    """
+    Inspects the PDF and returns a report:
+    {"ok", "verdict", "reason", "page_count", "encrypted", "text_chars", "image_coverage",
+     "cv_score", "warnings", "seconds"}
+
+    verdict: "ok" | "invalid" | "encrypted" | "empty" | "scanned" (scan/photo, OCR route) | "not_cv"
+    ("text_chars"/"image_coverage" cover the inspected pages only)
+    """
+    start = time.perf_counter()
+    report = {
+        "ok": False,
+        "verdict": "invalid",
+        "reason": "",
+        "page_count": 0,
+        "encrypted": False,
+        "text_chars": [],
+        "image_coverage": [],
+        "cv_score": 0.0,
+        "warnings": [],
+        "seconds": 0.0,
+    }
+
+    def done(verdict, reason=""):
+        report["verdict"] = verdict
+        report["reason"] = reason
+        report["ok"] = verdict == "ok"
+        report["seconds"] = round(time.perf_counter() - start, 4)
+        return report
+
+    try:
+        doc = fitz.open(pdf_path)
+    except Exception as e:
+        return done("invalid", f"Datei ist kein lesbares PDF ({e})")
+
+    with doc:
+        if not doc.is_pdf:
+            # PyMuPDF opens photos (JPEG/PNG/TIFF) as one-page documents: OCR only
+            report["page_count"] = doc.page_count
+            return done("scanned", "Bilddatei ohne Textebene")
+
+        report["encrypted"] = bool(doc.is_encrypted)
+        # Owner-password-only PDFs open without a password; only a user password blocks extraction
+        if doc.needs_pass:
+            return done("encrypted", "PDF ist passwortgeschützt")
+
+        report["page_count"] = doc.page_count
+        if doc.page_count == 0:
+            return done("empty", "PDF enthält keine Seiten")
+        if doc.page_count > MAX_CV_PAGES:
+            report["warnings"].append(f"Ungewöhnlich lang für einen CV ({doc.page_count} Seiten)")
+
+        texts = []
+        for page in doc.pages(0, min(doc.page_count, PREFLIGHT_MAX_PAGES)):
+            text = page.get_text("text")
+            texts.append(text)
+            report["text_chars"].append(sum(1 for ch in text if not ch.isspace()))
+            report["image_coverage"].append(round(image_coverage(page), 2))
+
+    text = "\n".join(texts)
+    total_chars = sum(report["text_chars"])
+    report["cv_score"] = cv_score(text)
+
+    if total_chars < MIN_TEXT_CHARS:
+        if max(report["image_coverage"]) >= SCANNED_IMAGE_COVERAGE:
+            return done("scanned", "Gescanntes PDF ohne Textebene")
+        return done("empty", "PDF enthält kaum Text")
+
+    if report["cv_score"] < MIN_CV_SCORE:
+        return done("not_cv", "Dokument sieht nicht wie ein Lebenslauf aus")
+
+    return done("ok")
+
+
+def check_pdf(pdf_path: str, allow_ocr: bool = False) -> dict:
+    """
+    preflight_pdf(), raising PreflightRejected for hopeless inputs.
+    With allow_ocr=True scans/photos pass (verdict "scanned") and go the OCR route.
+    """
+    report = preflight_pdf(pdf_path)
+    if not report["ok"] and not (allow_ocr and report["verdict"] == "scanned"):
+        raise PreflightRejected(report)
+    return report
+
+
+# ============================================================
+# 🧪 CLI
+# ============================================================
+if __name__ == "__main__":
+    import sys
+    import json
+
+    for path in sys.argv[1:]:
+        print(path)
+        print(json.dumps(preflight_pdf(path), ensure_ascii=False, indent=2))
@@ -0,0 +1,201 @@
+import os
+import zlib
+import atexit
+import logging
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+# ============================================================
+# 🖨 Out-of-process PDF rendering
+# ============================================================
+# ReportLab rendering is pure Python and CPU-bound. Running it in the Streamlit
+# script thread holds the GIL and stalls every other session on the server, so
+# renders are shipped as CV JSON to a pool of preloaded worker processes.
+
+DEFAULT_WORKERS = max(1, min(4, (os.cpu_count() or 1)))
+DEFAULT_TIMEOUT = 120  # seconds per render
+SECTION_CACHE_SIZE = 512  # built sections kept per worker for incremental re-renders
+
+
+class RenderPoolBusy(RuntimeError):
+    """Raised when the render queue is full and no slot frees up in time."""
+
+
+class RenderTimeout(RuntimeError):
+    """Raised when a render does not finish within its timeout."""
+
+
+def _warm_worker():
+    """Worker initializer: import the generator (fonts + styles) and render once to warm caches."""
+    import cv_pdf_generator
+
+    try:
+        cv_pdf_generator.render_cv_pdf({
+            "full_name": "Warmup",
+            "title": "Warmup",
+            "projects_experience": [{"project_title": "Warmup", "responsibilities": ["Warmup"]}],
+        })
+    except Exception as e:
+        logging.warning(f"⚠️ Render worker warm-up failed: {e}")
+
+
+_section_cache = None
+
+
+def _render_in_worker(json_data, prefix):
+    """
+    Renders with a per-worker section cache: re-rendering an edited CV only rebuilds
+    the sections whose content changed; unchanged cards keep their measured layout.
+    Renders of one session always reach the same worker (see RenderPool.submit).
+    """
+    global _section_cache
+    from cv_pdf_generator import render_cv_pdf, SectionCache
+
+    if _section_cache is None:
+        _section_cache = SectionCache(maxsize=SECTION_CACHE_SIZE)
+    return render_cv_pdf(json_data, prefix=prefix, cache=_section_cache)
+
+
+def _new_worker():
+    """One warmed render process ("spawn": never fork a multi-threaded Streamlit server)."""
+    return ProcessPoolExecutor(
+        max_workers=1,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_warm_worker,
+    )
+
+
+def _kill_worker(executor):
+    """Terminates the worker process; its pending futures fail with BrokenProcessPool."""
+    terminate = getattr(executor, "terminate_workers", None)  # Python 3.14+
+    if terminate is not None:
+        terminate()
+        return
+    for process in list((executor._processes or {}).values()):
+        process.terminate()
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+class RenderPool:
+    """
+    Pool of warmed render processes with a bounded queue.
+
+    - workers: number of processes (one single-process executor each, so a hung render
+      can be killed and replaced without touching the other workers)
+    - max_pending: renders allowed in flight (running + queued); more raise RenderPoolBusy
+    - timeout: default seconds to wait for one render
+    """
+
+    def __init__(self, workers=DEFAULT_WORKERS, max_pending=None, timeout=DEFAULT_TIMEOUT, queue_timeout=5):
+        self.workers = workers
+        self.max_pending = max_pending or workers * 4
+        self.timeout = timeout
+        self.queue_timeout = queue_timeout
+
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._lock = threading.Lock()
+        self._executors = [_new_worker() for _ in range(workers)]
+        self._load = [0] * workers   # renders in flight per worker
+        self._worker_of = {}         # future → (worker index, executor)
+
+    def submit(self, json_data, prefix="CV Inpro", session=None):
+        """
+        Queues one render and returns a Future resolving to render_cv_pdf()'s result dict.
+        With a session id, all renders of that session go to the same worker, whose section
+        cache holds the previous version of the CV; without one, to the least busy worker.
+        """
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            raise RenderPoolBusy(f"Render queue is full ({self.max_pending} pending)")
+        try:
+            with self._lock:
+                if session is not None:
+                    worker = zlib.crc32(str(session).encode("utf-8")) % self.workers
+                else:
+                    worker = min(range(self.workers), key=self._load.__getitem__)
+                executor = self._executors[worker]
+                future = executor.submit(_render_in_worker, json_data, prefix)
+                self._load[worker] += 1
+                self._worker_of[future] = (worker, executor)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(self._finished)
+        return future
+
+    def _finished(self, future):
+        with self._lock:
+            worker, executor = self._worker_of.pop(future, (None, None))
+            if executor is not None and self._executors[worker] is executor:
+                self._load[worker] -= 1
+        self._slots.release()
+
+    def worker_of(self, future):
+        """Index of the worker a pending render was queued on (None once it finished)."""
+        with self._lock:
+            return self._worker_of.get(future, (None, None))[0]
+
+    def recycle(self, future):
+        """
+        Kills the worker process running `future` (a running render cannot be cancelled)
+        and starts a fresh one in its place. Renders queued on that worker fail with
+        BrokenProcessPool; every failed render releases its queue slot.
+        """
+        with self._lock:
+            worker, executor = self._worker_of.get(future, (None, None))
+            if executor is None or self._executors[worker] is not executor:
+                return  # finished meanwhile or already recycled
+            self._executors[worker] = _new_worker()
+            self._load[worker] = 0
+        _kill_worker(executor)
+
+    def render(self, json_data, prefix="CV Inpro", timeout=None, session=None):
+        """
+        Renders one CV in a worker process and returns {"pdf_bytes", "file_name", "page_count", "path"}.
+        On timeout the worker is recycled; a render lost because another render's worker
+        was recycled is retried once.
+        """
+        timeout = timeout or self.timeout
+        for attempt in range(2):
+            future = self.submit(json_data, prefix=prefix, session=session)
+            try:
+                return future.result(timeout=timeout)
+            except FutureTimeoutError:
+                self.recycle(future)
+                raise RenderTimeout(f"PDF render did not finish within {timeout}s")
+            except BrokenProcessPool:
+                if attempt:
+                    raise
+
+    def close(self, wait=True):
+        with self._lock:
+            executors = list(self._executors)
+        for executor in executors:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+
+# ============================================================
+# Shared pool (one per server process)
+# ============================================================
+_shared_pool = None
+_shared_lock = threading.Lock()
+
+
+def get_render_pool(workers=None) -> RenderPool:
+    """Returns the process-wide pool, starting it on first use."""
+    global _shared_pool
+    with _shared_lock:
+        if _shared_pool is None:
+            workers = workers or int(os.getenv("CV_RENDER_WORKERS", DEFAULT_WORKERS))
+            _shared_pool = RenderPool(workers=workers)
+            atexit.register(_shared_pool.close, False)
+        return _shared_pool
+
+
+def render_cv_pdf_pooled(json_data, prefix="CV Inpro", timeout=None, session=None):
+    """
+    Drop-in for cv_pdf_generator.render_cv_pdf (without output_dir) using the shared pool.
+    Pass a per-user session id so incremental saves reuse the same worker's cache.
+    """
+    return get_render_pool().render(json_data, prefix=prefix, timeout=timeout, session=session)
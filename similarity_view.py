@@ -1,13 +1,15 @@
+import io
 import os
-import glob
 from difflib import SequenceMatcher
 from PyPDF2 import PdfReader
 import streamlit as st
 
 
-def extract_text_from_pdf(path: str) -> str:
-    """Extract text page-by-page from a PDF file."""
-    reader = PdfReader(path)
+def extract_text_from_pdf(source) -> str:
+    """Extract text page-by-page from a PDF file path or in-memory PDF bytes."""
+    if isinstance(source, (bytes, bytearray)):
+        source = io.BytesIO(source)
+    reader = PdfReader(source)
     return "\n".join(page.extract_text() or "" for page in reader.pages)
 
 
@@ -40,16 +42,17 @@ def compare_sections(original_text: str, inpro_text: str):
 
 essential_glob_prefix = "CV_Streamlit"
 
-def show_similarity_results(original_pdf_path: str, generated_pdf_path: str):
-    """Render similarity results inside Streamlit app."""
-    if not (os.path.exists(original_pdf_path) and os.path.exists(generated_pdf_path)):
+def show_similarity_results(original_pdf_path: str, generated_pdf):
+    """Render similarity results inside Streamlit app (generated_pdf: path or PDF bytes)."""
+    generated_missing = isinstance(generated_pdf, str) and not os.path.exists(generated_pdf)
+    if not os.path.exists(original_pdf_path) or generated_missing:
         st.warning("⚠️ Die Dateien zum Vergleich wurden nicht gefunden.")
         return
 
     st.subheader("📊 Ähnlichkeitsbewertung der CVs nach Abschnitten")
 
     orig_text = extract_text_from_pdf(original_pdf_path)
-    gen_text = extract_text_from_pdf(generated_pdf_path)
+    gen_text = extract_text_from_pdf(generated_pdf)
     comparison = compare_sections(orig_text, gen_text)
 
     table_data = []
@@ -64,36 +67,24 @@ def show_similarity_results(original_pdf_path: str, generated_pdf_path: str):
     st.markdown(f"### 🟩 Durchschnittliche Übereinstimmung: **{avg}%**")
 
 
-def generate_report_pdf_bytes(create_pdf_func, filled_json: dict, original_pdf_path: str | None = None, output_dir: str = "data_output", prefix: str = "CV_Streamlit") -> bytes:
+def generate_report_pdf_bytes(render_pdf_func, filled_json: dict, original_pdf_path: str | None = None, output_dir: str | None = None, prefix: str = "CV_Streamlit") -> bytes:
     """
-    Generate PDF via provided create_pdf_func() and optionally render similarity results.
-    - create_pdf_func: callable like cv_pdf_generator.create_pretty_first_section
+    Generate PDF via provided render_pdf_func() and optionally render similarity results.
+    - render_pdf_func: callable like cv_pdf_generator.render_cv_pdf (returns a dict with "pdf_bytes")
     - filled_json: data for PDF
     - original_pdf_path: if provided, will compute and show similarity inside Streamlit
+    - output_dir: optional; if given, the PDF is also written there
     Returns PDF bytes.
     """
-    os.makedirs(output_dir, exist_ok=True)
-
-    # create PDF
-    create_pdf_func(filled_json, output_dir=output_dir, prefix=prefix)
-
-    # find latest generated file
-    pdf_files = sorted(
-        glob.glob(os.path.join(output_dir, f"{prefix}*.pdf")),
-        key=os.path.getmtime,
-        reverse=True
-    )
-    if not pdf_files:
-        raise FileNotFoundError("No generated PDF file found after creation.")
-
-    latest_pdf = pdf_files[0]
+    # create PDF in memory (no lookup of "the latest" file on disk)
+    result = render_pdf_func(filled_json, prefix=prefix, output_dir=output_dir)
+    pdf_bytes = result["pdf_bytes"]
 
     # show similarity if original provided
     if original_pdf_path and os.path.exists(original_pdf_path):
         try:
-            show_similarity_results(original_pdf_path, latest_pdf)
+            show_similarity_results(original_pdf_path, pdf_bytes)
         except Exception as e:
             st.warning(f"⚠️ Fehler bei der Ähnlichkeitsbewertung: {e}")
 
-    with open(latest_pdf, "rb") as f:
-        return f.read()
+    return pdf_bytes
@@ -1,7 +1,102 @@
 import re
+from functools import lru_cache
 from tech_mapping import TECH_MAPPING
 
 
+# ============================================================
+# Compiled TECH_MAPPING classifier
+# ============================================================
+try:
+    from re import _parser as _sre_parse
+except ImportError:  # Python < 3.11
+    import sre_parse as _sre_parse
+
+_WORD_START = re.compile(r"(?<!\w)\w")
+
+
+def _first_chars(items):
+    """Lowercased characters a parsed pattern can start with (None = unknown/any)."""
+    for op, av in items:
+        if op in (_sre_parse.AT, _sre_parse.ASSERT, _sre_parse.ASSERT_NOT):
+            continue  # zero-width
+        if op is _sre_parse.LITERAL:
+            return {chr(av).lower()}
+        if op is _sre_parse.SUBPATTERN:
+            return _first_chars(av[-1])
+        if op is _sre_parse.BRANCH:
+            chars = set()
+            for branch in av[1]:
+                branch_chars = _first_chars(branch)
+                if branch_chars is None:
+                    return None
+                chars |= branch_chars
+            return chars
+        return None
+    return None
+
+
+def _compile_tech_matcher(mapping):
+    """
+    Compiles TECH_MAPPING into one alternation per first character, with a named
+    group per pattern (t<index>). match() at a position tries the alternatives in
+    mapping order, so it reports the lowest-indexed pattern matching there; the
+    minimum over all positions is the first pattern that matches anywhere, i.e.
+    exactly what the sequential re.search loop returned.
+    """
+    categories = list(mapping.values())
+    buckets = {}  # first char -> [(index, body)]
+    generic = []  # patterns whose first character is unknown go into every bucket
+    for idx, pattern in enumerate(mapping):
+        # All mapping patterns are case-insensitive; the flag is applied globally
+        body = pattern[4:] if pattern.startswith("(?i)") else pattern
+        chars = _first_chars(_sre_parse.parse(body, re.IGNORECASE))
+        if chars is None:
+            generic.append((idx, body))
+        else:
+            for ch in chars:
+                buckets.setdefault(ch, []).append((idx, body))
+
+    def compile_alternation(entries):
+        entries = sorted(entries)
+        if not entries:
+            return None
+        return re.compile("|".join(f"(?P<t{idx}>{body})" for idx, body in entries), re.IGNORECASE)
+
+    matchers = {ch: compile_alternation(entries + generic) for ch, entries in buckets.items()}
+    fallback = compile_alternation(generic)
+
+    # Patterns anchored with \b / (?<!\w) can only start where a word starts
+    word_anchored = all(
+        re.sub(r"^\(\?i\)", "", p).startswith((r"\b", r"(?<!\w)")) for p in mapping
+    )
+    return matchers, fallback, categories, word_anchored
+
+
+_TECH_MATCHERS, _TECH_FALLBACK, _TECH_CATEGORIES, _TECH_WORD_ANCHORED = _compile_tech_matcher(TECH_MAPPING)
+
+
+@lru_cache(maxsize=8192)
+def classify_tech(name: str):
+    """Returns the TECH_MAPPING category of a tool name (first matching pattern wins) or None."""
+    if _TECH_WORD_ANCHORED:
+        positions = (m.start() for m in _WORD_START.finditer(name))
+    else:
+        positions = range(len(name))
+
+    best = None
+    for pos in positions:
+        matcher = _TECH_MATCHERS.get(name[pos].lower(), _TECH_FALLBACK)
+        m = matcher.match(name, pos) if matcher else None
+        if m is None:
+            continue
+        idx = int(m.lastgroup[1:])
+        if best is None or idx < best:
+            best = idx
+            if best == 0:
+                break
+    return _TECH_CATEGORIES[best] if best is not None else None
+
+
 def remap_hard_skills(hard_skills_from_gpt):
     """
     Improved hard_skills normalization:
@@ -28,13 +123,7 @@ def remap_hard_skills(hard_skills_from_gpt):
             if not name:
                 continue
 
-            matched_category = None
-            for pattern, mapped_category in TECH_MAPPING.items():
-                if re.search(pattern, name):
-                    matched_category = mapped_category
-                    break
-
-            target_cat = matched_category or "other_tools"
+            target_cat = classify_tech(name) or "other_tools"
             mapped_skills[target_cat].append({"name": name})
 
     # --- 🧠 Smart reassignment of "noise" from other_tools
@@ -103,3 +192,297 @@ def remap_hard_skills(hard_skills_from_gpt):
     cleaned = {k: v for k, v in mapped_skills.items() if v}
 
     return cleaned
+
+
+# ============================================================
+# 🔎 Local tech scanner (free text → candidate tech inventory)
+# ============================================================
+# Mapping hits that are ordinary words in running text ("go live", "R&D",
+# "solid experience") are ignored by the scanner; tool *names* still use them.
+TEXT_SCAN_STOPWORDS = {"go", "r", "api", "solid", "next", "guard", "shield", "inspector", "whisper"}
+
+
+def scan_technologies(text: str) -> list[dict]:
+    """
+    Scans free text with the compiled TECH_MAPPING and returns every hit in order:
+    [{"name", "category", "start", "end"}]. Hits do not overlap; at one position the
+    first pattern in mapping order wins (same rule as classify_tech).
+    """
+    if not text:
+        return []
+
+    hits = []
+    pos = 0
+    positions = _WORD_START.finditer(text) if _TECH_WORD_ANCHORED else range(len(text))
+    for start in positions:
+        start = start.start() if _TECH_WORD_ANCHORED else start
+        if start < pos:
+            continue
+        matcher = _TECH_MATCHERS.get(text[start].lower(), _TECH_FALLBACK)
+        m = matcher.match(text, start) if matcher else None
+        if m is None or m.end() == start:
+            continue
+        name = " ".join(m.group(0).split())
+        if name.lower() in TEXT_SCAN_STOPWORDS:
+            continue
+        hits.append({
+            "name": name,
+            "category": _TECH_CATEGORIES[int(m.lastgroup[1:])],
+            "start": m.start(),
+            "end": m.end(),
+        })
+        pos = m.end()
+    return hits
+
+
+def scan_tech_inventory(text: str) -> list[dict]:
+    """
+    Groups scan_technologies() hits per tool (case-insensitive), in order of first mention:
+    [{"name", "category", "count", "positions": [(start, end), ...]}].
+    The display name is the first spelling that contains an uppercase letter.
+    """
+    inventory = {}
+    for hit in scan_technologies(text):
+        key = hit["name"].lower()
+        entry = inventory.get(key)
+        if entry is None:
+            entry = inventory[key] = {"name": hit["name"], "category": hit["category"], "count": 0, "positions": []}
+        elif entry["name"].islower() and not hit["name"].islower():
+            entry["name"] = hit["name"]
+        entry["count"] += 1
+        entry["positions"].append((hit["start"], hit["end"]))
+    return list(inventory.values())
+
+
+def _project_text(project: dict) -> str:
+    parts = [project.get("project_title"), project.get("overview"), project.get("role")]
+    responsibilities = project.get("responsibilities")
+    if isinstance(responsibilities, list):
+        parts.extend(responsibilities)
+    else:
+        parts.append(responsibilities)
+    return "\n".join(str(p) for p in parts if p)
+
+
+def cross_fill_tech(data: dict, inventory=None, text: str = "") -> dict:
+    """
+    Adds locally detected tools that GPT left out:
+    - each project's tech_stack gets the tools named in its own title/overview/responsibilities
+    - hard_skills gets every tool from the CV inventory (or `text`) and all project stacks,
+      in its TECH_MAPPING category, unless it is already listed in any category
+    Existing entries are never removed or moved.
+    """
+    if not isinstance(data, dict):
+        return data
+    if inventory is None:
+        inventory = scan_tech_inventory(text)
+
+    candidates = [(t["name"], t["category"]) for t in inventory]
+
+    for project in data.get("projects_experience") or []:
+        if not isinstance(project, dict):
+            continue
+        stack = project.get("tech_stack")
+        if not isinstance(stack, list):
+            stack = [stack] if isinstance(stack, str) and stack.strip() else []
+        known = {str(t).strip().lower() for t in stack}
+        for tool in scan_tech_inventory(_project_text(project)):
+            if tool["name"].lower() not in known:
+                stack.append(tool["name"])
+                known.add(tool["name"].lower())
+        project["tech_stack"] = stack
+        candidates.extend((str(t).strip(), classify_tech(str(t).strip())) for t in stack if str(t).strip())
+
+    hard_skills = data.get("hard_skills")
+    if not isinstance(hard_skills, dict):
+        hard_skills = {}
+    listed = {
+        (item["name"] if isinstance(item, dict) else str(item)).strip().lower()
+        for items in hard_skills.values() if isinstance(items, list)
+        for item in items
+    }
+    for name, category in candidates:
+        if not category or name.lower() in listed:
+            continue
+        items = hard_skills.get(category)
+        if not isinstance(items, list):
+            items = hard_skills[category] = []
+        # "Azure" is already covered by "Microsoft Azure"
+        word = re.compile(rf"(?<!\w){re.escape(name.lower())}(?!\w)")
+        if any(word.search(str(i.get("name", "") if isinstance(i, dict) else i).lower()) for i in items):
+            continue
+        items.append(name)
+        listed.add(name.lower())
+    data["hard_skills"] = hard_skills
+    return data
+
+
+# ============================================================
+# 🧬 Tool canonicalization (near-duplicate tool names)
+# ============================================================
+# Generic trailing words that do not make a different tool ("Azure DevOps Pipelines")
+TOOL_SUFFIX_WORDS = {"pipeline", "pipelines", "service", "services", "platform", "suite", "framework", "sdk"}
+# Different names of the same tool (compact keys, see tool_identity)
+TOOL_SYNONYMS = {
+    "node": "node.js", "nodejs": "node.js",
+    "golang": "go",
+    "postgres": "postgresql",
+    "k8s": "kubernetes",
+    "reactjs": "react", "react.js": "react",
+    "vue": "vue.js", "vuejs": "vue.js",
+    "amazonwebservices": "aws",
+    "googlecloud": "gcp",
+    "microsoftazure": "azure", "msazure": "azure",
+    "mssql": "sqlserver", "microsoftsqlserver": "sqlserver", "mssqlserver": "sqlserver",
+}
+FUZZY_MIN_LENGTH = 6        # shorter names are only merged by identity (Java ≠ Jira)
+FUZZY_MIN_SIMILARITY = 0.8  # trigram Jaccard similarity for a spelling variant
+FUZZY_MAX_EDITS = 1         # typos: edit distance (2 for names of 12+ characters)
+FUZZY_MAX_CANDIDATES = 8    # candidates compared per lookup (most shared trigrams first)
+FUZZY_MAX_POSTINGS = 64     # trigrams shared by more names are too common to be useful
+
+_SEPARATORS = re.compile(r"[\s_\-]+")
+
+
+def tool_key(name: str) -> str:
+    """'Azure-DevOps ' → 'azure devops' (case and separators ignored)."""
+    return _SEPARATORS.sub(" ", str(name).lower()).strip()
+
+
+@lru_cache(maxsize=8192)
+def tool_identity(key: str) -> str:
+    """
+    Compact identity of a tool key: generic suffix words dropped, synonyms resolved
+    ('azure devops pipelines' → 'azuredevops', 'golang' → 'go'). Equal identity = same tool.
+    """
+    words = key.split(" ")
+    while len(words) > 1 and words[-1] in TOOL_SUFFIX_WORDS:
+        words.pop()
+    compact = "".join(words)
+    return TOOL_SYNONYMS.get(compact, compact)
+
+
+@lru_cache(maxsize=8192)
+def tool_pattern(key: str):
+    """Index of the TECH_MAPPING pattern that matches the whole tool key, or None."""
+    matcher = _TECH_MATCHERS.get(key[:1], _TECH_FALLBACK)
+    m = matcher.fullmatch(key) if matcher else None
+    return int(m.lastgroup[1:]) if m is not None else None
+
+
+def _within_edits(a: str, b: str, limit: int) -> bool:
+    """Levenshtein distance of a and b <= limit (rows stop early once every cell exceeds it)."""
+    if abs(len(a) - len(b)) > limit:
+        return False
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        if min(current) > limit:
+            return False
+        previous = current
+    return previous[-1] <= limit
+
+
+def _trigrams(compact: str) -> set:
+    padded = f" {compact} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class ToolIndex:
+    """
+    Canonical tool names for one CV. Spellings are grouped by identity (case, separators,
+    generic suffix words, TOOL_SYNONYMS) or as typo variants (trigram similarity / edit
+    distance; never across two TECH_MAPPING tools). A lookup costs at most
+    FUZZY_MAX_CANDIDATES comparisons, independent of the list size.
+
+    The display name of a group is the spelling TECH_MAPPING recognizes, then one with
+    capitals, then the most frequent one; add() every spelling of the CV before calling
+    canonical() so the choice does not depend on arrival order.
+    """
+
+    def __init__(self, names=()):
+        self._by_compact = {}   # 'azuredevops' → group index
+        self._groups = []       # {"identity", "trigrams", "pattern", "spellings": {name: [count, first]}}
+        self._postings = {}     # trigram → [group index]
+        self._display = {}      # group index → display name (reset when a spelling is added)
+        self._added = 0
+        for name in names:
+            self.add(name)
+
+    def add(self, name: str):
+        """Registers one occurrence of a spelling; returns its group index (None for blanks)."""
+        name = str(name).strip()
+        key = tool_key(name)
+        compact = key.replace(" ", "")
+        if not compact:
+            return None
+        group = self._by_compact.get(compact)
+        if group is None:
+            group = self._group(key, compact)
+            self._by_compact[compact] = group
+        spellings = self._groups[group]["spellings"]
+        entry = spellings.setdefault(name, [0, self._added])
+        entry[0] += 1
+        self._added += 1
+        self._display.pop(group, None)
+        return group
+
+    def canonical(self, name: str) -> str:
+        name = str(name).strip()
+        compact = tool_key(name).replace(" ", "")
+        group = self._by_compact.get(compact)
+        if group is None:
+            group = self.add(name)
+            if group is None:
+                return name
+        display = self._display.get(group)
+        if display is None:
+            display = self._display[group] = max(self._groups[group]["spellings"].items(), key=_display_rank)[0]
+        return display
+
+    def _group(self, key: str, compact: str) -> int:
+        identity = tool_identity(key)
+        group = self._by_compact.get(identity)
+        if group is not None:
+            return group
+        pattern = tool_pattern(key)
+        trigrams = _trigrams(identity)
+        if len(identity) >= FUZZY_MIN_LENGTH:
+            group = self._fuzzy(identity, trigrams, pattern)
+            if group is not None:
+                return group
+
+        group = len(self._groups)
+        self._groups.append({"identity": identity, "trigrams": trigrams, "pattern": pattern, "spellings": {}})
+        self._by_compact[identity] = group
+        for gram in trigrams:
+            self._postings.setdefault(gram, []).append(group)
+        return group
+
+    def _fuzzy(self, identity: str, trigrams: set, pattern):
+        shared = {}
+        for gram in trigrams:
+            posting = self._postings.get(gram, ())
+            if len(posting) > FUZZY_MAX_POSTINGS:
+                continue
+            for group in posting:
+                shared[group] = shared.get(group, 0) + 1
+        edits = FUZZY_MAX_EDITS + (len(identity) >= 12)
+        best = sorted(shared.items(), key=lambda item: -item[1])[:FUZZY_MAX_CANDIDATES]
+        for group, count in best:
+            other = self._groups[group]
+            if pattern is not None and other["pattern"] is not None and pattern != other["pattern"]:
+                continue  # two different TECH_MAPPING tools (Java / JavaScript)
+            if len(other["identity"]) < FUZZY_MIN_LENGTH:
+                continue
+            if count / len(trigrams | other["trigrams"]) >= FUZZY_MIN_SIMILARITY or _within_edits(identity, other["identity"], edits):
+                return group
+        return None
+
+
+def _display_rank(item):
+    """Display preference of a spelling: recognized by TECH_MAPPING, has capitals, most frequent, first seen."""
+    name, (count, first) = item
+    return (tool_pattern(tool_key(name)) is not None, not name.islower(), count, -first)
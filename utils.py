@@ -97,7 +97,104 @@ def count_empty_fields(data: Any) -> int:
 
 
 # ============================================================
-# 5️⃣ Debug utilities (optional)
+# 5️⃣ Project / domain helpers (shared by app.py and the PDF generator)
+# ============================================================
+def norm_list(x):
+    """Normalize values that should be list[str]."""
+    if x is None:
+        return []
+    if isinstance(x, list):
+        return [str(v).strip() for v in x if str(v).strip()]
+    if isinstance(x, str):
+        parts = [p.strip() for p in x.split(",")]
+        return [p for p in parts if p]
+    s = str(x).strip()
+    return [s] if s else []
+
+
+def project_has_content(p: dict) -> bool:
+    if not isinstance(p, dict):
+        return False
+    keys = [
+        "project_title",
+        "company",
+        "role",
+        "overview",
+        "duration",
+        "tech_stack",
+        "responsibilities",
+        "domains",
+    ]
+    for k in keys:
+        v = p.get(k)
+        if isinstance(v, list):
+            if any(str(x).strip() for x in v if x is not None):
+                return True
+        elif v is not None and str(v).strip():
+            return True
+    return False
+
+
+def extract_domains_from_projects(rows: list[dict]) -> list[str]:
+    out = set()
+    for p in rows if isinstance(rows, list) else []:
+        if not isinstance(p, dict):
+            continue
+        for d in norm_list(p.get("domains")):
+            dd = str(d).strip()
+            if dd:
+                out.add(dd.title())
+    return sorted(out)
+
+
+def extract_companies_from_projects(rows: list[dict]) -> list[str]:
+    out = set()
+    for p in rows if isinstance(rows, list) else []:
+        if not isinstance(p, dict):
+            continue
+        c = str(p.get("company", "") or "").strip()
+        if c:
+            out.add(c)
+    return sorted(out)
+
+
+def filter_projects_by_domains(rows: list[dict], selected_domains: list[str]) -> list[dict]:
+    sel = {str(d).strip().casefold() for d in (selected_domains or []) if str(d).strip()}
+    if not sel:
+        return list(rows) if isinstance(rows, list) else []
+    out = []
+    for p in rows if isinstance(rows, list) else []:
+        if not isinstance(p, dict):
+            continue
+        p_domains = {str(d).strip().casefold() for d in norm_list(p.get("domains")) if str(d).strip()}
+        if p_domains & sel:
+            out.append(p)
+    return out
+
+
+def make_domain_variant(cv: Dict[str, Any], selected_domains: list[str]) -> Dict[str, Any]:
+    """
+    Returns a shallow copy of the CV as the PDF shows it for one domain selection:
+    filtered projects plus the matching domains/companies lists.
+    An empty selection means "all projects".
+    """
+    all_projects = [p for p in (cv.get("projects_experience") or []) if project_has_content(p)]
+    selected = [str(d) for d in (selected_domains or []) if str(d).strip()]
+    filtered = filter_projects_by_domains(all_projects, selected)
+
+    variant = dict(cv)
+    variant["projects_experience"] = filtered
+    if selected:
+        variant["domains"] = selected
+        variant["companies"] = extract_companies_from_projects(filtered)
+    else:
+        variant["domains"] = extract_domains_from_projects(all_projects)
+        variant["companies"] = extract_companies_from_projects(all_projects)
+    return variant
+
+
+# ============================================================
+# 6️⃣ Debug utilities (optional)
 # ============================================================
 if __name__ == "__main__":
     test_data = {